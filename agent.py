@@ -5,11 +5,112 @@ Contiene la implementación del agente inteligente con sus percepciones y accion
 
 import random
 from config import (
-    AGENT_CONFIG, DIRECTIONS, ORIENTATION_SYMBOLS, 
-    PERCEPTION_STATES, ACTIONS
+    AGENT_CONFIG, DIRECTION_OFFSETS, ORIENTATION_SYMBOLS, 
+    PERCEPTION_STATES, ACTIONS, NEIGHBOR_STATES, NEIGHBORHOOD_MASK,
+    PERCEPTION_BITS, ACTION_CODES
 )
 
 
+# Texto de percepción de cada estado de celda vecina del índice de vecindario
+SENSOR_STATE_TEXT = {
+    NEIGHBOR_STATES['LIGHT']: PERCEPTION_STATES['LIGHT_FLOOR'],
+    NEIGHBOR_STATES['DARK']: PERCEPTION_STATES['DARK_FLOOR'],
+    NEIGHBOR_STATES['BORDER']: PERCEPTION_STATES['BORDER'],
+}
+
+# Nombre de cada código de acción y su inverso
+ACTION_NAMES = [None] * len(ACTION_CODES)
+for _key, _code in ACTION_CODES.items():
+    ACTION_NAMES[_code] = ACTIONS[_key]
+ACTION_CODES_BY_NAME = {name: code for code, name in enumerate(ACTION_NAMES)}
+
+# Rotación (en cuartos de vuelta) que aplica cada código de acción antes de avanzar
+ACTION_ROTATIONS = [0] * len(ACTION_CODES)
+ACTION_ROTATIONS[ACTION_CODES['ROTATE_LEFT']] = -1
+ACTION_ROTATIONS[ACTION_CODES['ROTATE_RIGHT']] = 1
+ACTION_ROTATIONS[ACTION_CODES['ROTATE_180']] = 2
+
+# La orientación ocupa los bits superiores al índice de la tabla de sensores
+SENSOR_TABLE_SHIFT = NEIGHBORHOOD_MASK['SELF_LINE_BIT'].bit_length()
+
+
+def _build_sensor_table():
+    """
+    Precalcula los bits de sensores para cada orientación y máscara de vecindario
+    
+    Returns:
+        list: Tabla indexada por (orientación << SENSOR_TABLE_SHIFT) | máscara
+        con los bits de PISO, IZQUIERDA, CENTRO y DERECHA
+    """
+    mask_size = 1 << SENSOR_TABLE_SHIFT
+    table = [0] * (4 * mask_size)
+    for orientation in range(4):
+        for mask in range(mask_size):
+            code = PERCEPTION_BITS['PISO'] if mask & NEIGHBORHOOD_MASK['SELF_LINE_BIT'] else 0
+            # Izquierda, centro y derecha son las direcciones absolutas o-1, o, o+1
+            for offset, bit in ((-1, 'IZQUIERDA'), (0, 'CENTRO'), (1, 'DERECHA')):
+                direction = (orientation + offset) % 4
+                state = (mask >> (NEIGHBORHOOD_MASK['BITS_PER_DIRECTION'] * direction)) & NEIGHBORHOOD_MASK['STATE_MASK']
+                if state == NEIGHBOR_STATES['DARK']:
+                    code |= PERCEPTION_BITS[bit]
+            table[orientation * mask_size + mask] = code
+    return table
+
+
+def _select_action(code):
+    """
+    Tabla de percepción-acción del agente aplicada a un código de percepción
+    
+    Args:
+        code (int): Código de percepción de 5 bits
+        
+    Returns:
+        int: Código de la acción a ejecutar
+    """
+    if code & (PERCEPTION_BITS['PISO'] | PERCEPTION_BITS['CENTRO']):
+        # Avanzar si está sobre línea o hay línea al frente
+        return ACTION_CODES['MOVE_FORWARD']
+    elif code & PERCEPTION_BITS['IZQUIERDA']:
+        # Rotar izquierda si hay línea a la izquierda
+        return ACTION_CODES['ROTATE_LEFT']
+    elif code & PERCEPTION_BITS['DERECHA']:
+        # Rotar derecha si hay línea a la derecha
+        return ACTION_CODES['ROTATE_RIGHT']
+    elif code & PERCEPTION_BITS['CONTACTO']:
+        # Girar 180 grados si hay contacto con pared
+        return ACTION_CODES['ROTATE_180']
+    # Buscar línea avanzando
+    return ACTION_CODES['MOVE_FORWARD']
+
+
+SENSOR_TABLE = _build_sensor_table()
+PERCEPTION_ACTION_TABLE = [_select_action(code) for code in range(1 << len(PERCEPTION_BITS))]
+
+
+def encode_perceptions(perceptions):
+    """
+    Convierte el diccionario de percepciones en su código de 5 bits
+    
+    Args:
+        perceptions (dict): Diccionario devuelto por perceive()
+        
+    Returns:
+        int: Código de percepción
+    """
+    code = 0
+    if perceptions['piso'] == PERCEPTION_STATES['DARK_FLOOR']:
+        code |= PERCEPTION_BITS['PISO']
+    if perceptions['izquierda'] == PERCEPTION_STATES['DARK_FLOOR']:
+        code |= PERCEPTION_BITS['IZQUIERDA']
+    if perceptions['centro'] == PERCEPTION_STATES['DARK_FLOOR']:
+        code |= PERCEPTION_BITS['CENTRO']
+    if perceptions['derecha'] == PERCEPTION_STATES['DARK_FLOOR']:
+        code |= PERCEPTION_BITS['DERECHA']
+    if perceptions['contacto'] == PERCEPTION_STATES['CONTACT']:
+        code |= PERCEPTION_BITS['CONTACTO']
+    return code
+
+
 class LineFollowerAgent:
     """
     Clase que representa el agente seguidor de líneas
@@ -48,17 +149,8 @@ class LineFollowerAgent:
         """
         Mueve el agente hacia adelante según su orientación actual
         """
-        dx, dy = 0, 0
-        
         # Calcular dirección de movimiento según orientación
-        if self.orientation == DIRECTIONS['UP']:  # Arriba
-            dy = -1
-        elif self.orientation == DIRECTIONS['RIGHT']:  # Derecha
-            dx = 1
-        elif self.orientation == DIRECTIONS['DOWN']:  # Abajo
-            dy = 1
-        elif self.orientation == DIRECTIONS['LEFT']:  # Izquierda
-            dx = -1
+        dx, dy = DIRECTION_OFFSETS[self.orientation]
             
         new_x, new_y = self.x + dx, self.y + dy
         
@@ -85,35 +177,24 @@ class LineFollowerAgent:
         # Estado de contacto con paredes
         contact = PERCEPTION_STATES['CONTACT'] if self.has_hit_wall else PERCEPTION_STATES['NO_CONTACT']
         
+        # Máscara precalculada del vecindario de la celda actual
+        mask = environment.get_neighborhood_mask(self.x, self.y)
+        
         # Cámara bajo el agente
-        piso = PERCEPTION_STATES['DARK_FLOOR'] if environment.is_line_at(self.x, self.y) else PERCEPTION_STATES['LIGHT_FLOOR']
+        piso = PERCEPTION_STATES['DARK_FLOOR'] if mask & NEIGHBORHOOD_MASK['SELF_LINE_BIT'] else PERCEPTION_STATES['LIGHT_FLOOR']
+        
+        # Rotar la máscara para que el campo 0 sea el frente del agente;
+        # izquierda queda en el campo 3 y derecha en el campo 1
+        shift = NEIGHBORHOOD_MASK['BITS_PER_DIRECTION'] * self.orientation
+        neighbors = mask & NEIGHBORHOOD_MASK['NEIGHBORS_MASK']
+        relative = ((neighbors >> shift) | (neighbors << (8 - shift))) & NEIGHBORHOOD_MASK['NEIGHBORS_MASK']
         
         # Cámaras adelante (izquierda, centro, derecha)
-        perceptions = []
-        for i in range(-1, 2):
-            # Calcular la dirección relativa
-            rel_dir = (self.orientation + i) % 4
-            dx, dy = 0, 0
-            
-            if rel_dir == DIRECTIONS['UP']:  # Arriba
-                dy = -1
-            elif rel_dir == DIRECTIONS['RIGHT']:  # Derecha
-                dx = 1
-            elif rel_dir == DIRECTIONS['DOWN']:  # Abajo
-                dy = 1
-            elif rel_dir == DIRECTIONS['LEFT']:  # Izquierda
-                dx = -1
-                
-            cam_x, cam_y = self.x + dx, self.y + dy
-            
-            # Verificar si está dentro de los límites
-            if environment.is_valid_position(cam_x, cam_y):
-                if environment.is_line_at(cam_x, cam_y):
-                    perceptions.append(PERCEPTION_STATES['DARK_FLOOR'])
-                else:
-                    perceptions.append(PERCEPTION_STATES['LIGHT_FLOOR'])
-            else:
-                perceptions.append(PERCEPTION_STATES['BORDER'])
+        perceptions = [
+            SENSOR_STATE_TEXT[(relative >> 6) & NEIGHBORHOOD_MASK['STATE_MASK']],
+            SENSOR_STATE_TEXT[relative & NEIGHBORHOOD_MASK['STATE_MASK']],
+            SENSOR_STATE_TEXT[(relative >> 2) & NEIGHBORHOOD_MASK['STATE_MASK']],
+        ]
                 
         return {
             'orientacion': orientation_symbol,
@@ -124,6 +205,40 @@ class LineFollowerAgent:
             'derecha': perceptions[2]
         }
         
+    def perceive_code(self, environment):
+        """
+        Obtiene las percepciones del agente como código entero de 5 bits
+        
+        Camino rápido equivalente a perceive() sin construir el diccionario
+        (no distingue borde de piso claro, que la tabla de acciones no usa).
+        
+        Args:
+            environment: Instancia del entorno
+            
+        Returns:
+            int: Código de percepción (ver PERCEPTION_BITS)
+        """
+        mask = environment.get_neighborhood_mask(self.x, self.y)
+        code = SENSOR_TABLE[(self.orientation << SENSOR_TABLE_SHIFT) | mask]
+        if self.has_hit_wall:
+            code |= PERCEPTION_BITS['CONTACTO']
+        return code
+        
+    def act_code(self, code):
+        """
+        Ejecuta la acción de la tabla de percepción-acción para un código
+        
+        Args:
+            code (int): Código de percepción de 5 bits
+            
+        Returns:
+            int: Código de la acción tomada (ver ACTION_CODES)
+        """
+        action = PERCEPTION_ACTION_TABLE[code]
+        self.orientation = (self.orientation + ACTION_ROTATIONS[action]) % 4
+        self.move_forward()
+        return action
+        
     def act(self, perceptions):
         """
         Ejecuta una acción basada en las percepciones actuales
@@ -134,35 +249,7 @@ class LineFollowerAgent:
         Returns:
             str: Nombre de la acción tomada
         """
-        # Tabla de percepción-acción
-        if perceptions['piso'] == PERCEPTION_STATES['DARK_FLOOR'] or perceptions['centro'] == PERCEPTION_STATES['DARK_FLOOR']:
-            # Avanzar si está sobre línea o hay línea al frente
-            self.move_forward()
-            return 'move_forward'
-            
-        elif perceptions['izquierda'] == PERCEPTION_STATES['DARK_FLOOR']:
-            # Rotar izquierda si hay línea a la izquierda
-            self.rotate(0)  # Rotar izquierda
-            self.move_forward()
-            return 'rotate_left'
-            
-        elif perceptions['derecha'] == PERCEPTION_STATES['DARK_FLOOR']:
-            # Rotar derecha si hay línea a la derecha
-            self.rotate(1)  # Rotar derecha
-            self.move_forward()
-            return 'rotate_right'
-            
-        elif perceptions['contacto'] == PERCEPTION_STATES['CONTACT']:
-            # Girar 180 grados si hay contacto con pared
-            self.rotate(1)
-            self.rotate(1)
-            self.move_forward()
-            return 'rotate_180'
-            
-        else:
-            # Buscar línea avanzando
-            self.move_forward()
-            return 'move_forward'
+        return ACTION_NAMES[self.act_code(encode_perceptions(perceptions))]
     
     def get_position(self):
         """
@@ -0,0 +1,216 @@
+"""
+Módulo de escritura asíncrona del log para el Agente Seguidor de Líneas
+Un hilo dedicado agrupa, formatea y escribe los pasos encolados por el logger
+"""
+
+import threading
+from collections import deque
+
+
+# Políticas ante una cola llena
+BACKPRESSURE_POLICIES = ('block', 'drop_oldest', 'sample')
+
+
+class AsyncStepWriter:
+    """
+    Envoltorio de un escritor de pasos (CSV o binario) que delega la
+    escritura a un hilo en segundo plano
+    """
+    
+    def __init__(self, sink, queue_size, backpressure='block', sample_every=10,
+                 batch_size=1024, flush_interval_ms=500):
+        """
+        Inicializa la cola y arranca el hilo escritor
+        
+        Args:
+            sink: Escritor con métodos write(record), flush() y close()
+            queue_size (int): Registros pendientes como máximo
+            backpressure (str): Política con la cola llena: 'block' espera a
+                que haya sitio, 'drop_oldest' descarta el registro más antiguo
+                y 'sample' conserva solo uno de cada sample_every registros
+                mientras la cola está por encima de la mitad
+            sample_every (int): Periodo de muestreo de la política 'sample'
+            batch_size (int): Registros encolados que despiertan al hilo
+            flush_interval_ms (float): Espera máxima del hilo entre lotes
+        """
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Política de contrapresión desconocida: {backpressure}")
+        
+        self.sink = sink
+        self.filename = getattr(sink, 'filename', None)
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self.sample_every = max(1, sample_every)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        
+        # Contadores
+        self.queued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.written = 0
+        self.error = None
+        
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._sample_counter = 0
+        self._flush_requested = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name='AgentLogWriter', daemon=True)
+        self._thread.start()
+    
+    def write(self, record):
+        """
+        Encola un registro aplicando la política de contrapresión
+        
+        Args:
+            record (tuple): Registro compacto del paso
+        
+        Raises:
+            Exception: El error del hilo escritor si falló (o RuntimeError si
+                ya no está en marcha); el registro no se encola
+        """
+        with self._condition:
+            if self.error is not None or not self._thread.is_alive():
+                self._raise_error()
+            queue = self._queue
+            if self.backpressure == 'sample' and len(queue) >= self.queue_size // 2:
+                self._sample_counter += 1
+                if self._sample_counter % self.sample_every:
+                    self.sampled_out += 1
+                    return
+            
+            if len(queue) >= self.queue_size:
+                if self.backpressure == 'block':
+                    # El hilo escritor reemplaza la cola al tomar cada lote
+                    self._condition.notify_all()
+                    while len(self._queue) >= self.queue_size and self._thread.is_alive():
+                        self._condition.wait()
+                    if self.error is not None or not self._thread.is_alive():
+                        self._raise_error()
+                    queue = self._queue
+                elif self.backpressure == 'drop_oldest':
+                    queue.popleft()
+                    self.dropped += 1
+                else:
+                    self.dropped += 1
+                    return
+            
+            queue.append(record)
+            self.queued += 1
+            if len(queue) == self.batch_size:
+                self._condition.notify_all()
+    
+    def _raise_error(self):
+        """
+        Lanza el error del hilo escritor, o RuntimeError si terminó sin error
+        """
+        if self.error is not None:
+            raise self.error
+        raise RuntimeError("El hilo de escritura del log ya no está en marcha")
+    
+    def get_pending(self):
+        """
+        Obtiene el número de registros encolados que aún no se escribieron
+        
+        Returns:
+            int: Registros pendientes
+        """
+        return len(self._queue)
+    
+    def get_stats(self):
+        """
+        Obtiene los contadores del escritor
+        
+        Returns:
+            dict: Registros encolados, escritos, pendientes, descartados y
+            omitidos por muestreo
+        """
+        return {
+            'encolados': self.queued,
+            'escritos': self.written,
+            'pendientes': self.get_pending(),
+            'descartados': self.dropped,
+            'omitidos_por_muestreo': self.sampled_out,
+        }
+    
+    def flush(self):
+        """
+        Espera a que se escriban los registros encolados y vacía el escritor
+        
+        Raises:
+            Exception: El error del hilo escritor si falló
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while (self._queue or self._flush_requested) and self._thread.is_alive():
+                self._condition.wait()
+            if self.error is not None:
+                raise self.error
+    
+    def close(self):
+        """
+        Escribe los registros pendientes, detiene el hilo y cierra el escritor
+        
+        Raises:
+            Exception: El error del hilo escritor si falló
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+    
+    def _run(self):
+        """
+        Bucle del hilo escritor: toma lotes de la cola y los escribe
+        """
+        batch = ()
+        written = 0
+        try:
+            while True:
+                with self._condition:
+                    # Esperar a completar un lote (o a que venza el intervalo)
+                    if (len(self._queue) < self.batch_size and 
+                            not self._closing and not self._flush_requested):
+                        self._condition.wait(self.flush_interval)
+                    batch = self._queue
+                    self._queue = deque()
+                    flush_requested = self._flush_requested
+                    closing = self._closing
+                    # Hay sitio en la cola: despertar a los productores bloqueados
+                    self._condition.notify_all()
+                
+                write = self.sink.write
+                written = 0
+                for record in batch:
+                    write(record)
+                    written += 1
+                self.written += written
+                
+                if flush_requested or closing or not batch:
+                    self.sink.flush()
+                if flush_requested:
+                    with self._condition:
+                        self._flush_requested = False
+                        self._condition.notify_all()
+                if closing:
+                    with self._condition:
+                        if not self._queue:
+                            break
+        except Exception as error:
+            # Los registros sin escribir se cuentan como descartados
+            with self._condition:
+                self.error = error
+                if written < len(batch):
+                    # El lote falló a medias y aún no se había contado
+                    self.written += written
+                self.dropped += len(batch) - written + len(self._queue)
+                self._queue = deque()
+            print(f"⚠️ Error en el hilo de escritura del log: {error}")
+        finally:
+            self.sink.close()
+            with self._condition:
+                self._condition.notify_all()
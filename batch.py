@@ -0,0 +1,170 @@
+"""
+Módulo de simulación por lotes del Agente Seguidor de Líneas
+Avanza muchos agentes a la vez sobre el mismo entorno guardando su estado
+como arreglos de NumPy (estructura de arreglos) en lugar de un objeto por agente
+"""
+
+import numpy as np
+from config import ACTION_CODES, PERCEPTION_BITS, AGENT_CONFIG
+from agent import ACTION_NAMES
+from transitions import vector_step
+
+
+class BatchSimulator:
+    """
+    Lote de agentes independientes que comparten un entorno
+    
+    Cada paso aplica a todos los agentes la misma percepción y tabla de
+    percepción-acción que LineFollowerAgent.perceive_code() y act_code().
+    """
+    
+    def __init__(self, environment, x, y, orientation=None, contact=None):
+        """
+        Inicializa el lote con las posiciones iniciales de los agentes
+        
+        Args:
+            environment: Instancia del entorno
+            x (array-like): Coordenadas x iniciales
+            y (array-like): Coordenadas y iniciales
+            orientation (array-like): Orientaciones iniciales (por defecto
+                AGENT_CONFIG['INITIAL_ORIENTATION'])
+            contact (array-like): Contacto inicial (por defecto sin contacto)
+        """
+        self.environment = environment
+        self.x = np.array(x, dtype=np.int32)
+        self.y = np.array(y, dtype=np.int32)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError("x e y deben ser arreglos de una dimensión del mismo tamaño")
+        if ((self.x < 0) | (self.x >= environment.width) |
+                (self.y < 0) | (self.y >= environment.height)).any():
+            raise IndexError("Hay posiciones iniciales fuera de la cuadrícula")
+        
+        self.num_agents = len(self.x)
+        self._agent_index = np.arange(self.num_agents)
+        if orientation is None:
+            orientation = AGENT_CONFIG['INITIAL_ORIENTATION']
+        self.orientation = np.broadcast_to(np.asarray(orientation, dtype=np.int8),
+                                           self.x.shape).copy()
+        if contact is None:
+            contact = 0
+        self.contact = np.broadcast_to(np.asarray(contact, dtype=np.uint8),
+                                       self.x.shape).copy()
+        
+        self.reset_metrics()
+    
+    @classmethod
+    def from_agents(cls, environment, agents):
+        """
+        Crea un lote con el estado actual de una lista de agentes
+        
+        Args:
+            environment: Instancia del entorno
+            agents (list): Instancias de LineFollowerAgent
+        
+        Returns:
+            BatchSimulator: Lote con un agente por elemento de la lista
+        """
+        return cls(environment,
+                   [agent.x for agent in agents],
+                   [agent.y for agent in agents],
+                   [agent.orientation for agent in agents],
+                   [1 if agent.has_hit_wall else 0 for agent in agents])
+    
+    @classmethod
+    def all_start_positions(cls, environment, orientation=None):
+        """
+        Crea un lote con un agente en cada celda de la cuadrícula
+        
+        Args:
+            environment: Instancia del entorno
+            orientation (int): Orientación inicial de todos los agentes (opcional)
+        
+        Returns:
+            BatchSimulator: Lote de ancho x alto agentes
+        """
+        y, x = np.divmod(np.arange(environment.width * environment.height), environment.width)
+        return cls(environment, x, y, orientation)
+    
+    def reset_metrics(self):
+        """
+        Reinicia los contadores por agente
+        """
+        self.steps = 0
+        self.steps_on_line = np.zeros(self.num_agents, dtype=np.int64)
+        self.contact_steps = np.zeros(self.num_agents, dtype=np.int64)
+        self.action_counts = np.zeros((self.num_agents, len(ACTION_CODES)), dtype=np.int64)
+    
+    def step(self):
+        """
+        Avanza un paso todos los agentes del lote
+        
+        Returns:
+            tuple: (códigos de percepción, códigos de acción) de cada agente
+        """
+        self.x, self.y, self.orientation, self.contact, codes, actions = vector_step(
+            self.environment.neighborhood, self.x, self.y, self.orientation, self.contact)
+        
+        # Mismas métricas que AgentLogger.log_step_code, por agente
+        self.steps += 1
+        self.steps_on_line += (codes & PERCEPTION_BITS['PISO']) != 0
+        self.contact_steps += self.contact
+        self.action_counts[self._agent_index, actions] += 1
+        return codes, actions
+    
+    def run(self, steps):
+        """
+        Avanza todos los agentes un número de pasos
+        
+        Args:
+            steps (int): Pasos a simular
+        """
+        for _ in range(steps):
+            self.step()
+    
+    def get_agent_state(self, index):
+        """
+        Obtiene el estado de un agente del lote
+        
+        Args:
+            index (int): Índice del agente
+        
+        Returns:
+            tuple: (x, y, orientación, contacto)
+        """
+        return (self.x.item(index), self.y.item(index),
+                self.orientation.item(index), bool(self.contact.item(index)))
+    
+    def get_summary(self):
+        """
+        Obtiene las métricas agregadas de todo el lote
+        
+        Returns:
+            dict: Agentes, pasos por agente, pasos totales y totales de pasos
+            sobre línea, con contacto y de cada acción
+        """
+        totals = self.action_counts.sum(axis=0)
+        return {
+            'agentes': self.num_agents,
+            'pasos': self.steps,
+            'pasos_totales': self.steps * self.num_agents,
+            'pasos_sobre_linea': int(self.steps_on_line.sum()),
+            'pasos_con_contacto': int(self.contact_steps.sum()),
+            'acciones': {ACTION_NAMES[code]: int(count) for code, count in enumerate(totals)},
+        }
+
+
+def create_batch_simulator(environment, x, y, orientation=None, contact=None):
+    """
+    Función de conveniencia para crear un lote de agentes
+    
+    Args:
+        environment: Instancia del entorno
+        x (array-like): Coordenadas x iniciales
+        y (array-like): Coordenadas y iniciales
+        orientation (array-like): Orientaciones iniciales (opcional)
+        contact (array-like): Contacto inicial (opcional)
+    
+    Returns:
+        BatchSimulator: Lote de agentes
+    """
+    return BatchSimulator(environment, x, y, orientation, contact)
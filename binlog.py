@@ -0,0 +1,362 @@
+"""
+Módulo de log binario para el Agente Seguidor de Líneas
+Define el registro compacto de cada paso, su formato binario de ancho fijo
+y las funciones para leerlo (mapeado en memoria) y convertirlo a CSV
+"""
+
+import csv
+import os
+import struct
+import time
+from datetime import datetime
+import numpy as np
+from config import PERCEPTION_BITS, ACTION_LOG_SYMBOLS
+
+
+# Columnas del log de pasos en CSV, en el orden en que se escriben
+LOG_FIELDNAMES = ['paso', 'cuerpo', 'izquierda', 'centro', 'derecha', 'accion',
+                  'posicion_x', 'posicion_y', 'orientacion', 'contacto', 'timestamp']
+
+# Columnas enteras del log CSV (las demás son texto)
+_CSV_INTEGER_FIELDS = ('paso', 'cuerpo', 'izquierda', 'centro', 'derecha',
+                       'posicion_x', 'posicion_y', 'orientacion', 'contacto')
+
+# Registro compacto de un paso: tupla con estos campos, en este orden
+BINARY_LOG_DTYPE = np.dtype([
+    ('paso', '<u8'),
+    ('posicion_x', '<i4'),
+    ('posicion_y', '<i4'),
+    ('sensores', 'u1'),  # Código de percepción de 5 bits
+    ('accion', 'u1'),  # Código de acción
+    ('orientacion', 'u1'),
+    ('contacto', 'u1'),
+    ('timestamp_ns', '<i8'),  # Reloj monotónico (time.perf_counter_ns)
+])
+_RECORD_STRUCT = struct.Struct('<QiiBBBBq')
+
+# Cabecera: firma, versión, tamaño de registro y tamaño de cabecera, seguidos
+# (desde la versión 2) del ancla de reloj de la sesión
+BINARY_LOG_MAGIC = b'AGLOGBIN'
+BINARY_LOG_VERSION = 2
+_HEADER_STRUCT = struct.Struct('<8sHHI')
+_ANCHOR_STRUCT = struct.Struct('<qq')
+BINARY_LOG_HEADER_SIZE = _HEADER_STRUCT.size + _ANCHOR_STRUCT.size
+
+# Ancla de los logs de versión 1, cuyas marcas ya eran de reloj de pared
+_WALL_CLOCK_ANCHOR = (0, 0)
+
+# Registros convertidos por bloque al pasar de binario a CSV
+_CONVERT_CHUNK = 65536
+
+# Nanosegundos por segundo y por milisegundo
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_MS = 1_000_000
+
+# Columnas cuerpo, izquierda, centro y derecha de cada código de percepción
+_SENSOR_COLUMNS = [
+    tuple(1 if code & PERCEPTION_BITS[name] else 0
+          for name in ('PISO', 'IZQUIERDA', 'CENTRO', 'DERECHA'))
+    for code in range(1 << len(PERCEPTION_BITS))
+]
+
+
+def create_clock_anchor():
+    """
+    Toma el ancla de reloj de una sesión de log
+    
+    Los pasos guardan solo el reloj monotónico; el ancla relaciona ese
+    reloj con la hora de pared para dar formato a las marcas al leerlas.
+    
+    Returns:
+        tuple: (nanosegundos de pared, nanosegundos monotónicos)
+    """
+    return (time.time_ns(), time.perf_counter_ns())
+
+
+def format_timestamp(timestamp_ns, clock_anchor):
+    """
+    Da formato legible (hora local con milisegundos) a una marca de tiempo
+    
+    Args:
+        timestamp_ns (int): Marca del reloj monotónico en nanosegundos
+        clock_anchor (tuple): Ancla de reloj de la sesión
+    
+    Returns:
+        str: Hora con formato HH:MM:SS.mmm
+    """
+    second, rest = divmod(clock_anchor[0] + (timestamp_ns - clock_anchor[1]), _NS_PER_SECOND)
+    return f"{datetime.fromtimestamp(second).strftime('%H:%M:%S')}.{rest // _NS_PER_MS:03d}"
+
+
+class TimestampFormatter:
+    """
+    Formato de marcas de tiempo de una sesión con caché del último texto
+    
+    Los pasos consecutivos caen casi siempre en el mismo milisegundo o al
+    menos en el mismo segundo de pared: el texto se reutiliza mientras no
+    cambie el milisegundo, y HH:MM:SS solo se genera cuando cambia el
+    segundo (los milisegundos se añaden con aritmética entera). El
+    resultado es idéntico al de format_timestamp.
+    """
+    
+    def __init__(self, clock_anchor):
+        """
+        Inicializa el formateador
+        
+        Args:
+            clock_anchor (tuple): Ancla de reloj de la sesión
+        """
+        self._offset_ns = clock_anchor[0] - clock_anchor[1]
+        self._millisecond = None
+        self._text = ''
+        self._second = None
+        self._prefix = ''
+    
+    def format(self, timestamp_ns):
+        """
+        Da formato legible a una marca de tiempo
+        
+        Args:
+            timestamp_ns (int): Marca del reloj monotónico en nanosegundos
+        
+        Returns:
+            str: Hora con formato HH:MM:SS.mmm
+        """
+        millisecond = (self._offset_ns + timestamp_ns) // _NS_PER_MS
+        if millisecond != self._millisecond:
+            second, rest = divmod(millisecond, 1000)
+            if second != self._second:
+                self._prefix = datetime.fromtimestamp(second).strftime('%H:%M:%S.')
+                self._second = second
+            self._text = f"{self._prefix}{rest:03d}"
+            self._millisecond = millisecond
+        return self._text
+
+
+def record_to_row(record, clock_anchor, formatter=None):
+    """
+    Expande un registro compacto a una fila con las columnas de LOG_FIELDNAMES
+    
+    Args:
+        record (tuple): Registro compacto (campos de BINARY_LOG_DTYPE)
+        clock_anchor (tuple): Ancla de reloj de la sesión
+        formatter (TimestampFormatter): Formateador de la sesión, para
+            reutilizarlo entre registros (opcional)
+    
+    Returns:
+        list: Valores de la fila CSV
+    """
+    paso, x, y, sensors, action, orientation, contact, timestamp_ns = record
+    body, left, center, right = _SENSOR_COLUMNS[sensors]
+    if formatter is None:
+        timestamp = format_timestamp(timestamp_ns, clock_anchor)
+    else:
+        timestamp = formatter.format(timestamp_ns)
+    return [paso, body, left, center, right, ACTION_LOG_SYMBOLS[action],
+            x, y, orientation, contact, timestamp]
+
+
+def record_to_step(record, clock_anchor, formatter=None):
+    """
+    Expande un registro compacto al diccionario de paso usado por el logger
+    
+    Args:
+        record (tuple): Registro compacto (campos de BINARY_LOG_DTYPE)
+        clock_anchor (tuple): Ancla de reloj de la sesión
+        formatter (TimestampFormatter): Formateador de la sesión (opcional)
+    
+    Returns:
+        dict: Datos del paso con las claves de LOG_FIELDNAMES
+    """
+    return dict(zip(LOG_FIELDNAMES, record_to_row(record, clock_anchor, formatter)))
+
+
+def csv_row_to_step(row):
+    """
+    Convierte una fila leída de un log CSV al diccionario de paso del logger
+    
+    Args:
+        row (list): Valores de la fila (texto), en el orden de LOG_FIELDNAMES
+    
+    Returns:
+        dict: Datos del paso con las claves de LOG_FIELDNAMES
+    """
+    step = dict(zip(LOG_FIELDNAMES, row))
+    for name in _CSV_INTEGER_FIELDS:
+        step[name] = int(step[name])
+    return step
+
+
+class BinaryStepWriter:
+    """
+    Escritor con buffer de registros binarios de ancho fijo
+    """
+    
+    def __init__(self, filename, flush_every_rows, flush_interval_ms, buffer_size, clock_anchor):
+        """
+        Crea el archivo de log binario y escribe su cabecera
+        
+        Args:
+            filename (str): Ruta del archivo
+            flush_every_rows (int): Registros escritos entre dos vaciados
+            flush_interval_ms (float): Milisegundos máximos entre dos vaciados
+            buffer_size (int): Tamaño del buffer del archivo en bytes
+            clock_anchor (tuple): Ancla de reloj de la sesión
+        """
+        self.filename = filename
+        self.flush_every_rows = flush_every_rows
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._file = open(filename, 'wb', buffering=buffer_size)
+        self._file.write(_HEADER_STRUCT.pack(BINARY_LOG_MAGIC, BINARY_LOG_VERSION,
+                                             BINARY_LOG_DTYPE.itemsize, BINARY_LOG_HEADER_SIZE))
+        self._file.write(_ANCHOR_STRUCT.pack(*clock_anchor))
+        self._pack = _RECORD_STRUCT.pack
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+    
+    def write(self, record):
+        """
+        Escribe un registro y vacía el buffer si se alcanzó algún límite
+        
+        Args:
+            record (tuple): Registro compacto (campos de BINARY_LOG_DTYPE)
+        """
+        self._file.write(self._pack(*record))
+        self._pending_rows += 1
+        if (self._pending_rows >= self.flush_every_rows or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        """
+        Vacía el buffer al disco
+        """
+        self._file.flush()
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+    
+    def close(self):
+        """
+        Vacía el buffer y cierra el archivo
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def read_binary_log_header(filename):
+    """
+    Lee y valida la cabecera de un log binario
+    
+    Args:
+        filename (str): Ruta del archivo
+    
+    Returns:
+        dict: Versión, tamaño de registro, tamaño de cabecera y ancla de reloj
+    
+    Raises:
+        ValueError: Si el archivo no es un log binario compatible
+    """
+    with open(filename, 'rb') as log_file:
+        header = log_file.read(BINARY_LOG_HEADER_SIZE)
+    if len(header) < _HEADER_STRUCT.size:
+        raise ValueError(f"Archivo de log binario incompleto: {filename}")
+    
+    magic, version, record_size, header_size = _HEADER_STRUCT.unpack_from(header)
+    if magic != BINARY_LOG_MAGIC or version not in (1, BINARY_LOG_VERSION):
+        raise ValueError(f"Formato de log binario no reconocido: {filename}")
+    if record_size != BINARY_LOG_DTYPE.itemsize:
+        raise ValueError(f"Tamaño de registro inesperado ({record_size}) en: {filename}")
+    
+    clock_anchor = _WALL_CLOCK_ANCHOR
+    if version >= 2:
+        if len(header) < BINARY_LOG_HEADER_SIZE:
+            raise ValueError(f"Archivo de log binario incompleto: {filename}")
+        clock_anchor = _ANCHOR_STRUCT.unpack_from(header, _HEADER_STRUCT.size)
+    
+    return {
+        'version': version,
+        'record_size': record_size,
+        'header_size': header_size,
+        'clock_anchor': tuple(clock_anchor),
+    }
+
+
+def open_binary_log(filename):
+    """
+    Abre un log binario mapeado en memoria (sin copiar ni interpretar datos)
+    
+    Args:
+        filename (str): Ruta del archivo
+    
+    Returns:
+        numpy.ndarray: Arreglo estructurado de solo lectura con BINARY_LOG_DTYPE
+    
+    Raises:
+        ValueError: Si el archivo no es un log binario compatible
+    """
+    header = read_binary_log_header(filename)
+    record_size = header['record_size']
+    header_size = header['header_size']
+    
+    # Ignorar un registro final incompleto (escritura interrumpida)
+    count = (os.path.getsize(filename) - header_size) // record_size
+    if count <= 0:
+        return np.empty(0, dtype=BINARY_LOG_DTYPE)
+    return np.memmap(filename, dtype=BINARY_LOG_DTYPE, mode='r', 
+                     offset=header_size, shape=(count,))
+
+
+def read_binary_log(filename):
+    """
+    Lee un log binario como columnas
+    
+    Args:
+        filename (str): Ruta del archivo
+    
+    Returns:
+        dict: Nombre de columna -> numpy.ndarray (vistas sin copia sobre el
+        archivo mapeado en memoria)
+    """
+    records = open_binary_log(filename)
+    return {name: records[name] for name in BINARY_LOG_DTYPE.names}
+
+
+def binary_log_to_csv(binary_filename, csv_filename):
+    """
+    Convierte un log binario al formato CSV de export_to_csv
+    
+    Args:
+        binary_filename (str): Ruta del log binario
+        csv_filename (str): Ruta del CSV a crear
+    
+    Returns:
+        int: Número de pasos convertidos
+    """
+    records = open_binary_log(binary_filename)
+    formatter = TimestampFormatter(read_binary_log_header(binary_filename)['clock_anchor'])
+    
+    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(LOG_FIELDNAMES)
+        
+        symbols = np.array(ACTION_LOG_SYMBOLS)
+        for start in range(0, len(records), _CONVERT_CHUNK):
+            chunk = records[start:start + _CONVERT_CHUNK]
+            sensors = chunk['sensores']
+            columns = [
+                chunk['paso'].tolist(),
+                ((sensors & PERCEPTION_BITS['PISO']) != 0).astype(np.uint8).tolist(),
+                ((sensors & PERCEPTION_BITS['IZQUIERDA']) != 0).astype(np.uint8).tolist(),
+                ((sensors & PERCEPTION_BITS['CENTRO']) != 0).astype(np.uint8).tolist(),
+                ((sensors & PERCEPTION_BITS['DERECHA']) != 0).astype(np.uint8).tolist(),
+                symbols[chunk['accion']].tolist(),
+                chunk['posicion_x'].tolist(),
+                chunk['posicion_y'].tolist(),
+                chunk['orientacion'].tolist(),
+                chunk['contacto'].tolist(),
+                [formatter.format(ns) for ns in chunk['timestamp_ns'].tolist()],
+            ]
+            writer.writerows(zip(*columns))
+    
+    return len(records)
@@ -0,0 +1,234 @@
+"""
+Módulo de cuadrícula empaquetada en bits del Agente Seguidor de Líneas
+Guarda cada celda en un bit (1 = línea) en palabras de 64 bits alineadas por
+fila, para mapas grandes que deben ocupar poca memoria
+"""
+
+import numpy as np
+from config import ENVIRONMENT_CONFIG
+
+
+# Bits por palabra de la cuadrícula empaquetada
+WORD_BITS = 64
+
+# Número de bits a uno de cada byte (para NumPy sin bitwise_count)
+_POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """
+    Cuenta los bits a uno de un arreglo de palabras
+    
+    Args:
+        words (numpy.ndarray): Palabras uint64
+    
+    Returns:
+        int: Número total de bits a uno
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(_POPCOUNT_TABLE[np.ascontiguousarray(words).view(np.uint8)].sum(dtype=np.int64))
+
+
+class BitGrid:
+    """
+    Cuadrícula de un bit por celda
+    
+    La celda (x, y) es el bit x % 64 de la palabra words[y, x // 64]; los
+    bits de relleno al final de cada fila siempre valen cero.
+    """
+    
+    def __init__(self, width, height, words=None):
+        """
+        Inicializa la cuadrícula (vacía si no se dan las palabras)
+        
+        Args:
+            width (int): Ancho de la cuadrícula
+            height (int): Alto de la cuadrícula
+            words (numpy.ndarray): Palabras (alto x palabras por fila, uint64) (opcional)
+        """
+        self.width = width
+        self.height = height
+        self.words_per_row = -(-width // WORD_BITS)
+        if words is None:
+            words = np.zeros((height, self.words_per_row), dtype=np.uint64)
+        elif words.shape != (height, self.words_per_row) or words.dtype != np.uint64:
+            raise ValueError(f"Palabras no compatibles: {words.dtype} {words.shape}")
+        self.words = words
+        
+        # Bits válidos de la última palabra de cada fila
+        tail_bits = width - (self.words_per_row - 1) * WORD_BITS if width else 0
+        self._tail_mask = np.uint64((1 << tail_bits) - 1)
+    
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Empaqueta una cuadrícula de celdas
+        
+        Args:
+            grid (numpy.ndarray): Cuadrícula (alto x ancho) con GRID_VALUE_LINE
+                en las celdas de línea
+        
+        Returns:
+            BitGrid: Cuadrícula empaquetada
+        """
+        height, width = grid.shape
+        bit_grid = cls(width, height)
+        packed = np.packbits(grid == ENVIRONMENT_CONFIG['GRID_VALUE_LINE'], axis=1, bitorder='little')
+        row_bytes = bit_grid.words.view(np.uint8)
+        row_bytes[:, :packed.shape[1]] = packed
+        return bit_grid
+    
+    def to_grid(self):
+        """
+        Desempaqueta la cuadrícula
+        
+        Returns:
+            numpy.ndarray: Cuadrícula (alto x ancho, GRID_DTYPE) con
+            GRID_VALUE_LINE y GRID_VALUE_EMPTY
+        """
+        bits = np.unpackbits(self.words.view(np.uint8), axis=1, count=self.width, bitorder='little')
+        return np.where(bits.astype(bool), ENVIRONMENT_CONFIG['GRID_VALUE_LINE'],
+                        ENVIRONMENT_CONFIG['GRID_VALUE_EMPTY']).astype(ENVIRONMENT_CONFIG['GRID_DTYPE'])
+    
+    def get(self, x, y):
+        """
+        Lee una celda
+        
+        Args:
+            x (int): Coordenada x (debe ser válida)
+            y (int): Coordenada y (debe ser válida)
+        
+        Returns:
+            int: 1 si la celda es línea, 0 si no
+        """
+        return (self.words.item(y, x >> 6) >> (x & 63)) & 1
+    
+    def set(self, x, y, value):
+        """
+        Escribe una celda
+        
+        Args:
+            x (int): Coordenada x (debe ser válida)
+            y (int): Coordenada y (debe ser válida)
+            value (bool): True para línea, False para vacío
+        """
+        bit = np.uint64(1 << (x & 63))
+        if value:
+            self.words[y, x >> 6] |= bit
+        else:
+            self.words[y, x >> 6] &= ~bit
+    
+    def get_row(self, y):
+        """
+        Obtiene las palabras de una fila (vista sin copia)
+        
+        Args:
+            y (int): Fila
+        
+        Returns:
+            numpy.ndarray: Palabras de la fila
+        """
+        return self.words[y]
+    
+    def fill_rows(self, start, stop, value):
+        """
+        Marca o borra todas las celdas de un rango de filas
+        
+        Args:
+            start (int): Primera fila
+            stop (int): Fila siguiente a la última
+            value (bool): True para línea, False para vacío
+        """
+        if value:
+            self.words[start:stop] = np.uint64(0xFFFFFFFFFFFFFFFF)
+            self.words[start:stop, -1] = self._tail_mask
+        else:
+            self.words[start:stop] = 0
+    
+    def count_line_cells(self):
+        """
+        Cuenta las celdas de línea
+        
+        Returns:
+            int: Número de celdas con línea
+        """
+        return popcount(self.words)
+    
+    def count_row(self, y):
+        """
+        Cuenta las celdas de línea de una fila
+        
+        Args:
+            y (int): Fila
+        
+        Returns:
+            int: Número de celdas con línea en la fila
+        """
+        return popcount(self.words[y])
+    
+    def count_rows(self):
+        """
+        Cuenta las celdas de línea de cada fila
+        
+        Returns:
+            numpy.ndarray: Número de celdas con línea por fila
+        """
+        if hasattr(np, 'bitwise_count'):
+            return np.bitwise_count(self.words).sum(axis=1, dtype=np.int64)
+        return _POPCOUNT_TABLE[self.words.view(np.uint8)].sum(axis=1, dtype=np.int64)
+    
+    def _combine(self, other, operation):
+        """
+        Combina palabra a palabra con otra cuadrícula del mismo tamaño
+        
+        Args:
+            other (BitGrid): Otra cuadrícula
+            operation (callable): Operación de NumPy sobre las palabras
+        
+        Returns:
+            BitGrid: Cuadrícula resultante
+        """
+        if (other.width, other.height) != (self.width, self.height):
+            raise ValueError("Las cuadrículas deben tener el mismo tamaño")
+        return BitGrid(self.width, self.height, operation(self.words, other.words))
+    
+    def __and__(self, other):
+        return self._combine(other, np.bitwise_and)
+    
+    def __or__(self, other):
+        return self._combine(other, np.bitwise_or)
+    
+    def __xor__(self, other):
+        return self._combine(other, np.bitwise_xor)
+    
+    def __invert__(self):
+        words = ~self.words
+        words[:, -1] &= self._tail_mask
+        return BitGrid(self.width, self.height, words)
+    
+    def __eq__(self, other):
+        return (isinstance(other, BitGrid) and (other.width, other.height) == (self.width, self.height)
+                and bool(np.array_equal(self.words, other.words)))
+    
+    def get_nbytes(self):
+        """
+        Obtiene la memoria ocupada por las palabras
+        
+        Returns:
+            int: Bytes de la cuadrícula empaquetada
+        """
+        return self.words.nbytes
+
+
+def create_bit_grid(environment):
+    """
+    Función de conveniencia para empaquetar la cuadrícula de un entorno
+    
+    Args:
+        environment: Instancia del entorno
+    
+    Returns:
+        BitGrid: Cuadrícula empaquetada
+    """
+    return BitGrid.from_grid(environment.grid)
@@ -0,0 +1,366 @@
+"""
+Módulo de componentes de línea del Agente Seguidor de Líneas
+Etiqueta los grupos de celdas de línea conectadas (4-conexas, como se mueve el
+agente) y guarda el tamaño y la caja de cada uno, siguiendo las ediciones del
+entorno
+"""
+
+import numpy as np
+from config import ENVIRONMENT_CONFIG
+
+
+# Etiqueta de las celdas que no son línea
+NO_COMPONENT = 0
+
+
+def label_line_cells(is_line):
+    """
+    Etiqueta las componentes conexas de una máscara de celdas de línea
+    
+    Unión-búsqueda vectorizada sobre las celdas de línea: en cada ronda cada
+    arista entre dos raíces distintas engancha la mayor a la menor y luego se
+    comprimen los caminos, hasta que todas las aristas unen celdas de la
+    misma raíz. La raíz de cada componente es su primera celda en orden de
+    filas, y las etiquetas siguen ese orden.
+    
+    Args:
+        is_line (numpy.ndarray): Máscara booleana (alto x ancho)
+    
+    Returns:
+        tuple: (etiquetas (alto x ancho, int32, NO_COMPONENT fuera de la
+        línea y 1..n en las componentes), n)
+    """
+    height, width = is_line.shape
+    labels = np.zeros((height, width), dtype=np.int32)
+    flat = is_line.ravel()
+    cells = np.flatnonzero(flat)
+    if cells.size == 0:
+        return labels, 0
+    
+    # Aristas hacia la vecina derecha y la de abajo, en índices compactos
+    compact = np.arange(cells.size)
+    has_right = ((cells % width) < width - 1) & flat[np.minimum(cells + 1, flat.size - 1)]
+    has_down = (cells < flat.size - width) & flat[np.minimum(cells + width, flat.size - 1)]
+    first = np.concatenate([compact[has_right], compact[has_down]])
+    second = np.concatenate([np.searchsorted(cells, cells[has_right] + 1),
+                             np.searchsorted(cells, cells[has_down] + width)])
+    
+    parent = compact.copy()
+    while True:
+        root_first, root_second = parent[first], parent[second]
+        pending = root_first != root_second
+        if not pending.any():
+            break
+        low = np.minimum(root_first[pending], root_second[pending])
+        high = np.maximum(root_first[pending], root_second[pending])
+        np.minimum.at(parent, high, low)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        first, second = first[pending], second[pending]
+    
+    roots, inverse = np.unique(parent, return_inverse=True)
+    labels.ravel()[cells] = inverse + 1
+    return labels, roots.size
+
+
+class ComponentIndex:
+    """
+    Índice de componentes de línea de un entorno
+    
+    Las etiquetas de las componentes que no se editan se conservan entre
+    ediciones: una celda nueva que une varias componentes las funde en la de
+    menor etiqueta, y una celda eliminada que parte una componente deja la
+    etiqueta en la primera parte y da etiquetas nuevas al resto. Las
+    etiquetas que quedan sin celdas no se reutilizan.
+    """
+    
+    def __init__(self, environment):
+        """
+        Inicializa el índice y lo calcula para la cuadrícula actual
+        
+        Args:
+            environment: Instancia del entorno
+        """
+        self.environment = environment
+        self.width = environment.width
+        self.height = environment.height
+        self.labels = None
+        # Por etiqueta (la posición 0 no se usa): celdas y caja como
+        # (x mínima, y mínima, x máxima, y máxima)
+        self.sizes = None
+        self.boxes = None
+        self.version = None
+        self._cells_by_label = None
+        self.rebuild()
+    
+    def rebuild(self):
+        """
+        Recalcula el índice completo
+        """
+        is_line = self.environment.grid == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+        self.labels, count = label_line_cells(is_line)
+        self.sizes = np.zeros(count + 1, dtype=np.int64)
+        self.boxes = np.zeros((count + 1, 4), dtype=np.int32)
+        self._update_stats(0, self.height, 0, self.width, range(1, count + 1))
+        self.version = self.environment.version
+        self._cells_by_label = None
+    
+    def _update_stats(self, top, bottom, left, right, labels):
+        """
+        Recalcula el tamaño y la caja de unas etiquetas, cuyas celdas deben
+        estar todas dentro de un rectángulo
+        
+        Args:
+            top (int): Primera fila
+            bottom (int): Fila siguiente a la última
+            left (int): Primera columna
+            right (int): Columna siguiente a la última
+            labels (iterable): Etiquetas a recalcular
+        """
+        labels = np.asarray(list(labels), dtype=np.int64)
+        if labels.size == 0:
+            return
+        window = self.labels[top:bottom, left:right]
+        ys, xs = np.nonzero(np.isin(window, labels))
+        cell_labels = window[ys, xs]
+        xs = xs + left
+        ys = ys + top
+        
+        self.sizes[labels] = 0
+        np.add.at(self.sizes, cell_labels, 1)
+        self.boxes[labels] = (self.width, self.height, -1, -1)
+        np.minimum.at(self.boxes[:, 0], cell_labels, xs)
+        np.minimum.at(self.boxes[:, 1], cell_labels, ys)
+        np.maximum.at(self.boxes[:, 2], cell_labels, xs)
+        np.maximum.at(self.boxes[:, 3], cell_labels, ys)
+        self.boxes[labels[self.sizes[labels] == 0]] = 0
+    
+    def _new_labels(self, count):
+        """
+        Reserva etiquetas nuevas
+        
+        Args:
+            count (int): Etiquetas a reservar
+        
+        Returns:
+            numpy.ndarray: Etiquetas reservadas
+        """
+        first = self.sizes.size
+        self.sizes = np.concatenate([self.sizes, np.zeros(count, dtype=np.int64)])
+        self.boxes = np.concatenate([self.boxes, np.zeros((count, 4), dtype=np.int32)])
+        return np.arange(first, first + count)
+    
+    def _add_line_cell(self, x, y):
+        """
+        Aplica una celda nueva de línea
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+        """
+        neighbors = set()
+        for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+            if 0 <= nx < self.width and 0 <= ny < self.height and self.labels[ny, nx]:
+                neighbors.add(int(self.labels[ny, nx]))
+        
+        if not neighbors:
+            label = int(self._new_labels(1)[0])
+            self.boxes[label] = (x, y, x, y)
+        else:
+            label = min(neighbors)
+            for other in neighbors - {label}:
+                min_x, min_y, max_x, max_y = self.boxes[other]
+                window = self.labels[min_y:max_y + 1, min_x:max_x + 1]
+                window[window == other] = label
+                self.sizes[label] += self.sizes[other]
+                self.boxes[label, :2] = np.minimum(self.boxes[label, :2], self.boxes[other, :2])
+                self.boxes[label, 2:] = np.maximum(self.boxes[label, 2:], self.boxes[other, 2:])
+                self.sizes[other] = 0
+                self.boxes[other] = 0
+            self.boxes[label, :2] = np.minimum(self.boxes[label, :2], (x, y))
+            self.boxes[label, 2:] = np.maximum(self.boxes[label, 2:], (x, y))
+        self.labels[y, x] = label
+        self.sizes[label] += 1
+    
+    def _remove_line_cell(self, x, y):
+        """
+        Aplica una celda de línea eliminada, partiendo su componente si hace falta
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+        """
+        label = int(self.labels[y, x])
+        self.labels[y, x] = NO_COMPONENT
+        min_x, min_y, max_x, max_y = (int(value) for value in self.boxes[label])
+        top, bottom, left, right = min_y, max_y + 1, min_x, max_x + 1
+        
+        window = self.labels[top:bottom, left:right]
+        parts, count = label_line_cells(window == label)
+        relabeled = [label]
+        if count > 1:
+            new_labels = np.concatenate([[label], self._new_labels(count - 1)])
+            in_parts = parts != NO_COMPONENT
+            window[in_parts] = new_labels[parts[in_parts] - 1]
+            relabeled = new_labels.tolist()
+        self._update_stats(top, bottom, left, right, relabeled)
+    
+    def _ensure_current(self):
+        """
+        Pone el índice al día con las ediciones del entorno
+        """
+        environment = self.environment
+        if self.version == environment.version:
+            return
+        changes = environment.get_changes_since(self.version)
+        if changes is None:
+            self.rebuild()
+            return
+        
+        line_value = ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+        for x, y in changes:
+            is_line = environment.grid[y, x] == line_value
+            if is_line and not self.labels[y, x]:
+                self._add_line_cell(x, y)
+            elif not is_line and self.labels[y, x]:
+                self._remove_line_cell(x, y)
+        self.version = environment.version
+        self._cells_by_label = None
+    
+    def get_label(self, x, y):
+        """
+        Obtiene la etiqueta de la componente de una celda
+        
+        Args:
+            x (int): Coordenada x (debe ser válida)
+            y (int): Coordenada y (debe ser válida)
+        
+        Returns:
+            int: Etiqueta, o NO_COMPONENT si la celda no es línea
+        """
+        self._ensure_current()
+        return self.labels.item(y, x)
+    
+    def get_labels(self):
+        """
+        Obtiene las etiquetas de las componentes con alguna celda
+        
+        Returns:
+            numpy.ndarray: Etiquetas en orden creciente
+        """
+        self._ensure_current()
+        return np.flatnonzero(self.sizes)
+    
+    def count_components(self):
+        """
+        Cuenta las componentes de línea
+        
+        Returns:
+            int: Número de componentes con alguna celda
+        """
+        return int(self.get_labels().size)
+    
+    def get_components(self):
+        """
+        Obtiene el tamaño y la caja de cada componente
+        
+        Returns:
+            list: Un diccionario por componente con su etiqueta, número de
+            celdas y caja (x mínima, y mínima, x máxima, y máxima)
+        """
+        return [{
+            'etiqueta': int(label),
+            'celdas': int(self.sizes[label]),
+            'caja': tuple(int(value) for value in self.boxes[label]),
+        } for label in self.get_labels()]
+    
+    def get_component_cells(self, label):
+        """
+        Obtiene las celdas de una componente
+        
+        Args:
+            label (int): Etiqueta de la componente
+        
+        Returns:
+            tuple: (xs, ys) como numpy.ndarray, en orden de filas
+        """
+        self._ensure_current()
+        if label <= NO_COMPONENT or label >= self.sizes.size or not self.sizes[label]:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        min_x, min_y, max_x, max_y = (int(value) for value in self.boxes[label])
+        ys, xs = np.nonzero(self.labels[min_y:max_y + 1, min_x:max_x + 1] == label)
+        return xs + min_x, ys + min_y
+    
+    def _get_cells_by_label(self):
+        """
+        Índices planos de las celdas de línea agrupados por etiqueta
+        
+        Returns:
+            tuple: (índices planos ordenados por etiqueta, etiquetas no
+            vacías, inicio de cada etiqueta en los índices)
+        """
+        self._ensure_current()
+        if self._cells_by_label is None:
+            flat = self.labels.ravel()
+            cells = np.flatnonzero(flat)
+            cells = cells[np.argsort(flat[cells], kind='stable')]
+            labels = np.flatnonzero(self.sizes)
+            starts = np.concatenate([[0], np.cumsum(self.sizes[labels])[:-1]]).astype(np.intp)
+            self._cells_by_label = (cells, labels, starts)
+        return self._cells_by_label
+    
+    def get_coverage(self, visited):
+        """
+        Fracción de cada componente cubierta por unas celdas visitadas
+        
+        Args:
+            visited (numpy.ndarray): Celdas visitadas como máscara booleana
+                plana (alto * ancho), o una fila por ejecución (n x alto * ancho)
+        
+        Returns:
+            numpy.ndarray: Fracción por etiqueta (última dimensión indexada
+            por etiqueta; 0 en NO_COMPONENT y en etiquetas vacías)
+        """
+        cells, labels, starts = self._get_cells_by_label()
+        coverage = np.zeros(visited.shape[:-1] + (self.sizes.size,))
+        if labels.size:
+            hits = np.add.reduceat(visited[..., cells].astype(np.int64), starts, axis=-1)
+            coverage[..., labels] = hits / self.sizes[labels]
+        return coverage
+    
+    def sample_cells(self, rng, count, labels=None):
+        """
+        Elige celdas de línea al azar, uniformes entre las componentes dadas
+        
+        Args:
+            rng (random.Random): Generador de números aleatorios
+            count (int): Celdas a elegir (con repetición)
+            labels (list): Etiquetas de las componentes (por defecto todas)
+        
+        Returns:
+            list: count posiciones (x, y), o una lista vacía si las
+            componentes no tienen celdas
+        """
+        cells = []
+        for label in (self.get_labels() if labels is None else labels):
+            xs, ys = self.get_component_cells(int(label))
+            cells.extend(zip(xs.tolist(), ys.tolist()))
+        if not cells:
+            return []
+        return [cells[rng.randrange(len(cells))] for _ in range(count)]
+
+
+def create_component_index(environment):
+    """
+    Función de conveniencia para crear el índice de componentes de un entorno
+    
+    Args:
+        environment: Instancia del entorno
+    
+    Returns:
+        ComponentIndex: Índice de componentes
+    """
+    return ComponentIndex(environment)
@@ -32,12 +32,55 @@ AGENT_CONFIG = {
     'SENSOR_RANGE': 1,  # Rango de sensores del agente
 }
 
+# Configuración del bucle de simulación (paso fijo desacoplado del dibujo)
+SIMULATION_CONFIG = {
+    'SIM_HZ': AGENT_CONFIG['MOVEMENT_SPEED'],  # Pasos de simulación por segundo
+    'RENDER_FPS': 30,  # Cuadros dibujados por segundo
+    'FAST_FORWARD_FACTOR': 50,  # Multiplicador de SIM_HZ en avance rápido
+    'MAX_STEPS_PER_FRAME': 5000,  # Límite de pasos simulados entre dos cuadros
+    'MAX_SKIPPED_FRAMES': 5,  # Cuadros seguidos que se pueden omitir si hay retraso
+}
+
+# Configuración del entorno vectorizado de entrenamiento (vec_env.py)
+VEC_ENV_CONFIG = {
+    'MAX_EPISODE_STEPS': 500,  # Pasos por episodio antes de reiniciar el mundo
+    'REWARD_ON_LINE': 1.0,  # Recompensa por terminar el paso sobre la línea
+    'REWARD_OFF_LINE': 0.0,  # Recompensa por terminar el paso fuera de la línea
+    'REWARD_CONTACT': -1.0,  # Recompensa adicional por chocar con el borde
+}
+
 # Configuración del entorno
 ENVIRONMENT_CONFIG = {
     'LINE_LENGTH_MIN': 20,
     'LINE_LENGTH_MAX': 50,
     'GRID_VALUE_LINE': 1,
     'GRID_VALUE_EMPTY': 0,
+    'GRID_VALUE_BORDER': 2,  # Valor de relleno fuera de la cuadrícula
+    'GRID_DTYPE': 'uint8',  # Tipo de dato de la matriz de la cuadrícula
+    'MAX_EDIT_LOG': 1024,  # Ediciones recordadas antes de tratarlas como cambio total
+    'LINE_GROUP_COLUMNS': 3,  # Columnas de áreas de grupos de líneas
+    'LINE_GROUP_ROWS': 2,  # Filas de áreas de grupos de líneas
+    'LINE_GROUP_LENGTH_MIN': 8,  # Pasos mínimos del recorrido de cada grupo
+    'LINE_GROUP_LENGTH_MAX': 15,  # Pasos máximos del recorrido de cada grupo
+    'TILE_SIZE': 256,  # Lado de cada bloque del entorno por bloques (celdas)
+    'TILE_MEMORY_BUDGET': 64 * 1024 * 1024,  # Memoria máxima de bloques cargados (bytes)
+    'TILED_MAP_SIZE': 2**31 - 1,  # Ancho y alto por defecto del entorno por bloques
+}
+
+# Configuración del logger
+LOGGER_CONFIG = {
+    'FLUSH_EVERY_ROWS': 256,  # Filas escritas entre dos vaciados al disco
+    'FLUSH_INTERVAL_MS': 500,  # Tiempo máximo entre dos vaciados al disco
+    'BUFFER_SIZE': 64 * 1024,  # Tamaño del buffer del archivo de log (bytes)
+    'HISTORY_SIZE': 10000,  # Pasos guardados en memoria (buffer circular)
+    'SPILL_OVERFLOW': False,  # Sin log abierto, guardar en un archivo temporal los pasos que salen del buffer
+    'SPILL_DIR': None,  # Directorio del archivo de desborde (None: temporal)
+    'LOG_FORMAT': 'csv',  # Formato del log a archivo: 'csv' o 'binary'
+    'ASYNC': False,  # Escribir el log desde un hilo en segundo plano
+    'ASYNC_QUEUE_SIZE': 65536,  # Registros pendientes como máximo en modo asíncrono
+    'ASYNC_BATCH_SIZE': 1024,  # Registros que forman un lote del hilo escritor
+    'BACKPRESSURE': 'block',  # Cola llena: 'block', 'drop_oldest' o 'sample'
+    'SAMPLE_EVERY': 10,  # Periodo de muestreo de la política 'sample'
 }
 
 # Configuración de la interfaz
@@ -57,7 +100,9 @@ UI_CONFIG = {
     'GRID_AREA_WIDTH': GRID_WIDTH * CELL_SIZE,
     'GRID_AREA_HEIGHT': GRID_HEIGHT * CELL_SIZE,
     'GRID_START_X': 20,  # Margen izquierdo del grid
-    'GRID_START_Y': 120   # Margen superior del grid
+    'GRID_START_Y': 120,  # Margen superior del grid
+    'TEXT_CACHE_SIZE': 256,  # Superficies de texto renderizadas en caché
+    'TABLE_ROW_CACHE_SIZE': 32,  # Filas de la tabla de pasos en caché
 }
 
 # Direcciones del agente
@@ -68,6 +113,23 @@ DIRECTIONS = {
     'LEFT': 3
 }
 
+# Desplazamiento (dx, dy) de cada dirección, indexado por orientación
+DIRECTION_OFFSETS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+# Índice de vecindario: 2 bits por dirección absoluta (en el orden de
+# DIRECTIONS) con el estado de la celda vecina, más un bit para la celda propia
+NEIGHBOR_STATES = {
+    'LIGHT': 0,
+    'DARK': 1,
+    'BORDER': 2
+}
+NEIGHBORHOOD_MASK = {
+    'BITS_PER_DIRECTION': 2,
+    'STATE_MASK': 0b11,
+    'NEIGHBORS_MASK': 0xFF,
+    'SELF_LINE_BIT': 1 << 8,
+}
+
 # Símbolos de orientación
 ORIENTATION_SYMBOLS = ['▲', '►', '▼', '◄']
 
@@ -88,6 +150,26 @@ ACTIONS = {
     'ROTATE_180': 'rotate_180'
 }
 
+# Codificación compacta de percepciones: un bit por sensor (5 bits)
+PERCEPTION_BITS = {
+    'PISO': 1 << 0,
+    'IZQUIERDA': 1 << 1,
+    'CENTRO': 1 << 2,
+    'DERECHA': 1 << 3,
+    'CONTACTO': 1 << 4
+}
+
+# Códigos enteros de las acciones (mismas claves que ACTIONS)
+ACTION_CODES = {
+    'MOVE_FORWARD': 0,
+    'ROTATE_LEFT': 1,
+    'ROTATE_RIGHT': 2,
+    'ROTATE_180': 3
+}
+
+# Símbolo de cada código de acción en la tabla de pasos
+ACTION_LOG_SYMBOLS = ['A', 'R-', 'R+', 'A']
+
 # Configuración de botones
 BUTTONS = {
     'RANDOM_LINES': 'Generar Líneas Aleatorias',
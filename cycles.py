@@ -0,0 +1,195 @@
+"""
+Módulo de detección de ciclos del Agente Seguidor de Líneas
+Sobre una cuadrícula fija el agente es determinista: su estado completo es
+(x, y, orientación, contacto), así que tarde o temprano repite un estado y
+desde ahí recorre un ciclo. Conocido el ciclo, se puede avanzar cualquier
+número de pasos sin simularlos uno a uno
+"""
+
+from config import ACTION_CODES, PERCEPTION_BITS
+
+
+def get_agent_state(agent):
+    """
+    Obtiene el estado completo del agente
+    
+    Args:
+        agent: Instancia del agente
+    
+    Returns:
+        tuple: (x, y, orientación, contacto)
+    """
+    return (agent.x, agent.y, agent.orientation, agent.has_hit_wall)
+
+
+def set_agent_state(agent, state):
+    """
+    Restablece el estado completo del agente
+    
+    Args:
+        agent: Instancia del agente
+        state (tuple): (x, y, orientación, contacto)
+    """
+    agent.x, agent.y, agent.orientation, agent.has_hit_wall = state
+
+
+def _trace(agent, environment, max_steps=None):
+    """
+    Simula desde el estado actual del agente hasta repetir un estado
+    
+    El agente queda en su estado inicial al terminar.
+    
+    Args:
+        agent: Instancia del agente
+        environment: Instancia del entorno (no debe cambiar durante el trazado)
+        max_steps (int): Pasos máximos a simular (None para no limitar)
+    
+    Returns:
+        tuple: (estados, acciones, sobre_línea, contactos, inicio_del_ciclo);
+        estados[i] es el estado antes del paso i y las demás listas guardan
+        lo que registraría el logger en ese paso. inicio_del_ciclo es None si
+        no se repitió ningún estado en max_steps pasos
+    """
+    perceive_code = agent.perceive_code
+    act_code = agent.act_code
+    piso_bit = PERCEPTION_BITS['PISO']
+    
+    initial_state = get_agent_state(agent)
+    seen = {}
+    states = []
+    actions = []
+    on_line = []
+    contacts = []
+    cycle_start = None
+    
+    state = initial_state
+    try:
+        while max_steps is None or len(actions) < max_steps:
+            cycle_start = seen.get(state)
+            if cycle_start is not None:
+                break
+            seen[state] = len(states)
+            states.append(state)
+            
+            code = perceive_code(environment)
+            actions.append(act_code(code))
+            on_line.append(1 if code & piso_bit else 0)
+            contacts.append(1 if agent.has_hit_wall else 0)
+            state = get_agent_state(agent)
+        else:
+            # Límite alcanzado: guardar el estado final del tramo simulado
+            states.append(state)
+    finally:
+        set_agent_state(agent, initial_state)
+    
+    return states, actions, on_line, contacts, cycle_start
+
+
+def detect_cycle(agent, environment, max_steps=None):
+    """
+    Busca el ciclo que recorre el agente desde su estado actual
+    
+    El agente no se modifica.
+    
+    Args:
+        agent: Instancia del agente
+        environment: Instancia del entorno
+        max_steps (int): Pasos máximos a simular (None para no limitar; el
+            ciclo aparece como mucho en 8 x ancho x alto pasos)
+    
+    Returns:
+        dict: Paso en que empieza el ciclo, su longitud y el estado de
+        entrada, o None si no se encontró en max_steps pasos
+    """
+    states, actions, _, _, cycle_start = _trace(agent, environment, max_steps)
+    if cycle_start is None:
+        return None
+    return {
+        'inicio': cycle_start,
+        'longitud': len(actions) - cycle_start,
+        'estado': states[cycle_start],
+    }
+
+
+def _sum_span(actions, on_line, contacts, start, end, totals, times=1):
+    """
+    Suma a los totales las métricas de los pasos [start, end) del trazado
+    
+    Args:
+        actions (list): Acción de cada paso
+        on_line (list): 1 si el paso empezó sobre la línea
+        contacts (list): 1 si el paso terminó en contacto
+        start (int): Primer paso del tramo
+        end (int): Paso siguiente al último del tramo
+        totals (dict): Totales a actualizar
+        times (int): Veces que se repite el tramo
+    """
+    if times <= 0 or end <= start:
+        return
+    action_counts = totals['acciones']
+    for action in actions[start:end]:
+        action_counts[action] += times
+    totals['pasos_sobre_linea'] += sum(on_line[start:end]) * times
+    totals['pasos_con_contacto'] += sum(contacts[start:end]) * times
+
+
+def fast_forward(agent, environment, steps, logger=None):
+    """
+    Avanza el agente un número de pasos cualquiera en tiempo proporcional a
+    la longitud del prefijo y del ciclo, no al número de pasos
+    
+    El agente queda en el estado que tendría tras simular los pasos uno a
+    uno. Si se indica un logger, se le suman las métricas agregadas del
+    tramo (sin registros individuales de cada paso).
+    
+    Args:
+        agent: Instancia del agente
+        environment: Instancia del entorno
+        steps (int): Pasos a avanzar
+        logger: Instancia de AgentLogger (opcional)
+    
+    Returns:
+        dict: Pasos avanzados, pasos simulados realmente, ciclo encontrado
+        (o None) y métricas agregadas del tramo
+    """
+    states, actions, on_line, contacts, cycle_start = _trace(agent, environment, steps)
+    
+    totals = {
+        'acciones': [0] * len(ACTION_CODES),
+        'pasos_sobre_linea': 0,
+        'pasos_con_contacto': 0,
+    }
+    cycle = None
+    
+    if cycle_start is None:
+        # Se alcanzó el número de pasos sin repetir estado
+        _sum_span(actions, on_line, contacts, 0, steps, totals)
+        final_state = states[steps]
+    else:
+        cycle_length = len(actions) - cycle_start
+        cycle = {
+            'inicio': cycle_start,
+            'longitud': cycle_length,
+            'estado': states[cycle_start],
+        }
+        laps, remainder = divmod(steps - cycle_start, cycle_length)
+        _sum_span(actions, on_line, contacts, 0, cycle_start, totals)
+        _sum_span(actions, on_line, contacts, cycle_start, len(actions), totals, laps)
+        _sum_span(actions, on_line, contacts, cycle_start, cycle_start + remainder, totals)
+        final_state = states[cycle_start + remainder]
+    
+    set_agent_state(agent, final_state)
+    if logger is not None:
+        # El trazado cubre el prefijo y una vuelta del ciclo: si no pisa la
+        # línea ahí, no la pisa nunca
+        simulated = min(steps, len(on_line))
+        first_line_step = on_line.index(1, 0, simulated) if 1 in on_line[:simulated] else None
+        logger.log_skipped_steps(steps, totals['acciones'], totals['pasos_sobre_linea'], 
+                                 totals['pasos_con_contacto'], first_line_step)
+    
+    return {
+        'pasos': steps,
+        'pasos_simulados': len(actions),
+        'ciclo': cycle,
+        'metricas': totals,
+    }
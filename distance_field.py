@@ -0,0 +1,373 @@
+"""
+Módulo de campo de distancias del Agente Seguidor de Líneas
+Precalcula, para cada celda, la distancia en pasos (4-conexa) a la línea más
+cercana y la dirección absoluta del primer paso hacia ella, y define el agente
+buscador que la usa cuando no ve ninguna línea
+"""
+
+import numpy as np
+from config import ENVIRONMENT_CONFIG, DIRECTION_OFFSETS, PERCEPTION_BITS, ACTION_CODES
+from agent import LineFollowerAgent, PERCEPTION_ACTION_TABLE, ACTION_ROTATIONS
+
+
+# Dirección de las celdas sobre la línea o sin ninguna línea alcanzable
+NO_DIRECTION = len(DIRECTION_OFFSETS)
+
+# Bits de percepción que indican una línea visible
+_LINE_BITS = (PERCEPTION_BITS['PISO'] | PERCEPTION_BITS['IZQUIERDA'] |
+              PERCEPTION_BITS['CENTRO'] | PERCEPTION_BITS['DERECHA'])
+
+# Acción que orienta al agente hacia cada dirección relativa (frente,
+# derecha, atrás, izquierda)
+_SEEK_ACTIONS = [
+    ACTION_CODES['MOVE_FORWARD'],
+    ACTION_CODES['ROTATE_RIGHT'],
+    ACTION_CODES['ROTATE_180'],
+    ACTION_CODES['ROTATE_LEFT'],
+]
+
+
+def _relax_rows(distance):
+    """
+    Transformada de distancia L1 a lo largo del eje 0, en el sitio
+    
+    Dos barridos fila a fila, hacia abajo y hacia arriba, con
+    d[i] = min(d[i], d[i -/+ 1] + 1): cada operación recorre una fila
+    contigua que cabe en caché, y un solo buffer de fila evita reservar
+    arreglos del tamaño del mapa.
+    
+    Args:
+        distance (numpy.ndarray): Distancias (int32, filas contiguas)
+    """
+    step = np.empty(distance.shape[1:], dtype=distance.dtype)
+    for rows in (distance, distance[::-1]):
+        for previous, row in zip(rows, rows[1:]):
+            np.add(previous, 1, out=step)
+            np.minimum(row, step, out=row)
+
+
+def _distance_transform(transposed):
+    """
+    Transformada de distancia L1 completa de un rectángulo de celdas
+    
+    Recibe las distancias traspuestas para que el barrido horizontal también
+    recorra filas contiguas; el resultado se traspone una sola vez para el
+    barrido vertical.
+    
+    Args:
+        transposed (numpy.ndarray): Distancias iniciales (int32, contiguas)
+            traspuestas: una fila por columna de celdas. Se modifica
+    
+    Returns:
+        numpy.ndarray: Distancias (alto x ancho)
+    """
+    _relax_rows(transposed)
+    distance = np.ascontiguousarray(transposed.T)
+    _relax_rows(distance)
+    return distance
+
+
+def _first_steps(distance):
+    """
+    Calcula la dirección del primer paso hacia la línea de un rectángulo
+    
+    Cada celda apunta a la primera vecina (en el orden de DIRECTIONS) que
+    está un paso más cerca de la línea; las celdas de línea y las que no
+    tienen línea alcanzable quedan con NO_DIRECTION. Solo se miran las
+    vecinas dentro del rectángulo, así que las celdas de su borde son
+    exactas únicamente en el borde del mapa.
+    
+    Args:
+        distance (numpy.ndarray): Distancias del rectángulo
+    
+    Returns:
+        numpy.ndarray: Direcciones (uint8) del rectángulo
+    """
+    height, width = distance.shape
+    direction = np.full(distance.shape, NO_DIRECTION, dtype=np.uint8)
+    target = distance - 1
+    # En orden inverso, para que la primera dirección válida sea la última escrita
+    for code in reversed(range(len(DIRECTION_OFFSETS))):
+        dx, dy = DIRECTION_OFFSETS[code]
+        cells = (slice(max(-dy, 0), height - max(dy, 0)), slice(max(-dx, 0), width - max(dx, 0)))
+        neighbors = (slice(max(dy, 0), height + min(dy, 0)), slice(max(dx, 0), width + min(dx, 0)))
+        np.copyto(direction[cells], code, where=distance[neighbors] == target[cells])
+    return direction
+
+
+def _leading_run(mask):
+    """
+    Cuenta los valores verdaderos consecutivos al principio de un arreglo
+    
+    Args:
+        mask (numpy.ndarray): Arreglo booleano de una dimensión
+    
+    Returns:
+        int: Longitud del tramo inicial de valores verdaderos
+    """
+    return len(mask) if mask.all() else int(mask.argmin())
+
+
+class DistanceField:
+    """
+    Campo de distancias y direcciones hacia la línea más cercana
+    
+    Sin obstáculos, la distancia de la búsqueda en anchura desde todas las
+    celdas de línea es la distancia L1, que se calcula con barridos
+    separables (columnas y filas). El campo sigue las ediciones del entorno:
+    cada celda de línea añadida o eliminada solo recalcula el rectángulo de
+    celdas cuya distancia puede cambiar.
+    
+    Las celdas con distancia 0 son siempre las líneas que el campo ya
+    aplicó, y las distancias son exactas para ellas; así las ediciones se
+    aplican de una en una aunque lleguen varias juntas.
+    """
+    
+    def __init__(self, environment):
+        """
+        Inicializa el campo y lo calcula para la cuadrícula actual
+        
+        Args:
+            environment: Instancia del entorno
+        """
+        self.environment = environment
+        self.width = environment.width
+        self.height = environment.height
+        # Distancia de las celdas sin línea alcanzable (mapa sin líneas)
+        self.unreachable = self.width + self.height
+        self.distance = None
+        self.direction = None
+        self.version = None
+        self.rebuild()
+    
+    def rebuild(self):
+        """
+        Recalcula el campo completo
+        """
+        is_line = self.environment.grid.T == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+        transposed = np.full(is_line.shape, self.unreachable, dtype=np.int32)
+        transposed[is_line] = 0
+        
+        self.distance = _distance_transform(transposed)
+        self.direction = _first_steps(self.distance)
+        self.version = self.environment.version
+    
+    def _update_directions(self, top, bottom, left, right):
+        """
+        Recalcula las direcciones de un rectángulo de celdas
+        
+        Args:
+            top (int): Primera fila
+            bottom (int): Fila siguiente a la última
+            left (int): Primera columna
+            right (int): Columna siguiente a la última
+        """
+        # Rectángulo con un marco de vecinas (salvo en el borde del mapa)
+        source_top, source_left = max(top - 1, 0), max(left - 1, 0)
+        source_bottom, source_right = min(bottom + 1, self.height), min(right + 1, self.width)
+        direction = _first_steps(self.distance[source_top:source_bottom, source_left:source_right])
+        self.direction[top:bottom, left:right] = \
+            direction[top - source_top:bottom - source_top, left - source_left:right - source_left]
+    
+    def _affected_box(self, x, y, affected):
+        """
+        Calcula el rectángulo de celdas afectadas por la edición de una celda
+        
+        Las celdas afectadas (las que la celda nueva acerca, o las que
+        tenían a la celda eliminada entre sus líneas más cercanas) incluyen,
+        con cada celda, todo el rectángulo entre ella y la celda editada:
+        la distancia cambia a lo sumo en 1 por paso. Por eso el rectángulo
+        que las contiene se mide sobre la fila y la columna de la celda.
+        
+        Args:
+            x (int): Coordenada x de la celda editada
+            y (int): Coordenada y de la celda editada
+            affected (callable): Función (distancias, pasos desde la celda)
+                -> máscara de celdas afectadas (numpy.greater o numpy.equal)
+        
+        Returns:
+            tuple: (primera fila, fila siguiente a la última, primera
+            columna, columna siguiente a la última)
+        """
+        row, column = self.distance[y], self.distance[:, x]
+        left, right, up, down = (
+            _leading_run(affected(ray, np.arange(1, len(ray) + 1)))
+            for ray in (row[:x][::-1], row[x + 1:], column[:y][::-1], column[y + 1:])
+        )
+        return y - up, y + down + 1, x - left, x + right + 1
+    
+    def _add_line_cell(self, x, y):
+        """
+        Aplica una celda nueva de línea
+        
+        En el rectángulo de celdas que la celda nueva acerca, la distancia
+        pasa a ser el mínimo entre la anterior y la distancia a la celda nueva.
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+        """
+        top, bottom, left, right = self._affected_box(x, y, np.greater)
+        to_new = (np.abs(np.arange(top, bottom) - y)[:, None] +
+                  np.abs(np.arange(left, right) - x)[None, :])
+        window = self.distance[top:bottom, left:right]
+        np.minimum(window, to_new, out=window)
+        self._update_directions(max(top - 1, 0), min(bottom + 1, self.height),
+                                max(left - 1, 0), min(right + 1, self.width))
+    
+    def _remove_line_cell(self, x, y):
+        """
+        Aplica una celda de línea eliminada
+        
+        Solo pueden alejarse las celdas que tenían a la celda eliminada entre
+        sus líneas más cercanas. Su rectángulo se recalcula desde las líneas
+        que contiene y desde un marco de una celda a su alrededor, cuyas
+        distancias no cambian: el camino más corto hacia una línea de fuera
+        cruza el marco. Si el rectángulo cubre medio mapa o más, sale más
+        barato recalcular el campo completo.
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+        """
+        top, bottom, left, right = self._affected_box(x, y, np.equal)
+        if (bottom - top) * (right - left) * 2 >= self.distance.size:
+            self.rebuild()
+            return
+        source_top, source_left = max(top - 1, 0), max(left - 1, 0)
+        source_bottom, source_right = min(bottom + 1, self.height), min(right + 1, self.width)
+        window = self.distance[source_top:source_bottom, source_left:source_right]
+        
+        # Dentro del rectángulo solo quedan como fuentes las demás líneas
+        transposed = np.ascontiguousarray(window.T)
+        inner = transposed[left - source_left:right - source_left, top - source_top:bottom - source_top]
+        inner[inner != 0] = self.unreachable
+        transposed[x - source_left, y - source_top] = self.unreachable
+        window[...] = _distance_transform(transposed)
+        self._update_directions(source_top, source_bottom, source_left, source_right)
+    
+    def _ensure_current(self):
+        """
+        Pone el campo al día con las ediciones del entorno
+        """
+        environment = self.environment
+        if self.version == environment.version:
+            return
+        changes = environment.get_changes_since(self.version)
+        if changes is None:
+            self.rebuild()
+            return
+        
+        line_value = ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+        for x, y in changes:
+            is_line = environment.grid[y, x] == line_value
+            if is_line and self.distance[y, x] != 0:
+                self._add_line_cell(x, y)
+            elif not is_line and self.distance[y, x] == 0:
+                self._remove_line_cell(x, y)
+        self.version = environment.version
+    
+    def get_distance(self, x, y):
+        """
+        Obtiene la distancia de una celda a la línea más cercana
+        
+        Args:
+            x (int): Coordenada x (debe ser válida)
+            y (int): Coordenada y (debe ser válida)
+        
+        Returns:
+            int: Pasos hasta la línea más cercana (ancho + alto si no hay líneas)
+        """
+        self._ensure_current()
+        return self.distance.item(y, x)
+    
+    def get_direction(self, x, y):
+        """
+        Obtiene la dirección del primer paso hacia la línea más cercana
+        
+        Args:
+            x (int): Coordenada x (debe ser válida)
+            y (int): Coordenada y (debe ser válida)
+        
+        Returns:
+            int: Dirección absoluta (ver DIRECTIONS) o NO_DIRECTION si la
+            celda es línea o no hay líneas
+        """
+        self._ensure_current()
+        return self.direction.item(y, x)
+
+
+class SeekingAgent(LineFollowerAgent):
+    """
+    Agente seguidor de líneas que, sin ninguna línea a la vista, se orienta
+    hacia la línea más cercana según un campo de distancias en lugar de
+    avanzar a ciegas
+    """
+    
+    def __init__(self, x, y, grid_width, grid_height, distance_field):
+        """
+        Inicializa el agente en la posición especificada
+        
+        Args:
+            x (int): Posición inicial x
+            y (int): Posición inicial y
+            grid_width (int): Ancho de la cuadrícula
+            grid_height (int): Alto de la cuadrícula
+            distance_field (DistanceField): Campo de distancias del entorno
+        """
+        super().__init__(x, y, grid_width, grid_height)
+        self.distance_field = distance_field
+    
+    def act_code(self, code):
+        """
+        Ejecuta la acción para un código de percepción
+        
+        Con alguna línea a la vista se usa la tabla de percepción-acción;
+        si no, la acción que orienta al agente hacia la línea más cercana.
+        
+        Args:
+            code (int): Código de percepción de 5 bits
+        
+        Returns:
+            int: Código de la acción tomada (ver ACTION_CODES)
+        """
+        action = PERCEPTION_ACTION_TABLE[code]
+        if not code & _LINE_BITS:
+            direction = self.distance_field.get_direction(self.x, self.y)
+            if direction != NO_DIRECTION:
+                action = _SEEK_ACTIONS[(direction - self.orientation) % 4]
+        self.orientation = (self.orientation + ACTION_ROTATIONS[action]) % 4
+        self.move_forward()
+        return action
+
+
+def create_distance_field(environment):
+    """
+    Función de conveniencia para crear el campo de distancias de un entorno
+    
+    Args:
+        environment: Instancia del entorno
+    
+    Returns:
+        DistanceField: Campo de distancias
+    """
+    return DistanceField(environment)
+
+
+def create_seeking_agent(x, y, environment, distance_field=None):
+    """
+    Función de conveniencia para crear un agente buscador
+    
+    Args:
+        x (int): Posición inicial x
+        y (int): Posición inicial y
+        environment: Instancia del entorno
+        distance_field (DistanceField): Campo ya calculado para el entorno
+            (opcional; si falta se calcula)
+    
+    Returns:
+        SeekingAgent: Instancia del agente creado
+    """
+    if distance_field is None:
+        distance_field = DistanceField(environment)
+    return SeekingAgent(x, y, environment.width, environment.height, distance_field)
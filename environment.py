@@ -3,8 +3,11 @@ Módulo de lógica del entorno para el Agente Seguidor de Líneas
 Contiene la generación de líneas y la gestión del entorno
 """
 
-import random
-from config import ENVIRONMENT_CONFIG, DIRECTIONS
+import numpy as np
+from config import (
+    ENVIRONMENT_CONFIG, DIRECTIONS, DIRECTION_OFFSETS, 
+    NEIGHBOR_STATES, NEIGHBORHOOD_MASK
+)
 
 
 class Environment:
@@ -23,107 +26,77 @@ class Environment:
         self.width = width
         self.height = height
         self.grid = self._create_empty_grid()
+        self.neighborhood = None
         
-    def _create_empty_grid(self):
+        # Control de cambios: versión actual, última versión con cambio total
+        # y celdas editadas desde entonces como (versión, x, y)
+        self.version = 0
+        self._full_change_version = 0
+        self._edited_cells = []
+        self.notify_grid_changed()
+        
+    @classmethod
+    def from_arrays(cls, grid, neighborhood=None):
         """
-        Crea una cuadrícula vacía
+        Crea un entorno sobre una cuadrícula existente sin copiarla
+        
+        Si los arreglos son de solo lectura (por ejemplo, memoria compartida
+        entre procesos), el entorno solo admite consultas: generate_line,
+        reset y set_cell lanzan ValueError.
+        
+        Args:
+            grid (numpy.ndarray): Cuadrícula (alto x ancho, GRID_DTYPE)
+            neighborhood (numpy.ndarray): Índice de vecindario ya calculado
+                para la cuadrícula (opcional; si falta se calcula)
         
         Returns:
-            list: Cuadrícula vacía inicializada con ceros
+            Environment: Entorno que usa los arreglos dados
         """
-        return [[ENVIRONMENT_CONFIG['GRID_VALUE_EMPTY'] for _ in range(self.width)] 
-                for _ in range(self.height)]
-    
-    def generate_line(self):
+        if grid.ndim != 2 or grid.dtype != np.dtype(ENVIRONMENT_CONFIG['GRID_DTYPE']):
+            raise ValueError(f"Cuadrícula no compatible: {grid.dtype} {grid.shape}")
+        if neighborhood is not None and neighborhood.shape != grid.shape:
+            raise ValueError("El índice de vecindario no coincide con la cuadrícula")
+        
+        environment = cls.__new__(cls)
+        environment.height, environment.width = grid.shape
+        environment.grid = grid
+        environment.neighborhood = neighborhood
+        environment.version = 1
+        environment._full_change_version = 1
+        environment._edited_cells = []
+        if neighborhood is None:
+            environment.rebuild_neighborhood_index()
+        return environment
+        
+    def _create_empty_grid(self):
         """
-        Genera múltiples grupos de líneas separados en la cuadrícula
+        Crea una cuadrícula vacía
         
         Returns:
-            list: Cuadrícula con los grupos de líneas generados
+            numpy.ndarray: Cuadrícula (alto x ancho) inicializada con ceros
         """
-        # Reiniciar la cuadrícula
-        self.grid = self._create_empty_grid()
-        
-        # Generar exactamente 6 grupos de líneas (uno por área)
-        num_groups = 6
-        
-        for group in range(num_groups):
-            self._generate_line_group(group)
-            
-        return self.grid
+        return np.full((self.height, self.width), 
+                       ENVIRONMENT_CONFIG['GRID_VALUE_EMPTY'], 
+                       dtype=ENVIRONMENT_CONFIG['GRID_DTYPE'])
     
-    def _generate_line_group(self, group_id):
+    def generate_line(self, seed=None, group_columns=None, group_rows=None):
         """
-        Genera un grupo específico de líneas
+        Genera múltiples grupos de líneas separados en la cuadrícula
         
         Args:
-            group_id (int): Identificador del grupo
-        """
-        # Definir áreas para cada grupo para evitar solapamiento
-        area_width = self.width // 3
-        area_height = self.height // 2
-        
-        # Calcular posición base del grupo
-        if group_id < 3:
-            # Grupos en la parte superior
-            base_x = group_id * area_width
-            base_y = 0
-        else:
-            # Grupos en la parte inferior
-            base_x = (group_id - 3) * area_width
-            base_y = area_height
-        
-        # Asegurar que no se salga de los límites
-        base_x = min(base_x, self.width - 5)
-        base_y = min(base_y, self.height - 5)
-        
-        # Posición inicial aleatoria dentro del área del grupo
-        x = base_x + random.randint(0, min(area_width - 1, 4))
-        y = base_y + random.randint(0, min(area_height - 1, 4))
-        
-        # Asegurar que esté dentro de los límites
-        x = min(x, self.width - 1)
-        y = min(y, self.height - 1)
+            seed (int or numpy.random.Generator): Seed o generador para obtener
+                una cuadrícula reproducible (por defecto, entropía del sistema)
+            group_columns (int): Columnas de áreas de grupos (opcional)
+            group_rows (int): Filas de áreas de grupos (opcional)
         
-        # Marcar la posición inicial
-        self.grid[y][x] = ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
-        
-        # Direcciones posibles
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-        
-        # Generar líneas en este grupo con longitud variable
-        length = random.randint(8, 15)  # Líneas más cortas por grupo
-        
-        for _ in range(length):
-            # Elegir una dirección aleatoria
-            dx, dy = random.choice(directions)
-            new_x, new_y = x + dx, y + dy
+        Returns:
+            numpy.ndarray: Cuadrícula con los grupos de líneas generados
+        """
+        self.grid[...] = generate_line_grids(self.width, self.height, [seed], 
+                                             group_columns, group_rows)[0]
+        self.notify_grid_changed()
             
-            # Verificar límites y que no se salga del área del grupo
-            if (0 <= new_x < self.width and 
-                0 <= new_y < self.height and
-                base_x <= new_x < base_x + area_width and
-                base_y <= new_y < base_y + area_height):
-                x, y = new_x, new_y
-                self.grid[y][x] = ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
-            else:
-                # Si no puede continuar en esa dirección, elegir otra
-                valid_dirs = []
-                for dir_x, dir_y in directions:
-                    test_x, test_y = x + dir_x, y + dir_y
-                    if (0 <= test_x < self.width and 
-                        0 <= test_y < self.height and
-                        base_x <= test_x < base_x + area_width and
-                        base_y <= test_y < base_y + area_height):
-                        valid_dirs.append((dir_x, dir_y))
-                
-                if valid_dirs:
-                    dx, dy = random.choice(valid_dirs)
-                    x, y = x + dx, y + dy
-                    self.grid[y][x] = ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
-                else:
-                    # Si no hay direcciones válidas, terminar este grupo
-                    break
+        return self.grid
     
     def get_cell_value(self, x, y):
         """
@@ -137,7 +110,7 @@ class Environment:
             int: Valor de la celda o None si está fuera de límites
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x]
+            return int(self.grid[y, x])
         return None
     
     def is_valid_position(self, x, y):
@@ -166,14 +139,53 @@ class Environment:
         """
         if not self.is_valid_position(x, y):
             return False
-        return self.grid[y][x] == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+        return bool(self.grid[y, x] == ENVIRONMENT_CONFIG['GRID_VALUE_LINE'])
+    
+    def get_neighborhood(self, x, y, radius=1):
+        """
+        Obtiene la ventana cuadrada de celdas centrada en una posición
+        
+        Las celdas fuera de la cuadrícula se rellenan con GRID_VALUE_BORDER,
+        de modo que la ventana siempre tiene tamaño (2*radius+1)^2.
+        
+        Args:
+            x (int): Coordenada x del centro
+            y (int): Coordenada y del centro
+            radius (int): Radio de la ventana
+            
+        Returns:
+            numpy.ndarray: Ventana de celdas (fila = y, columna = x)
+        """
+        size = 2 * radius + 1
+        window = np.full((size, size), ENVIRONMENT_CONFIG['GRID_VALUE_BORDER'], 
+                         dtype=self.grid.dtype)
+        
+        # Intersección de la ventana con la cuadrícula
+        x0, x1 = max(x - radius, 0), min(x + radius + 1, self.width)
+        y0, y1 = max(y - radius, 0), min(y + radius + 1, self.height)
+        if x0 < x1 and y0 < y1:
+            window[y0 - (y - radius):y1 - (y - radius), 
+                   x0 - (x - radius):x1 - (x - radius)] = self.grid[y0:y1, x0:x1]
+        return window
+    
+    def count_line_cells(self):
+        """
+        Cuenta las celdas que contienen línea
+        
+        Returns:
+            int: Número de celdas con línea
+        """
+        return int(np.count_nonzero(self.grid == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']))
     
     def get_grid(self):
         """
         Obtiene la cuadrícula completa
         
+        La matriz admite tanto grid[y][x] como grid[y, x], por lo que
+        puede recorrerse igual que la antigua lista de listas.
+        
         Returns:
-            list: Cuadrícula del entorno
+            numpy.ndarray: Cuadrícula del entorno (alto x ancho, uint8)
         """
         return self.grid
     
@@ -181,7 +193,261 @@ class Environment:
         """
         Reinicia el entorno a su estado inicial
         """
-        self.grid = self._create_empty_grid()
+        self.grid.fill(ENVIRONMENT_CONFIG['GRID_VALUE_EMPTY'])
+        self.notify_grid_changed()
+    
+    def set_cell(self, x, y, value):
+        """
+        Modifica el valor de una celda y actualiza el índice de vecindario
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+            value (int): Nuevo valor (GRID_VALUE_LINE o GRID_VALUE_EMPTY)
+        """
+        if not self.is_valid_position(x, y):
+            raise IndexError(f"Posición fuera de la cuadrícula: ({x}, {y})")
+        self.grid[y, x] = value
+        self._patch_neighborhood_index(x, y)
+        
+        self.version += 1
+        if len(self._edited_cells) >= ENVIRONMENT_CONFIG['MAX_EDIT_LOG']:
+            self._mark_full_change()
+        else:
+            self._edited_cells.append((self.version, x, y))
+    
+    def notify_grid_changed(self):
+        """
+        Registra un cambio arbitrario de la cuadrícula y reconstruye los índices
+        
+        Debe llamarse si la cuadrícula se modifica directamente (sin set_cell).
+        """
+        self.version += 1
+        self._mark_full_change()
+        self.rebuild_neighborhood_index()
+    
+    def _mark_full_change(self):
+        """
+        Marca la versión actual como cambio total y descarta las ediciones
+        """
+        self._full_change_version = self.version
+        self._edited_cells = []
+    
+    def get_changes_since(self, version):
+        """
+        Obtiene las celdas modificadas desde una versión dada
+        
+        Args:
+            version (int): Versión conocida por quien consulta
+            
+        Returns:
+            list: Lista de (x, y) modificadas, o None si hubo un cambio total
+            posterior y debe considerarse modificada toda la cuadrícula
+        """
+        if version < self._full_change_version:
+            return None
+        return [(x, y) for edit_version, x, y in self._edited_cells if edit_version > version]
+    
+    def rebuild_neighborhood_index(self):
+        """
+        Reconstruye el índice de vecindario de toda la cuadrícula
+        
+        Cada celda guarda una máscara empaquetada: para cada dirección
+        absoluta d, los bits [2d, 2d+1] contienen el estado de la celda
+        vecina (NEIGHBOR_STATES) y SELF_LINE_BIT indica si la propia celda
+        es línea. Se invoca desde notify_grid_changed().
+        """
+        # Estados de cada celda con un marco de borde alrededor
+        states = np.full((self.height + 2, self.width + 2), 
+                         NEIGHBOR_STATES['BORDER'], dtype=np.uint16)
+        is_line = self.grid == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+        states[1:-1, 1:-1] = np.where(is_line, NEIGHBOR_STATES['DARK'], 
+                                      NEIGHBOR_STATES['LIGHT'])
+        
+        index = np.zeros((self.height, self.width), dtype=np.uint16)
+        for direction, (dx, dy) in enumerate(DIRECTION_OFFSETS):
+            neighbor_states = states[1 + dy:1 + dy + self.height, 
+                                     1 + dx:1 + dx + self.width]
+            index |= neighbor_states << (NEIGHBORHOOD_MASK['BITS_PER_DIRECTION'] * direction)
+        index[is_line] |= NEIGHBORHOOD_MASK['SELF_LINE_BIT']
+        
+        self.neighborhood = index
+    
+    def _patch_neighborhood_index(self, x, y):
+        """
+        Recalcula la máscara de una celda y de sus cuatro vecinas
+        
+        Args:
+            x (int): Coordenada x de la celda modificada
+            y (int): Coordenada y de la celda modificada
+        """
+        for cx, cy in [(x, y)] + [(x + dx, y + dy) for dx, dy in DIRECTION_OFFSETS]:
+            if self.is_valid_position(cx, cy):
+                self.neighborhood[cy, cx] = self._compute_neighborhood_mask(cx, cy)
+    
+    def _compute_neighborhood_mask(self, x, y):
+        """
+        Calcula la máscara de vecindario de una sola celda
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+            
+        Returns:
+            int: Máscara empaquetada de la celda
+        """
+        mask = NEIGHBORHOOD_MASK['SELF_LINE_BIT'] if self.is_line_at(x, y) else 0
+        for direction, (dx, dy) in enumerate(DIRECTION_OFFSETS):
+            nx, ny = x + dx, y + dy
+            if not self.is_valid_position(nx, ny):
+                state = NEIGHBOR_STATES['BORDER']
+            elif self.is_line_at(nx, ny):
+                state = NEIGHBOR_STATES['DARK']
+            else:
+                state = NEIGHBOR_STATES['LIGHT']
+            mask |= state << (NEIGHBORHOOD_MASK['BITS_PER_DIRECTION'] * direction)
+        return mask
+    
+    def get_neighborhood_mask(self, x, y):
+        """
+        Obtiene la máscara precalculada del vecindario de una celda
+        
+        Args:
+            x (int): Coordenada x (debe ser válida)
+            y (int): Coordenada y (debe ser válida)
+            
+        Returns:
+            int: Máscara empaquetada (ver rebuild_neighborhood_index)
+        """
+        return self.neighborhood.item(y, x)
+
+
+# Direcciones posibles de cada paso del recorrido, en orden de elección
+_WALK_DX = np.array([0, 0, -1, 1])
+_WALK_DY = np.array([-1, 1, 0, 0])
+
+
+def _line_group_areas(width, height, columns, rows):
+    """
+    Calcula el área de cada grupo de líneas: una rejilla de columns x rows
+    áreas, recorrida por filas
+    
+    Args:
+        width (int): Ancho de la cuadrícula
+        height (int): Alto de la cuadrícula
+        columns (int): Columnas de áreas
+        rows (int): Filas de áreas
+        
+    Returns:
+        tuple: (base_x, base_y) de cada grupo como arreglos, ancho y alto del área
+    """
+    area_width = width // columns
+    area_height = height // rows
+    groups = np.arange(columns * rows)
+    base_x = (groups % columns) * area_width
+    base_y = (groups // columns) * area_height
+    
+    # Asegurar que no se salga de los límites
+    base_x = np.minimum(base_x, width - 5)
+    base_y = np.minimum(base_y, height - 5)
+    return base_x, base_y, area_width, area_height
+
+
+def generate_line_grids(width, height, seeds, group_columns=None, group_rows=None):
+    """
+    Genera un lote de cuadrículas con grupos de líneas en una sola llamada
+    
+    Cada grupo es un recorrido aleatorio que parte de una posición cercana a
+    la esquina de su área y no sale de ella. Los recorridos de todos los
+    grupos de todas las cuadrículas avanzan juntos, un paso por iteración.
+    Cada cuadrícula solo depende de su seed, no del resto del lote ni del
+    proceso que la genera.
+    
+    Args:
+        width (int): Ancho de las cuadrículas
+        height (int): Alto de las cuadrículas
+        seeds (list): Un seed (int), numpy.random.Generator o None por cuadrícula
+        group_columns (int): Columnas de áreas de grupos (por defecto
+            ENVIRONMENT_CONFIG['LINE_GROUP_COLUMNS'])
+        group_rows (int): Filas de áreas de grupos (por defecto
+            ENVIRONMENT_CONFIG['LINE_GROUP_ROWS'])
+        
+    Returns:
+        numpy.ndarray: Cuadrículas (lote x alto x ancho, GRID_DTYPE)
+    """
+    count = len(seeds)
+    group_columns = group_columns or ENVIRONMENT_CONFIG['LINE_GROUP_COLUMNS']
+    group_rows = group_rows or ENVIRONMENT_CONFIG['LINE_GROUP_ROWS']
+    groups = group_columns * group_rows
+    base_x, base_y, area_width, area_height = _line_group_areas(width, height, 
+                                                                group_columns, group_rows)
+    span_x = max(min(area_width - 1, 4), 0)
+    span_y = max(min(area_height - 1, 4), 0)
+    length_min = ENVIRONMENT_CONFIG['LINE_GROUP_LENGTH_MIN']
+    steps = ENVIRONMENT_CONFIG['LINE_GROUP_LENGTH_MAX']
+    
+    # Números aleatorios de cada cuadrícula, extraídos siempre en el mismo orden
+    offset_x = np.empty((count, groups), dtype=np.int64)
+    offset_y = np.empty((count, groups), dtype=np.int64)
+    lengths = np.empty((count, groups), dtype=np.int64)
+    choices = np.empty((count, groups, steps), dtype=np.int64)
+    fallbacks = np.empty((count, groups, steps))
+    for index, seed in enumerate(seeds):
+        rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        offset_x[index] = rng.integers(0, span_x + 1, size=groups)
+        offset_y[index] = rng.integers(0, span_y + 1, size=groups)
+        lengths[index] = rng.integers(length_min, steps + 1, 
+                                      size=groups)
+        choices[index] = rng.integers(0, len(_WALK_DX), size=(groups, steps))
+        fallbacks[index] = rng.random((groups, steps))
+    
+    # Posición inicial dentro del área de cada grupo
+    x = np.minimum(base_x + offset_x, width - 1)
+    y = np.minimum(base_y + offset_y, height - 1)
+    
+    # Límites de cada grupo: dentro de la cuadrícula y de su área
+    min_x = np.maximum(base_x, 0)[:, None]
+    max_x = np.minimum(base_x + area_width, width)[:, None]
+    min_y = np.maximum(base_y, 0)[:, None]
+    max_y = np.minimum(base_y + area_height, height)[:, None]
+    
+    path_x = np.empty((steps + 1, count, groups), dtype=np.int64)
+    path_y = np.empty((steps + 1, count, groups), dtype=np.int64)
+    on_path = np.zeros((steps + 1, count, groups), dtype=bool)
+    path_x[0], path_y[0], on_path[0] = x, y, True
+    alive = np.ones((count, groups), dtype=bool)
+    
+    for step in range(steps):
+        # Validez de las cuatro direcciones desde la posición actual
+        test_x = x[..., None] + _WALK_DX
+        test_y = y[..., None] + _WALK_DY
+        valid = ((test_x >= min_x) & (test_x < max_x) & 
+                 (test_y >= min_y) & (test_y < max_y))
+        
+        # Dirección elegida; si no es válida, otra al azar entre las válidas
+        choice = choices[..., step]
+        chosen_valid = np.take_along_axis(valid, choice[..., None], axis=-1)[..., 0]
+        num_valid = valid.sum(axis=-1)
+        rank = (fallbacks[..., step] * num_valid).astype(np.int64)
+        fallback = np.argmax(np.cumsum(valid, axis=-1) > rank[..., None], axis=-1)
+        direction = np.where(chosen_valid, choice, fallback)
+        
+        # Sin direcciones válidas el grupo termina
+        active = alive & (step < lengths)
+        alive &= ~(active & (num_valid == 0))
+        moving = active & alive
+        
+        x = np.where(moving, x + _WALK_DX[direction], x)
+        y = np.where(moving, y + _WALK_DY[direction], y)
+        path_x[step + 1], path_y[step + 1], on_path[step + 1] = x, y, moving
+    
+    # Marcar todas las celdas visitadas en una sola operación
+    grids = np.full((count, height, width), ENVIRONMENT_CONFIG['GRID_VALUE_EMPTY'], 
+                    dtype=ENVIRONMENT_CONFIG['GRID_DTYPE'])
+    grid_index = np.broadcast_to(np.arange(count)[:, None], (count, groups))
+    grid_index = np.broadcast_to(grid_index, on_path.shape)
+    grids[grid_index[on_path], path_y[on_path], path_x[on_path]] = ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+    return grids
 
 
 def create_environment(width, height):
@@ -0,0 +1,391 @@
+"""
+Barrido de experimentos del Agente Seguidor de Líneas
+Reparte combinaciones de (mapa, posición inicial, orientación, pasos,
+política) entre varios procesos y reúne las métricas de cada ejecución en
+un único archivo de resultados
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import numpy as np
+from config import GRID_WIDTH, GRID_HEIGHT, PERCEPTION_BITS, ACTION_CODES, NEIGHBORHOOD_MASK
+from agent import ACTION_NAMES
+from components import create_component_index
+from environment import create_environment
+from shared_grid import attach_environment, publish_environment
+from transitions import ACTION_TABLE_ARRAY, vector_perceive, vector_act
+
+
+# Políticas disponibles: la tabla de percepción-acción del agente o acciones
+# aleatorias reproducibles por ejecución
+POLICIES = ('tabla', 'aleatoria')
+
+# Celdas visitadas (agentes x celdas) que se registran a la vez como máximo
+_MAX_VISITED_CELLS = 16 * 1024 * 1024
+
+# Constantes de splitmix64 para las acciones aleatorias reproducibles
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+# Columnas del archivo de resultados
+RESULT_FIELDNAMES = (['seed_mapa', 'ancho', 'alto', 'x', 'y', 'orientacion', 'pasos', 'politica',
+                      'celdas_de_linea', 'cobertura_linea', 'tiempo_en_linea', 'contactos',
+                      'componentes', 'componente_inicial', 'componentes_visitados',
+                      'cobertura_componentes'] +
+                     [f'accion_{name}' for name in ACTION_NAMES])
+
+
+def build_configs(map_seeds, starts, orientations, step_budgets, policies,
+                  width=GRID_WIDTH, height=GRID_HEIGHT):
+    """
+    Construye todas las combinaciones de parámetros de un barrido
+    
+    Args:
+        map_seeds (list): Seeds de los mapas
+        starts (list or callable): Posiciones iniciales (x, y), o función
+            seed -> lista de posiciones para usar posiciones propias de cada mapa
+        orientations (list): Orientaciones iniciales
+        step_budgets (list): Pasos por ejecución
+        policies (list): Políticas (ver POLICIES)
+        width (int): Ancho de los mapas
+        height (int): Alto de los mapas
+    
+    Returns:
+        list: Un diccionario de configuración por ejecución
+    """
+    for policy in policies:
+        if policy not in POLICIES:
+            raise ValueError(f"Política desconocida: {policy}")
+    
+    configs = []
+    for seed in map_seeds:
+        map_starts = starts(seed) if callable(starts) else starts
+        for (x, y), orientation, steps, policy in itertools.product(
+                map_starts, orientations, step_budgets, policies):
+            configs.append({
+                'seed_mapa': seed,
+                'ancho': width,
+                'alto': height,
+                'x': x,
+                'y': y,
+                'orientacion': orientation,
+                'pasos': steps,
+                'politica': policy,
+            })
+    return configs
+
+
+def random_starts(count, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """
+    Crea una función de posiciones iniciales aleatorias reproducibles por mapa
+    
+    Args:
+        count (int): Posiciones por mapa
+        width (int): Ancho de los mapas
+        height (int): Alto de los mapas
+    
+    Returns:
+        callable: Función seed -> lista de count posiciones (x, y)
+    """
+    def starts(seed):
+        rng = random.Random(seed)
+        return [(rng.randrange(width), rng.randrange(height)) for _ in range(count)]
+    return starts
+
+
+def component_starts(count, width=GRID_WIDTH, height=GRID_HEIGHT, labels=None, maps=None):
+    """
+    Crea una función de posiciones iniciales sobre la línea, reproducibles por mapa
+    
+    Las posiciones se eligen al azar entre las celdas de las componentes
+    indicadas (ver components.ComponentIndex; en un mapa recién generado las
+    etiquetas 1..n siguen el orden de filas de la primera celda de cada
+    componente).
+    
+    Args:
+        count (int): Posiciones por mapa
+        width (int): Ancho de los mapas
+        height (int): Alto de los mapas
+        labels (list): Etiquetas de las componentes (por defecto todas)
+        maps (dict): seed_mapa -> Environment ya construido (opcional; los
+            demás mapas, o los de otro tamaño, se generan con su seed)
+    
+    Returns:
+        callable: Función seed -> lista de hasta count posiciones (x, y),
+        vacía si el mapa no tiene esas componentes
+    """
+    def starts(seed):
+        environment = (maps or {}).get(seed)
+        if environment is None or (environment.width, environment.height) != (width, height):
+            environment = create_environment(width, height)
+            environment.generate_line(seed)
+        components = create_component_index(environment)
+        return components.sample_cells(random.Random(seed), count, labels)
+    return starts
+
+
+def _splitmix64(values):
+    """
+    Mezcla enteros de 64 bits (splitmix64) de forma vectorizada
+    
+    Args:
+        values (numpy.ndarray): Enteros uint64
+    
+    Returns:
+        numpy.ndarray: Enteros uint64 mezclados
+    """
+    with np.errstate(over='ignore'):
+        z = values + np.uint64(_GOLDEN_GAMMA)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _run_key(config):
+    """
+    Clave de 64 bits de una ejecución, independiente del reparto en bloques
+    
+    Args:
+        config (dict): Configuración de la ejecución
+    
+    Returns:
+        int: Clave de la ejecución
+    """
+    key = 0
+    for value in (config['seed_mapa'], config['x'], config['y'], config['orientacion']):
+        key = ((key ^ (value & _MASK_64)) * _GOLDEN_GAMMA + 1) & _MASK_64
+    return key
+
+
+def _simulate_group(environment, components, configs):
+    """
+    Simula juntas las ejecuciones de un mismo mapa, presupuesto y política
+    
+    Args:
+        environment: Instancia del entorno
+        components (ComponentIndex): Índice de componentes de línea del entorno
+        configs (list): Configuraciones de las ejecuciones
+    
+    Returns:
+        list: Un diccionario de resultados por configuración
+    """
+    width, height = environment.width, environment.height
+    neighborhood = environment.neighborhood
+    steps = configs[0]['pasos']
+    policy = configs[0]['politica']
+    count = len(configs)
+    
+    x = np.array([config['x'] for config in configs], dtype=np.int32)
+    y = np.array([config['y'] for config in configs], dtype=np.int32)
+    orientation = np.array([config['orientacion'] for config in configs], dtype=np.int8)
+    contact = np.zeros(count, dtype=np.uint8)
+    keys = np.array([_run_key(config) for config in configs], dtype=np.uint64)
+    
+    agent_index = np.arange(count)
+    steps_on_line = np.zeros(count, dtype=np.int64)
+    contact_steps = np.zeros(count, dtype=np.int64)
+    action_counts = np.zeros((count, len(ACTION_CODES)), dtype=np.int64)
+    visited = np.zeros((count, width * height), dtype=bool)
+    visited[agent_index, y * width + x] = True
+    
+    for step in range(steps):
+        codes = vector_perceive(neighborhood[y, x], orientation, contact)
+        if policy == 'tabla':
+            actions = ACTION_TABLE_ARRAY[codes]
+        else:
+            actions = (_splitmix64(keys + np.uint64(step)) % np.uint64(len(ACTION_CODES))).astype(np.intp)
+        x, y, orientation, contact = vector_act(width, height, x, y, orientation, actions)
+        
+        steps_on_line += (codes & PERCEPTION_BITS['PISO']) != 0
+        contact_steps += contact
+        action_counts[agent_index, actions] += 1
+        visited[agent_index, y * width + x] = True
+    
+    line_cells = (neighborhood.ravel() & NEIGHBORHOOD_MASK['SELF_LINE_BIT']) != 0
+    total_line_cells = int(line_cells.sum())
+    covered = visited[:, line_cells].sum(axis=1)
+    
+    # Fracción de cada componente de línea recorrida por cada ejecución
+    labels = components.get_labels()
+    component_coverage = components.get_coverage(visited)[:, labels]
+    
+    results = []
+    for index, config in enumerate(configs):
+        result = dict(config)
+        result.update({
+            'celdas_de_linea': total_line_cells,
+            'cobertura_linea': covered.item(index) / total_line_cells if total_line_cells else 0.0,
+            'tiempo_en_linea': steps_on_line.item(index) / steps if steps else 0.0,
+            'contactos': int(contact_steps[index]),
+            'componentes': int(labels.size),
+            'componente_inicial': components.get_label(config['x'], config['y']),
+            'componentes_visitados': int((component_coverage[index] > 0).sum()),
+            'cobertura_componentes': ';'.join(f'{value:.4f}' for value in component_coverage[index]),
+        })
+        for code, name in enumerate(ACTION_NAMES):
+            result[f'accion_{name}'] = int(action_counts[index, code])
+        results.append(result)
+    return results
+
+
+def run_chunk(configs, map_handles=None):
+    """
+    Ejecuta un bloque de configuraciones (tarea de cada proceso)
+    
+    Las ejecuciones que comparten mapa, presupuesto de pasos y política se
+    simulan como un solo lote vectorizado; cada mapa se genera una vez, o
+    se abre desde memoria compartida si se publicó, y se etiquetan sus
+    componentes de línea.
+    
+    Args:
+        configs (list): Configuraciones del bloque
+        map_handles (dict): (seed_mapa, ancho, alto) -> SharedEnvironmentHandle
+            de los mapas publicados (opcional)
+    
+    Returns:
+        list: Resultados en el mismo orden que configs
+    """
+    results = [None] * len(configs)
+    environments = {}
+    groups = {}
+    for position, config in enumerate(configs):
+        group_key = (config['seed_mapa'], config['ancho'], config['alto'],
+                     config['pasos'], config['politica'])
+        groups.setdefault(group_key, []).append(position)
+    
+    for (seed, width, height, _, _), positions in groups.items():
+        map_key = (seed, width, height)
+        if map_key not in environments:
+            if map_handles and map_key in map_handles:
+                environment = attach_environment(map_handles[map_key])
+            else:
+                environment = create_environment(width, height)
+                environment.generate_line(seed)
+            environments[map_key] = (environment, create_component_index(environment))
+        environment, components = environments[map_key]
+        
+        # Limitar la memoria de las celdas visitadas de cada lote
+        group_size = max(1, _MAX_VISITED_CELLS // (width * height))
+        for start in range(0, len(positions), group_size):
+            batch = positions[start:start + group_size]
+            batch_results = _simulate_group(environment, components, [configs[p] for p in batch])
+            for position, result in zip(batch, batch_results):
+                results[position] = result
+    return results
+
+
+def run_experiments(configs, workers=None, chunk_size=None, output=None, maps=None):
+    """
+    Ejecuta un barrido repartiendo las configuraciones entre procesos
+    
+    Args:
+        configs (list): Configuraciones (ver build_configs)
+        workers (int): Procesos a usar (por defecto uno por núcleo)
+        chunk_size (int): Configuraciones por tarea (por defecto unas
+            cuatro tareas por proceso)
+        output (str): Archivo CSV donde guardar los resultados (opcional)
+        maps (dict): seed_mapa -> Environment ya construido; se publica en
+            memoria compartida y lo usan, en lugar de generarlo en cada
+            proceso, las configuraciones de su seed y su tamaño (opcional)
+    
+    Returns:
+        list: Resultados de cada configuración, en el mismo orden
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(configs) // (workers * 4)))
+    
+    # Ordenar por mapa para que cada bloque genere pocos mapas
+    order = sorted(range(len(configs)), key=lambda i: (
+        configs[i]['seed_mapa'], configs[i]['ancho'], configs[i]['alto'],
+        configs[i]['pasos'], configs[i]['politica']))
+    chunks = [[configs[i] for i in order[start:start + chunk_size]]
+              for start in range(0, len(order), chunk_size)]
+    
+    with ExitStack() as stack:
+        # Cada mapa dado se copia una vez a memoria compartida; las tareas
+        # solo llevan su descriptor
+        map_handles = {}
+        for seed, environment in (maps or {}).items():
+            map_key = (seed, environment.width, environment.height)
+            map_handles[map_key] = stack.enter_context(publish_environment(environment)).handle
+        
+        if workers == 1:
+            chunk_results = map(run_chunk, chunks, itertools.repeat(map_handles))
+            results_sorted = [result for chunk in chunk_results for result in chunk]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results_sorted = [result for chunk in executor.map(
+                                      run_chunk, chunks, itertools.repeat(map_handles))
+                                  for result in chunk]
+    
+    results = [None] * len(configs)
+    for position, result in zip(order, results_sorted):
+        results[position] = result
+    
+    if output:
+        save_results(results, output)
+    return results
+
+
+def save_results(results, filename):
+    """
+    Guarda los resultados de un barrido en un archivo CSV
+    
+    Args:
+        results (list): Resultados devueltos por run_experiments
+        filename (str): Ruta del archivo
+    """
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=RESULT_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    """
+    Punto de entrada de línea de comandos del barrido de experimentos
+    """
+    parser = argparse.ArgumentParser(description="Barrido de experimentos del agente seguidor de líneas")
+    parser.add_argument('--maps', type=int, default=8, help="Número de mapas (seeds 0..maps-1)")
+    parser.add_argument('--starts', type=int, default=64, help="Posiciones iniciales aleatorias por mapa")
+    parser.add_argument('--orientations', type=int, nargs='+', default=[0, 1, 2, 3],
+                        help="Orientaciones iniciales")
+    parser.add_argument('--steps', type=int, nargs='+', default=[1000], help="Pasos por ejecución")
+    parser.add_argument('--policies', choices=POLICIES, nargs='+', default=['tabla'],
+                        help="Políticas a evaluar")
+    parser.add_argument('--start-components', type=int, nargs='*', default=None,
+                        help="Empezar sobre la línea, en las componentes con estas etiquetas "
+                             "(sin etiquetas: en cualquiera)")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH, help="Ancho de los mapas")
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT, help="Alto de los mapas")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos (por defecto uno por núcleo)")
+    parser.add_argument('--chunk-size', type=int, default=None, help="Configuraciones por tarea")
+    parser.add_argument('--output', default='experimentos.csv', help="Archivo de resultados")
+    args = parser.parse_args()
+    
+    if args.start_components is None:
+        starts = random_starts(args.starts, args.width, args.height)
+    else:
+        starts = component_starts(args.starts, args.width, args.height, args.start_components or None)
+    configs = build_configs(range(args.maps), starts,
+                            args.orientations, args.steps, args.policies, args.width, args.height)
+    
+    start_time = time.perf_counter()
+    results = run_experiments(configs, args.workers, args.chunk_size, args.output)
+    elapsed = time.perf_counter() - start_time
+    
+    total_steps = sum(result['pasos'] for result in results)
+    print(f"🧪 {len(results)} ejecuciones ({total_steps:,} pasos) en {elapsed:.2f} s "
+          f"-> {total_steps / elapsed if elapsed > 0 else float('inf'):,.0f} pasos/s")
+    print(f"📊 Resultados guardados en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
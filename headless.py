@@ -0,0 +1,167 @@
+"""
+Ejecución sin interfaz gráfica del Agente Seguidor de Líneas
+Simula el agente tan rápido como sea posible, sin importar pygame
+"""
+
+import argparse
+import random
+import time
+from config import GRID_WIDTH, GRID_HEIGHT
+from environment import create_environment
+from agent import create_agent
+from logger import create_logger
+from cycles import fast_forward
+from mapfile import load_map
+from distance_field import create_seeking_agent
+
+
+def run_headless(steps, width=GRID_WIDTH, height=GRID_HEIGHT, log_file=None, log_format=None, 
+                 async_mode=None, backpressure=None, analytic=False, seed=None, map_file=None, 
+                 seek=False):
+    """
+    Ejecuta la simulación sin interfaz durante un número fijo de pasos
+    
+    Args:
+        steps (int): Número de pasos a simular
+        width (int): Ancho de la cuadrícula
+        height (int): Alto de la cuadrícula
+        log_file (str): Archivo de log (opcional)
+        log_format (str): Formato del log: 'csv' o 'binary' (opcional)
+        async_mode (bool): Escribir el log desde un hilo en segundo plano (opcional)
+        backpressure (str): Política con la cola del log llena (opcional)
+        analytic (bool): Avanzar detectando el ciclo del agente en lugar de
+            simular cada paso (incompatible con log_file)
+        seed (int): Seed del mapa y de la posición inicial, para repetir
+            exactamente la misma ejecución (opcional)
+        map_file (str): Archivo de mapa a cargar en lugar de generar uno; su
+            tamaño sustituye a width y height (opcional)
+        seek (bool): Usar el agente buscador, que sin línea a la vista se
+            dirige a la más cercana (ver distance_field)
+        
+    Returns:
+        dict: Métricas finales de la ejecución
+    
+    Raises:
+        ValueError: Si se pide analytic con log_file (los pasos saltados no
+            se registran uno a uno y el log quedaría con huecos)
+    """
+    if analytic and log_file:
+        raise ValueError("El modo analítico no registra pasos individuales; no se puede usar con log_file")
+    
+    # Crear el entorno y generar las líneas (o abrir el mapa guardado)
+    if map_file:
+        environment = load_map(map_file)
+        width, height = environment.width, environment.height
+    else:
+        environment = create_environment(width, height)
+        environment.generate_line(seed)
+    
+    # Crear el agente en una posición aleatoria
+    rng = random.Random(seed)
+    start_x, start_y = rng.randint(0, width - 1), rng.randint(0, height - 1)
+    if seek:
+        agent = create_seeking_agent(start_x, start_y, environment)
+    else:
+        agent = create_agent(start_x, start_y, width, height)
+    
+    logger = create_logger()
+    if log_file:
+        logger.start_logging(log_file, log_format=log_format, 
+                             async_mode=async_mode, backpressure=backpressure)
+    
+    # Referencias locales para el bucle caliente
+    perceive_code = agent.perceive_code
+    act_code = agent.act_code
+    log_step_code = logger.log_step_code
+    
+    cycle = None
+    start_time = time.perf_counter()
+    try:
+        if analytic:
+            cycle = fast_forward(agent, environment, steps, logger)['ciclo']
+        else:
+            for _ in range(steps):
+                code = perceive_code(environment)
+                action = act_code(code)
+                log_step_code(agent, code, action)
+    finally:
+        writer_stats = logger.stop_logging()
+    elapsed = time.perf_counter() - start_time
+    
+    metrics = logger.get_summary()
+    metrics.update({
+        'segundos': elapsed,
+        'pasos_por_segundo': steps / elapsed if elapsed > 0 else float('inf'),
+        'posicion_final': agent.get_position(),
+        'orientacion_final': agent.get_orientation(),
+        'celdas_de_linea': environment.count_line_cells(),
+        'escritor_log': writer_stats,
+        'ciclo': cycle,
+    })
+    return metrics
+
+
+def print_metrics(metrics):
+    """
+    Imprime las métricas de una ejecución sin interfaz
+    
+    Args:
+        metrics (dict): Métricas devueltas por run_headless
+    """
+    print("\n" + "="*60)
+    print("⚡ SIMULACIÓN SIN INTERFAZ")
+    print("="*60)
+    print(f"Pasos simulados:     {metrics['pasos']}")
+    print(f"Tiempo:              {metrics['segundos']:.3f} s")
+    print(f"Pasos por segundo:   {metrics['pasos_por_segundo']:,.0f}")
+    print(f"Pasos sobre línea:   {metrics['pasos_sobre_linea']}")
+    print(f"Pasos hasta línea:   {metrics['pasos_hasta_linea']}")
+    print(f"Pasos con contacto:  {metrics['pasos_con_contacto']}")
+    print(f"Posición final:      {metrics['posicion_final']}")
+    print(f"Orientación final:   {metrics['orientacion_final']}")
+    print(f"Celdas de línea:     {metrics['celdas_de_linea']}")
+    for action, count in metrics['acciones'].items():
+        print(f"  {action:<14} {count}")
+    if metrics['ciclo']:
+        print(f"Ciclo:               inicia en el paso {metrics['ciclo']['inicio']}, "
+              f"longitud {metrics['ciclo']['longitud']}")
+    if metrics['escritor_log']:
+        print(f"Log asíncrono:       {metrics['escritor_log']}")
+    print("="*60 + "\n")
+
+
+def main():
+    """
+    Punto de entrada de línea de comandos para la simulación sin interfaz
+    """
+    parser = argparse.ArgumentParser(description="Simulación sin interfaz del agente seguidor de líneas")
+    parser.add_argument('--steps', type=int, default=100000, help="Número de pasos a simular")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH, help="Ancho de la cuadrícula")
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT, help="Alto de la cuadrícula")
+    parser.add_argument('--log-file', default=None, help="Archivo donde registrar cada paso")
+    parser.add_argument('--log-format', choices=['csv', 'binary'], default=None, 
+                        help="Formato del archivo de log")
+    parser.add_argument('--async-log', action='store_true', default=None, 
+                        help="Escribir el log desde un hilo en segundo plano")
+    parser.add_argument('--backpressure', choices=['block', 'drop_oldest', 'sample'], default=None, 
+                        help="Política con la cola del log llena (modo asíncrono)")
+    parser.add_argument('--analytic', action='store_true', 
+                        help="Avanzar detectando el ciclo del agente en lugar de simular cada paso")
+    parser.add_argument('--seed', type=int, default=None, 
+                        help="Seed del mapa y de la posición inicial (ejecución reproducible)")
+    parser.add_argument('--map-file', default=None, 
+                        help="Archivo de mapa a cargar (ver mapfile.py) en lugar de generar uno")
+    parser.add_argument('--seek', action='store_true', 
+                        help="Dirigirse a la línea más cercana cuando no hay ninguna a la vista")
+    args = parser.parse_args()
+    if args.analytic and args.log_file:
+        parser.error("--analytic no registra pasos individuales; no se puede usar con --log-file")
+    
+    metrics = run_headless(args.steps, args.width, args.height, args.log_file, args.log_format, 
+                           args.async_log, args.backpressure, args.analytic, args.seed, 
+                           args.map_file, args.seek)
+    print_metrics(metrics)
+
+
+if __name__ == "__main__":
+    main()
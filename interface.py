@@ -5,12 +5,58 @@ Contiene la visualización y la interfaz de usuario
 
 import pygame
 import sys
+from collections import OrderedDict
+import numpy as np
 from config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, CELL_SIZE, COLORS, 
     UI_CONFIG, DIRECTIONS, ENVIRONMENT_CONFIG, BUTTONS
 )
 
 
+class SurfaceCache:
+    """
+    Caché LRU acotada de superficies renderizadas
+    """
+    
+    def __init__(self, max_size):
+        """
+        Inicializa la caché
+        
+        Args:
+            max_size (int): Número máximo de superficies almacenadas
+        """
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        
+    def get(self, key, render):
+        """
+        Obtiene la superficie asociada a una clave, renderizándola si falta
+        
+        Args:
+            key: Clave hashable de la superficie
+            render (callable): Función sin argumentos que crea la superficie
+            
+        Returns:
+            pygame.Surface: Superficie en caché
+        """
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        surface = render()
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+        
+    def clear(self):
+        """
+        Vacía la caché
+        """
+        self._surfaces.clear()
+
+
 class LineFollowerInterface:
     """
     Clase que maneja la interfaz gráfica del agente seguidor de líneas
@@ -26,7 +72,38 @@ class LineFollowerInterface:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont(None, UI_CONFIG['FONT_SIZE'])
         self.buttons = self._create_buttons()
+        self._text_cache = SurfaceCache(UI_CONFIG['TEXT_CACHE_SIZE'])
+        self._row_cache = SurfaceCache(UI_CONFIG['TABLE_ROW_CACHE_SIZE'])
         self.paused = False
+        self.fast_forward = False
+        
+        # Superficie precalculada de la cuadrícula y estado de su caché
+        self._grid_surface = None
+        self._grid_owner = None
+        self._grid_version = None
+        self._screen_grid_valid = False
+        self._last_agent_cell = None
+        self._last_agent_state = None
+        
+        # Regiones modificadas en el cuadro actual y firmas del contenido de
+        # cada panel para redibujar solo lo que cambia
+        self._dirty_rects = []
+        self._needs_flip = True
+        self._needs_full_redraw = True
+        self._panel_signatures = {}
+        
+    def _render_text(self, text, color):
+        """
+        Renderiza un texto reutilizando la superficie si ya estaba en caché
+        
+        Args:
+            text (str): Texto a renderizar
+            color (tuple): Color RGB del texto
+            
+        Returns:
+            pygame.Surface: Superficie con el texto
+        """
+        return self._text_cache.get((text, color), lambda: self.font.render(text, True, color))
         
     def _create_buttons(self):
         """
@@ -64,20 +141,29 @@ class LineFollowerInterface:
         Dibuja todos los botones en pantalla
         """
         for button_data in self.buttons.values():
-            rect = button_data['rect']
-            text = button_data['text']
-            
-            # Color del botón según estado
-            color = COLORS['GREEN'] if button_data['pressed'] else COLORS['GRAY']
+            self._draw_button(button_data)
             
-            # Dibujar botón
-            pygame.draw.rect(self.screen, color, rect)
-            pygame.draw.rect(self.screen, COLORS['BLACK'], rect, 2)
-            
-            # Dibujar texto del botón
-            text_surface = self.font.render(text, True, COLORS['BLACK'])
-            text_rect = text_surface.get_rect(center=rect.center)
-            self.screen.blit(text_surface, text_rect)
+    def _draw_button(self, button_data):
+        """
+        Dibuja un botón en pantalla
+        
+        Args:
+            button_data (dict): Datos del botón (rect, text, pressed)
+        """
+        rect = button_data['rect']
+        text = button_data['text']
+        
+        # Color del botón según estado
+        color = COLORS['GREEN'] if button_data['pressed'] else COLORS['GRAY']
+        
+        # Dibujar botón
+        pygame.draw.rect(self.screen, color, rect)
+        pygame.draw.rect(self.screen, COLORS['BLACK'], rect, 2)
+        
+        # Dibujar texto del botón
+        text_surface = self._render_text(text, COLORS['BLACK'])
+        text_rect = text_surface.get_rect(center=rect.center)
+        self.screen.blit(text_surface, text_rect)
             
     def handle_button_click(self, pos):
         """
@@ -106,42 +192,62 @@ class LineFollowerInterface:
         """
         Dibuja la cuadrícula del entorno y el agente en el panel inferior
         
+        La cuadrícula se mantiene pre-renderizada en una superficie fuera de
+        pantalla; cada cuadro solo se redibujan las celdas editadas y la
+        celda que ocupaba el agente.
+        
         Args:
             environment: Instancia del entorno
             agent: Instancia del agente
         """
-        grid = environment.get_grid()
-        grid_width = len(grid[0])
-        grid_height = len(grid)
+        changes = None
+        if self._grid_owner is environment and self._grid_surface is not None:
+            changes = environment.get_changes_since(self._grid_version)
         
-        # Dibujar fondo del panel de la cuadrícula
-        grid_panel_rect = pygame.Rect(0, UI_CONFIG['GRID_PANEL_Y'], 
-                                     UI_CONFIG['INFO_PANEL_X'], 
-                                     UI_CONFIG['GRID_PANEL_HEIGHT'])
-        pygame.draw.rect(self.screen, COLORS['WHITE'], grid_panel_rect)
+        # Nada que hacer si la cuadrícula en pantalla y el agente no cambiaron
+        agent_state = (agent.x, agent.y, agent.orientation)
+        if self._screen_grid_valid and changes == [] and agent_state == self._last_agent_state:
+            return
         
-        # Dibujar celdas de la cuadrícula con offset para centrar
-        for y in range(grid_height):
-            for x in range(grid_width):
-                rect = pygame.Rect(
-                    UI_CONFIG['GRID_START_X'] + x * CELL_SIZE, 
-                    UI_CONFIG['GRID_START_Y'] + y * CELL_SIZE, 
-                    CELL_SIZE, 
-                    CELL_SIZE
-                )
-                
-                # Colorear según el contenido de la celda
-                if grid[y][x] == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']:
-                    pygame.draw.rect(self.screen, COLORS['BLACK'], rect)
-                else:
-                    pygame.draw.rect(self.screen, COLORS['WHITE'], rect)
-                    
-                # Dibujar borde de la celda
-                pygame.draw.rect(self.screen, COLORS['GRAY'], rect, 1)
+        if changes is None:
+            # Cambio total (o entorno nuevo): regenerar la superficie completa
+            self._render_grid_surface(environment)
+            self._screen_grid_valid = False
+            changes = []
+        else:
+            for x, y in changes:
+                self._draw_cell(self._grid_surface, x, y, environment.get_cell_value(x, y))
+        self._grid_owner = environment
+        self._grid_version = environment.version
+        
+        if not self._screen_grid_valid:
+            self._blit_grid_panel()
+            self._dirty_rects.append(self._grid_panel_rect())
+        else:
+            # Restaurar solo las celdas sucias desde la superficie en caché
+            dirty_cells = list(changes)
+            if self._last_agent_cell is not None:
+                dirty_cells.append(self._last_agent_cell)
+            for x, y in dirty_cells:
+                cell_rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                screen_rect = cell_rect.move(UI_CONFIG['GRID_START_X'], UI_CONFIG['GRID_START_Y'])
+                self.screen.blit(self._grid_surface, screen_rect, cell_rect)
+                self._dirty_rects.append(screen_rect)
+            self._dirty_rects.append(self._cell_screen_rect(agent.x, agent.y))
         
         # Dibujar el agente
         self._draw_agent(agent)
+        self._last_agent_cell = (agent.x, agent.y)
+        self._last_agent_state = agent_state
+        
+        # Las líneas divisorias se dibujan sobre el agente (se solapan con la
+        # primera fila de celdas)
+        self._draw_grid_dividers()
         
+    def _draw_grid_dividers(self):
+        """
+        Dibuja las líneas divisorias que enmarcan el panel de la cuadrícula
+        """
         # Dibujar línea divisoria entre cuadrícula y panel de información
         divider_x = UI_CONFIG['INFO_PANEL_X']
         pygame.draw.line(self.screen, COLORS['BLACK'], 
@@ -153,6 +259,94 @@ class LineFollowerInterface:
                         (0, UI_CONFIG['GRID_PANEL_Y']), 
                         (UI_CONFIG['INFO_PANEL_X'], UI_CONFIG['GRID_PANEL_Y']), 3)
         
+    def _blit_grid_panel(self):
+        """
+        Copia el panel completo de la cuadrícula a la pantalla
+        """
+        # Dibujar fondo del panel de la cuadrícula
+        pygame.draw.rect(self.screen, COLORS['WHITE'], self._grid_panel_rect())
+        
+        # Copiar la cuadrícula pre-renderizada
+        self.screen.blit(self._grid_surface, (UI_CONFIG['GRID_START_X'], UI_CONFIG['GRID_START_Y']))
+        
+        self._screen_grid_valid = True
+        
+    def _grid_panel_rect(self):
+        """
+        Obtiene el rectángulo del panel de la cuadrícula
+        
+        Returns:
+            pygame.Rect: Rectángulo en coordenadas de pantalla
+        """
+        return pygame.Rect(0, UI_CONFIG['GRID_PANEL_Y'], 
+                           UI_CONFIG['INFO_PANEL_X'], 
+                           UI_CONFIG['GRID_PANEL_HEIGHT'])
+        
+    def _cell_screen_rect(self, x, y):
+        """
+        Obtiene el rectángulo en pantalla de una celda de la cuadrícula
+        
+        Args:
+            x (int): Coordenada x de la celda
+            y (int): Coordenada y de la celda
+            
+        Returns:
+            pygame.Rect: Rectángulo en coordenadas de pantalla
+        """
+        return pygame.Rect(UI_CONFIG['GRID_START_X'] + x * CELL_SIZE, 
+                           UI_CONFIG['GRID_START_Y'] + y * CELL_SIZE, 
+                           CELL_SIZE, CELL_SIZE)
+        
+    def _render_grid_surface(self, environment):
+        """
+        Renderiza la cuadrícula completa en la superficie fuera de pantalla
+        
+        Args:
+            environment: Instancia del entorno
+        """
+        grid = environment.get_grid()
+        grid_height, grid_width = grid.shape
+        size = (grid_width * CELL_SIZE, grid_height * CELL_SIZE)
+        if self._grid_surface is None or self._grid_surface.get_size() != size:
+            self._grid_surface = pygame.Surface(size)
+        surface = self._grid_surface
+        surface.fill(COLORS['WHITE'])
+        
+        # Rellenar solo las celdas con línea
+        for y, x in np.argwhere(grid == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']):
+            surface.fill(COLORS['BLACK'], 
+                         pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+        
+        # Bordes de las celdas: dos líneas por fila/columna, igual que un
+        # rectángulo de borde 1 por celda
+        for x in range(grid_width):
+            for line_x in (x * CELL_SIZE, x * CELL_SIZE + CELL_SIZE - 1):
+                surface.fill(COLORS['GRAY'], pygame.Rect(line_x, 0, 1, size[1]))
+        for y in range(grid_height):
+            for line_y in (y * CELL_SIZE, y * CELL_SIZE + CELL_SIZE - 1):
+                surface.fill(COLORS['GRAY'], pygame.Rect(0, line_y, size[0], 1))
+        
+    def _draw_cell(self, surface, x, y, value):
+        """
+        Dibuja una sola celda en la superficie indicada
+        
+        Args:
+            surface: Superficie de destino (coordenadas relativas a la cuadrícula)
+            x (int): Coordenada x de la celda
+            y (int): Coordenada y de la celda
+            value (int): Valor de la celda
+        """
+        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        
+        # Colorear según el contenido de la celda
+        if value == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']:
+            pygame.draw.rect(surface, COLORS['BLACK'], rect)
+        else:
+            pygame.draw.rect(surface, COLORS['WHITE'], rect)
+            
+        # Dibujar borde de la celda
+        pygame.draw.rect(surface, COLORS['GRAY'], rect, 1)
+        
     def _draw_agent(self, agent):
         """
         Dibuja el agente en su posición actual
@@ -238,18 +432,14 @@ class LineFollowerInterface:
         pygame.draw.rect(self.screen, COLORS['BLACK'], panel_rect, 2)
         
         # Título del panel
-        title_text = self.font.render("Percepciones del Agente:", True, COLORS['BLACK'])
+        title_text = self._render_text("Percepciones del Agente:", COLORS['BLACK'])
         self.screen.blit(title_text, (panel_x, panel_y))
         
         y_offset = panel_y + UI_CONFIG['TEXT_SPACING']
         
         # Dibujar cada percepción
         for key in ['orientacion', 'contacto', 'piso', 'izquierda', 'centro', 'derecha']:
-            text = self.font.render(
-                f"{key.capitalize()}: {perceptions[key]}", 
-                True, 
-                COLORS['BLACK']
-            )
+            text = self._render_text(f"{key.capitalize()}: {perceptions[key]}", COLORS['BLACK'])
             self.screen.blit(text, (panel_x, y_offset))
             y_offset += UI_CONFIG['TEXT_SPACING']
             
@@ -266,17 +456,12 @@ class LineFollowerInterface:
         panel_y = UI_CONFIG['GRID_PANEL_Y'] + UI_CONFIG['TEXT_SPACING'] * 8  # Después de las percepciones
         
         # Dibujar fondo del panel de información
-        info_panel_rect = pygame.Rect(
-            UI_CONFIG['INFO_PANEL_X'], 
-            panel_y - UI_CONFIG['TEXT_MARGIN'], 
-            UI_CONFIG['INFO_PANEL_WIDTH'], 
-            200
-        )
+        info_panel_rect = self._info_panel_rect()
         pygame.draw.rect(self.screen, COLORS['WHITE'], info_panel_rect)
         pygame.draw.rect(self.screen, COLORS['BLACK'], info_panel_rect, 2)
         
         # Título del panel
-        title_text = self.font.render("Información del Sistema:", True, COLORS['BLACK'])
+        title_text = self._render_text("Información del Sistema:", COLORS['BLACK'])
         self.screen.blit(title_text, (panel_x, panel_y))
         
         # Información del agente
@@ -284,16 +469,125 @@ class LineFollowerInterface:
             f"Posición: ({agent.x}, {agent.y})",
             f"Orientación: {agent.orientation}",
             f"Estado: {'Contacto' if agent.has_hit_wall else 'Libre'}",
-            f"Simulación: {'Pausada' if self.paused else 'Activa'}"
+            f"Simulación: {'Pausada' if self.paused else 'Activa'}{' (avance rápido)' if self.fast_forward else ''}"
         ]
         
         y_offset = panel_y + UI_CONFIG['TEXT_SPACING']
         
         for text in info_texts:
-            rendered_text = self.font.render(text, True, COLORS['BLACK'])
+            rendered_text = self._render_text(text, COLORS['BLACK'])
             self.screen.blit(rendered_text, (panel_x, y_offset))
             y_offset += UI_CONFIG['TEXT_SPACING']
             
+    def _info_panel_rect(self):
+        """
+        Obtiene el rectángulo del panel de información del sistema
+        
+        Returns:
+            pygame.Rect: Rectángulo en coordenadas de pantalla
+        """
+        return pygame.Rect(
+            UI_CONFIG['INFO_PANEL_X'], 
+            UI_CONFIG['GRID_PANEL_Y'] + UI_CONFIG['TEXT_SPACING'] * 8 - UI_CONFIG['TEXT_MARGIN'], 
+            UI_CONFIG['INFO_PANEL_WIDTH'], 
+            200
+        )
+        
+    def _table_panel_rect(self):
+        """
+        Obtiene el rectángulo del panel de la tabla de pasos
+        
+        Returns:
+            pygame.Rect: Rectángulo en coordenadas de pantalla
+        """
+        return pygame.Rect(
+            UI_CONFIG['INFO_PANEL_X'], 
+            UI_CONFIG['GRID_PANEL_Y'] + UI_CONFIG['TEXT_SPACING'] * 12 - UI_CONFIG['TEXT_MARGIN'], 
+            UI_CONFIG['INFO_PANEL_WIDTH'], 
+            300
+        )
+        
+    def _perceptions_region(self):
+        """
+        Obtiene la parte visible del panel de percepciones (sobre el panel
+        de información)
+        
+        Returns:
+            pygame.Rect: Rectángulo en coordenadas de pantalla
+        """
+        return pygame.Rect(
+            UI_CONFIG['INFO_PANEL_X'], 
+            UI_CONFIG['GRID_PANEL_Y'], 
+            UI_CONFIG['INFO_PANEL_WIDTH'], 
+            self._info_panel_rect().top - UI_CONFIG['GRID_PANEL_Y']
+        )
+        
+    def draw_frame(self, environment, agent, perceptions, logger, max_steps=8):
+        """
+        Dibuja un cuadro completo redibujando solo las partes que cambiaron
+        
+        Cada panel se compara con la firma de su contenido en el cuadro
+        anterior; las regiones redibujadas se acumulan para update_display().
+        
+        Args:
+            environment: Instancia del entorno
+            agent: Instancia del agente
+            perceptions (dict): Percepciones del agente
+            logger: Instancia del logger del agente
+            max_steps (int): Número máximo de pasos en la tabla
+        """
+        if self._needs_full_redraw:
+            self.clear_screen()
+            self.draw_top_panel()
+            self.draw_buttons()
+            self._panel_signatures = {
+                'buttons': tuple(button['pressed'] for button in self.buttons.values())
+            }
+            self._needs_full_redraw = False
+        else:
+            # Redibujar solo los botones cuyo estado cambió
+            pressed = tuple(button['pressed'] for button in self.buttons.values())
+            previous = self._panel_signatures.get('buttons', ())
+            for index, button_data in enumerate(self.buttons.values()):
+                if index >= len(previous) or previous[index] != pressed[index]:
+                    self._draw_button(button_data)
+                    self._dirty_rects.append(button_data['rect'])
+            self._panel_signatures['buttons'] = pressed
+        
+        self.draw_grid(environment, agent)
+        
+        # Panel derecho: percepciones, información y tabla se solapan, por lo
+        # que se redibujan juntos en orden, pero solo se envían a pantalla las
+        # regiones cuyo contenido cambió
+        steps = logger.get_last_n_steps(max_steps)
+        signatures = {
+            'perceptions': tuple(perceptions[key] for key in 
+                                 ['orientacion', 'contacto', 'piso', 'izquierda', 'centro', 'derecha']),
+            'info': (agent.x, agent.y, agent.orientation, agent.has_hit_wall, 
+                     self.paused, self.fast_forward),
+            'table': tuple((step['paso'], step['accion'], step['posicion_x'], step['posicion_y']) 
+                           for step in steps[-max_steps:]),
+        }
+        changed = [key for key, signature in signatures.items() 
+                   if self._panel_signatures.get(key) != signature]
+        if changed:
+            self.draw_perceptions(perceptions)
+            self.draw_info_panel(agent, environment)
+            self._draw_steps_rows(steps, max_steps)
+            regions = {
+                'perceptions': self._perceptions_region(),
+                'info': self._info_panel_rect(),
+                'table': self._table_panel_rect(),
+            }
+            self._dirty_rects.extend(regions[key] for key in changed)
+            self._panel_signatures.update(signatures)
+        
+    def invalidate(self):
+        """
+        Fuerza que el próximo cuadro se dibuje y envíe completo
+        """
+        self._needs_full_redraw = True
+        
     def draw_top_panel(self):
         """
         Dibuja el panel superior con fondo
@@ -308,7 +602,7 @@ class LineFollowerInterface:
                         (WINDOW_WIDTH, UI_CONFIG['TOP_PANEL_HEIGHT']), 3)
         
         # Dibujar título de la aplicación
-        title_text = self.font.render("Agente Seguidor de Líneas", True, COLORS['BLACK'])
+        title_text = self._render_text("Agente Seguidor de Líneas", COLORS['BLACK'])
         title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, UI_CONFIG['TOP_PANEL_HEIGHT'] // 2))
         self.screen.blit(title_text, title_rect)
         
@@ -317,12 +611,22 @@ class LineFollowerInterface:
         Limpia la pantalla con color blanco
         """
         self.screen.fill(COLORS['WHITE'])
+        self._screen_grid_valid = False
+        self._needs_flip = True
         
     def update_display(self):
         """
         Actualiza la pantalla
+        
+        Si la pantalla se limpió en este cuadro se envía completa; en otro
+        caso solo se envían las regiones modificadas.
         """
-        pygame.display.flip()
+        if self._needs_flip:
+            pygame.display.flip()
+        elif self._dirty_rects:
+            pygame.display.update(self._dirty_rects)
+        self._needs_flip = False
+        self._dirty_rects = []
         
     def handle_events(self):
         """
@@ -334,12 +638,18 @@ class LineFollowerInterface:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False, None
+            elif event.type == pygame.VIDEOEXPOSE:
+                # La ventana se volvió a mostrar: redibujar todo
+                self.invalidate()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False, None
                 elif event.key == pygame.K_SPACE:
                     self.paused = not self.paused
                     return True, 'PAUSE'
+                elif event.key == pygame.K_f:
+                    self.fast_forward = not self.fast_forward
+                    return True, 'FAST_FORWARD'
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Clic izquierdo
                     button_clicked = self.handle_button_click(event.pos)
@@ -364,7 +674,16 @@ class LineFollowerInterface:
             logger: Instancia del logger del agente
             max_steps (int): Número máximo de pasos a mostrar
         """
-        steps = logger.get_last_n_steps(max_steps)
+        self._draw_steps_rows(logger.get_last_n_steps(max_steps), max_steps)
+        
+    def _draw_steps_rows(self, steps, max_steps):
+        """
+        Dibuja la tabla de pasos a partir de la lista de pasos a mostrar
+        
+        Args:
+            steps (list): Últimos pasos registrados
+            max_steps (int): Número máximo de pasos a mostrar
+        """
         if not steps:
             return
         
@@ -373,17 +692,12 @@ class LineFollowerInterface:
         table_y = UI_CONFIG['GRID_PANEL_Y'] + UI_CONFIG['TEXT_SPACING'] * 12  # Debajo de la información
         
         # Dibujar fondo del panel de tabla
-        table_panel_rect = pygame.Rect(
-            UI_CONFIG['INFO_PANEL_X'], 
-            table_y - UI_CONFIG['TEXT_MARGIN'], 
-            UI_CONFIG['INFO_PANEL_WIDTH'], 
-            300
-        )
+        table_panel_rect = self._table_panel_rect()
         pygame.draw.rect(self.screen, COLORS['WHITE'], table_panel_rect)
         pygame.draw.rect(self.screen, COLORS['BLACK'], table_panel_rect, 2)
         
         # Título del panel
-        title_text = self.font.render("Últimos Pasos:", True, COLORS['BLACK'])
+        title_text = self._render_text("Últimos Pasos:", COLORS['BLACK'])
         self.screen.blit(title_text, (table_x, table_y))
         
         # Encabezados de la tabla
@@ -392,7 +706,7 @@ class LineFollowerInterface:
         header_x = table_x
         
         for header in headers:
-            header_text = self.font.render(header, True, COLORS['BLACK'])
+            header_text = self._render_text(header, COLORS['BLACK'])
             self.screen.blit(header_text, (header_x, header_y))
             header_x += 35
         
@@ -400,43 +714,54 @@ class LineFollowerInterface:
         step_y = header_y + UI_CONFIG['TEXT_SPACING']
         
         for step in steps[-max_steps:]:  # Mostrar solo los últimos pasos
-            step_x = table_x
-            
-            # Paso
-            step_text = self.font.render(str(step['paso']), True, COLORS['BLACK'])
-            self.screen.blit(step_text, (step_x, step_y))
-            step_x += 35
-            
-            # Cuerpo
-            cuerpo_text = self.font.render(str(step['cuerpo']), True, COLORS['BLACK'])
-            self.screen.blit(cuerpo_text, (step_x, step_y))
-            step_x += 35
-            
-            # Izquierda
-            izq_text = self.font.render(str(step['izquierda']), True, COLORS['BLACK'])
-            self.screen.blit(izq_text, (step_x, step_y))
-            step_x += 35
-            
-            # Centro
-            cen_text = self.font.render(str(step['centro']), True, COLORS['BLACK'])
-            self.screen.blit(cen_text, (step_x, step_y))
-            step_x += 35
+            # Al desplazarse la tabla, las filas ya renderizadas se reutilizan
+            row_surface = self._render_table_row(step)
+            self.screen.blit(row_surface, (table_x, step_y))
             
-            # Derecha
-            der_text = self.font.render(str(step['derecha']), True, COLORS['BLACK'])
-            self.screen.blit(der_text, (step_x, step_y))
-            step_x += 35
-            
-            # Acción
-            acc_text = self.font.render(step['accion'], True, COLORS['BLACK'])
-            self.screen.blit(acc_text, (step_x, step_y))
-            step_x += 35
+            step_y += UI_CONFIG['TEXT_SPACING'] - 5  # Menos espacio entre filas
+    
+    def _render_table_row(self, step):
+        """
+        Renderiza una fila de la tabla de pasos (con caché por contenido)
+        
+        Args:
+            step (dict): Datos del paso
             
-            # Posición
-            pos_text = self.font.render(f"({step['posicion_x']},{step['posicion_y']})", True, COLORS['BLACK'])
-            self.screen.blit(pos_text, (step_x, step_y))
+        Returns:
+            pygame.Surface: Superficie con la fila completa
+        """
+        cells = (
+            str(step['paso']),
+            str(step['cuerpo']),
+            str(step['izquierda']),
+            str(step['centro']),
+            str(step['derecha']),
+            step['accion'],
+            f"({step['posicion_x']},{step['posicion_y']})"
+        )
+        return self._row_cache.get(cells, lambda: self._compose_table_row(cells))
+    
+    def _compose_table_row(self, cells):
+        """
+        Compone la superficie de una fila a partir de los textos de sus celdas
+        
+        Args:
+            cells (tuple): Textos de las columnas (paso, cuerpo, izquierda,
+                centro, derecha, acción, posición)
             
-            step_y += UI_CONFIG['TEXT_SPACING'] - 5  # Menos espacio entre filas
+        Returns:
+            pygame.Surface: Superficie con la fila sobre fondo blanco
+        """
+        column_width = 35
+        text_surfaces = [self._render_text(text, COLORS['BLACK']) for text in cells]
+        width = column_width * (len(cells) - 1) + text_surfaces[-1].get_width()
+        height = max(surface.get_height() for surface in text_surfaces)
+        
+        row_surface = pygame.Surface((width, height))
+        row_surface.fill(COLORS['WHITE'])
+        for column, text_surface in enumerate(text_surfaces):
+            row_surface.blit(text_surface, (column * column_width, 0))
+        return row_surface
     
     def quit(self):
         """
@@ -3,10 +3,92 @@ Módulo de logging para el Agente Seguidor de Líneas
 Registra cada paso del agente con sus percepciones y acciones
 """
 
+import atexit
 import csv
+import heapq
+import io
 import os
+import tempfile
+import time
+from collections import deque
+from itertools import islice
 from datetime import datetime
-from config import PERCEPTION_STATES, ACTIONS
+from config import PERCEPTION_BITS, ACTION_LOG_SYMBOLS, LOGGER_CONFIG
+from agent import encode_perceptions, ACTION_CODES_BY_NAME, ACTION_NAMES
+from async_writer import AsyncStepWriter
+from binlog import (
+    LOG_FIELDNAMES, BINARY_LOG_DTYPE, BINARY_LOG_HEADER_SIZE, BinaryStepWriter, 
+    TimestampFormatter, create_clock_anchor, csv_row_to_step, open_binary_log, record_to_row,
+    record_to_step
+)
+
+# Extensión por defecto de cada formato de log
+LOG_FORMAT_EXTENSIONS = {'csv': 'csv', 'binary': 'bin'}
+
+# Registros leídos por bloque al recorrer un log binario o el archivo de desborde
+_SPILL_READ_CHUNK = 4096
+
+
+class CsvStepWriter:
+    """
+    Escritor CSV persistente con buffer para el log de pasos
+    """
+    
+    def __init__(self, filename, flush_every_rows, flush_interval_ms, buffer_size, clock_anchor):
+        """
+        Abre el archivo de log (añadiendo al final si ya existe)
+        
+        Args:
+            filename (str): Ruta del archivo CSV
+            flush_every_rows (int): Filas escritas entre dos vaciados
+            flush_interval_ms (float): Milisegundos máximos entre dos vaciados
+            buffer_size (int): Tamaño del buffer del archivo en bytes
+            clock_anchor (tuple): Ancla de reloj para dar formato a las marcas
+        """
+        file_exists = os.path.exists(filename) and os.path.getsize(filename) > 0
+        
+        self.filename = filename
+        self.clock_anchor = clock_anchor
+        self._formatter = TimestampFormatter(clock_anchor)
+        self.flush_every_rows = flush_every_rows
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._file = open(filename, 'a', newline='', encoding='utf-8', buffering=buffer_size)
+        self._writer = csv.writer(self._file)
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        
+        # Escribir header si es un archivo nuevo
+        if not file_exists:
+            self._writer.writerow(LOG_FIELDNAMES)
+            
+    def write(self, record):
+        """
+        Escribe un paso y vacía el buffer si se alcanzó algún límite
+        
+        Args:
+            record (tuple): Registro compacto del paso (ver binlog)
+        """
+        self._writer.writerow(record_to_row(record, self.clock_anchor, self._formatter))
+        self._pending_rows += 1
+        if (self._pending_rows >= self.flush_every_rows or 
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+            
+    def flush(self):
+        """
+        Vacía el buffer al disco
+        """
+        self._file.flush()
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        
+    def close(self):
+        """
+        Vacía el buffer y cierra el archivo
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
 
 
 class AgentLogger:
@@ -14,13 +96,42 @@ class AgentLogger:
     Clase para registrar y mostrar el comportamiento del agente
     """
     
-    def __init__(self):
+    def __init__(self, history_size=None):
         """
         Inicializa el logger del agente
+        
+        Args:
+            history_size (int): Pasos guardados en memoria (opcional)
         """
-        self.steps = []
+        # Historial acotado: registros compactos (ver binlog) de los últimos
+        # pasos; los que salen del buffer se vuelven a leer del archivo de
+        # log (o, sin log abierto y con SPILL_OVERFLOW, de un archivo de desborde)
+        self.steps = deque(maxlen=history_size or LOGGER_CONFIG['HISTORY_SIZE'])
+        self._spill_writer = None
+        self._spilled_rows = 0
+        # Tramos de pasos escritos en archivos de log: archivo, formato,
+        # posición de su primer registro y primer y último paso (None si el
+        # log sigue abierto)
+        self._log_segments = []
         self.current_step = 0
+        
+        # Los pasos guardan el reloj monotónico; la hora legible se obtiene
+        # del ancla de la sesión solo al imprimir o exportar
+        self.clock_anchor = create_clock_anchor()
+        self._formatter = TimestampFormatter(self.clock_anchor)
         self.log_file = None
+        self._writer = None
+        self._reset_summary()
+        
+    def _reset_summary(self):
+        """
+        Reinicia los contadores agregados de la sesión
+        """
+        self.action_counts = [0] * len(ACTION_LOG_SYMBOLS)
+        self.steps_on_line = 0
+        self.contact_steps = 0
+        # Pasos dados antes del primer paso sobre la línea (None: aún no)
+        self.first_line_step = None
         
     def log_step(self, agent, perceptions, action_taken):
         """
@@ -31,98 +142,331 @@ class AgentLogger:
             perceptions (dict): Percepciones del agente
             action_taken (str): Acción tomada por el agente
         """
+        action_code = ACTION_CODES_BY_NAME.get(action_taken, ACTION_CODES_BY_NAME['move_forward'])
+        self.log_step_code(agent, encode_perceptions(perceptions), action_code)
+    
+    def log_step_code(self, agent, perception_code, action_code):
+        """
+        Registra un paso a partir de los códigos enteros de percepción y acción
+        
+        Args:
+            agent: Instancia del agente
+            perception_code (int): Código de percepción de 5 bits
+            action_code (int): Código de la acción tomada
+        """
         self.current_step += 1
         
-        # Convertir percepciones a valores binarios
-        cuerpo = 1 if perceptions['piso'] == PERCEPTION_STATES['DARK_FLOOR'] else 0
-        izquierda = 1 if perceptions['izquierda'] == PERCEPTION_STATES['DARK_FLOOR'] else 0
-        centro = 1 if perceptions['centro'] == PERCEPTION_STATES['DARK_FLOOR'] else 0
-        derecha = 1 if perceptions['derecha'] == PERCEPTION_STATES['DARK_FLOOR'] else 0
-        
-        # Determinar acción basada en la acción tomada
-        if action_taken == 'move_forward':
-            accion = 'A'  # Avanzar
-        elif action_taken == 'rotate_left':
-            accion = 'R-'  # Rotar izquierda
-        elif action_taken == 'rotate_right':
-            accion = 'R+'  # Rotar derecha
-        else:
-            accion = 'A'  # Por defecto avanzar
-        
-        step_data = {
-            'paso': self.current_step,
-            'cuerpo': cuerpo,
-            'izquierda': izquierda,
-            'centro': centro,
-            'derecha': derecha,
-            'accion': accion,
-            'posicion_x': agent.x,
-            'posicion_y': agent.y,
-            'orientacion': agent.orientation,
-            'contacto': 1 if agent.has_hit_wall else 0,
-            'timestamp': datetime.now().strftime('%H:%M:%S.%f')[:-3]
-        }
+        # Contadores agregados
+        self.action_counts[action_code] += 1
+        if perception_code & PERCEPTION_BITS['PISO']:
+            self.steps_on_line += 1
+            if self.first_line_step is None:
+                self.first_line_step = self.current_step - 1
+        if agent.has_hit_wall:
+            self.contact_steps += 1
         
-        self.steps.append(step_data)
+        record = (
+            self.current_step,
+            agent.x,
+            agent.y,
+            perception_code,
+            action_code,
+            agent.orientation,
+            1 if agent.has_hit_wall else 0,
+            time.perf_counter_ns()
+        )
         
-        # Si hay archivo de log, escribir inmediatamente
-        if self.log_file:
-            self._write_to_file(step_data)
+        # Si el buffer está lleno, el paso más antiguo sale de memoria
+        if len(self.steps) == self.steps.maxlen:
+            self._spill(self.steps[0])
+        self.steps.append(record)
+        
+        # Si hay archivo de log, escribir a través del buffer
+        if self._writer is not None:
+            self._writer.write(record)
+    
+    def log_skipped_steps(self, steps, action_counts, steps_on_line, contact_steps, 
+                          first_line_step=None):
+        """
+        Registra de forma agregada un tramo de pasos que no se simuló uno a
+        uno (ver cycles.fast_forward)
+        
+        Solo se actualizan el número de paso y las métricas de get_summary();
+        el tramo no añade registros al historial ni al archivo de log.
+        
+        Args:
+            steps (int): Pasos del tramo
+            action_counts (list): Veces que se tomó cada código de acción
+            steps_on_line (int): Pasos del tramo sobre la línea
+            contact_steps (int): Pasos del tramo con contacto
+            first_line_step (int): Pasos del tramo antes del primero sobre la
+                línea (None si ninguno empieza sobre ella)
+        """
+        if self.first_line_step is None and first_line_step is not None:
+            self.first_line_step = self.current_step + first_line_step
+        self.current_step += steps
+        for action_code, count in enumerate(action_counts):
+            self.action_counts[action_code] += count
+        self.steps_on_line += steps_on_line
+        self.contact_steps += contact_steps
     
-    def _write_to_file(self, step_data):
+    def _spill(self, record):
         """
-        Escribe un paso al archivo de log
+        Guarda un paso que sale del historial
+        
+        Si el paso está en un archivo de log no hace nada (se leerá de ahí);
+        si no, lo escribe en el archivo de desborde solo con SPILL_OVERFLOW.
         
         Args:
-            step_data (dict): Datos del paso a escribir
+            record (tuple): Registro compacto del paso
         """
-        if not self.log_file:
+        step = record[0]
+        for segment in reversed(self._log_segments):
+            if segment['last_step'] is not None and segment['last_step'] < step:
+                break
+            if segment['first_step'] <= step:
+                self._spilled_rows += 1
+                return
+        
+        if not LOGGER_CONFIG['SPILL_OVERFLOW']:
             return
-            
-        # Crear archivo si no existe
-        file_exists = os.path.exists(self.log_file)
+        if self._spill_writer is None:
+            fd, filename = tempfile.mkstemp(prefix='agente_desborde_', suffix='.bin', 
+                                            dir=LOGGER_CONFIG['SPILL_DIR'])
+            os.close(fd)
+            self._spill_writer = BinaryStepWriter(
+                filename,
+                LOGGER_CONFIG['FLUSH_EVERY_ROWS'],
+                LOGGER_CONFIG['FLUSH_INTERVAL_MS'],
+                LOGGER_CONFIG['BUFFER_SIZE'],
+                self.clock_anchor
+            )
+            atexit.register(self._discard_spill)
+        self._spill_writer.write(record)
+        self._spilled_rows += 1
+    
+    def _discard_spill(self):
+        """
+        Cierra y elimina el archivo de desborde
+        """
+        if self._spill_writer is not None:
+            self._spill_writer.close()
+            os.remove(self._spill_writer.filename)
+            self._spill_writer = None
+            atexit.unregister(self._discard_spill)
+        self._spilled_rows = 0
+    
+    def _iter_binary_records(self, filename, offset, first_step, last_step):
+        """
+        Recorre los pasos de un tramo de un log binario
         
-        with open(self.log_file, 'a', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['paso', 'cuerpo', 'izquierda', 'centro', 'derecha', 'accion', 
-                         'posicion_x', 'posicion_y', 'orientacion', 'contacto', 'timestamp']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            # Escribir header si es un archivo nuevo
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(step_data)
+        Args:
+            filename (str): Ruta del log binario
+            offset (int): Posición en bytes del primer registro del tramo
+            first_step (int): Primer paso del tramo
+            last_step (int): Último paso del tramo
+        
+        Yields:
+            dict: Datos de cada paso
+        """
+        records = open_binary_log(filename)
+        records = records[max(0, offset - BINARY_LOG_HEADER_SIZE) // BINARY_LOG_DTYPE.itemsize:]
+        for start in range(0, len(records), _SPILL_READ_CHUNK):
+            for record in records[start:start + _SPILL_READ_CHUNK].tolist():
+                if record[0] > last_step:
+                    return
+                if record[0] >= first_step:
+                    yield record_to_step(record, self.clock_anchor, self._formatter)
+    
+    def _iter_log_segment(self, segment, last_step):
+        """
+        Recorre los pasos de un tramo escrito en un archivo de log
+        
+        Args:
+            segment (dict): Tramo (ver _log_segments)
+            last_step (int): Último paso a devolver
+        
+        Yields:
+            dict: Datos de cada paso
+        """
+        if segment['last_step'] is not None:
+            last_step = min(last_step, segment['last_step'])
+        if segment['format'] == 'binary':
+            yield from self._iter_binary_records(segment['filename'], segment['offset'], 
+                                                 segment['first_step'], last_step)
+            return
+        
+        with open(segment['filename'], 'rb') as raw_file:
+            raw_file.seek(segment['offset'])
+            for row in csv.reader(io.TextIOWrapper(raw_file, encoding='utf-8', newline='')):
+                step = csv_row_to_step(row)
+                if step['paso'] > last_step:
+                    return
+                if step['paso'] >= segment['first_step']:
+                    yield step
     
-    def start_logging(self, filename=None):
+    def iter_steps(self):
+        """
+        Recorre todos los pasos registrados: primero los que salieron del
+        historial (leídos de los archivos de log y del de desborde) y después
+        los que siguen en memoria
+        
+        Yields:
+            dict: Datos de cada paso
+        """
+        # Copia de los registros en memoria para poder seguir registrando pasos
+        records = list(self.steps)
+        last_spilled = records[0][0] - 1 if records else self.current_step
+        
+        sources = []
+        if self._writer is not None:
+            self._writer.flush()
+        for segment in self._log_segments:
+            sources.append(self._iter_log_segment(segment, last_spilled))
+        if self._spill_writer is not None:
+            self._spill_writer.flush()
+            sources.append(self._iter_binary_records(self._spill_writer.filename, 
+                                                     BINARY_LOG_HEADER_SIZE, 0, last_spilled))
+        yield from heapq.merge(*sources, key=lambda step: step['paso'])
+        
+        for record in records:
+            yield record_to_step(record, self.clock_anchor, self._formatter)
+    
+    def get_total_steps(self):
+        """
+        Obtiene el número de pasos disponibles (en memoria y en disco)
+        
+        Returns:
+            int: Número de pasos registrados (en un log asíncrono que descarta
+            o muestrea registros, los que faltan en el archivo también cuentan)
+        """
+        return self._spilled_rows + len(self.steps)
+    
+    def start_logging(self, filename=None, flush_every_rows=None, flush_interval_ms=None, 
+                      log_format=None, async_mode=None, backpressure=None):
         """
         Inicia el logging a archivo
         
+        El archivo permanece abierto hasta stop_logging(); las filas se
+        escriben con buffer y se vacían cada flush_every_rows filas o
+        flush_interval_ms milisegundos, lo que ocurra primero.
+        
         Args:
             filename (str): Nombre del archivo de log (opcional)
+            flush_every_rows (int): Filas entre vaciados (opcional)
+            flush_interval_ms (float): Milisegundos entre vaciados (opcional)
+            log_format (str): 'csv' o 'binary' (por defecto LOGGER_CONFIG['LOG_FORMAT'])
+            async_mode (bool): Escribir desde un hilo en segundo plano; log_step
+                solo encola el registro (por defecto LOGGER_CONFIG['ASYNC'])
+            backpressure (str): Política con la cola llena en modo asíncrono
+                (por defecto LOGGER_CONFIG['BACKPRESSURE'])
         """
+        log_format = log_format or LOGGER_CONFIG['LOG_FORMAT']
+        if log_format not in LOG_FORMAT_EXTENSIONS:
+            raise ValueError(f"Formato de log desconocido: {log_format}")
+        
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'agente_log_{timestamp}.csv'
+            filename = f'agente_log_{timestamp}.{LOG_FORMAT_EXTENSIONS[log_format]}'
+        
+        if self._writer is not None:
+            self.stop_logging()
         
+        # Un log binario se sobrescribe: sus tramos anteriores se pierden
+        if log_format == 'binary':
+            self._log_segments = [segment for segment in self._log_segments
+                                  if os.path.abspath(segment['filename']) != os.path.abspath(filename)]
+        
+        flush_interval_ms = flush_interval_ms or LOGGER_CONFIG['FLUSH_INTERVAL_MS']
+        writer_class = BinaryStepWriter if log_format == 'binary' else CsvStepWriter
+        self._writer = writer_class(
+            filename,
+            flush_every_rows or LOGGER_CONFIG['FLUSH_EVERY_ROWS'],
+            flush_interval_ms,
+            LOGGER_CONFIG['BUFFER_SIZE'],
+            self.clock_anchor
+        )
+        self._writer.flush()
+        self._log_segments.append({
+            'filename': filename,
+            'format': log_format,
+            'offset': os.path.getsize(filename),
+            'first_step': self.current_step + 1,
+            'last_step': None,
+        })
+        
+        if LOGGER_CONFIG['ASYNC'] if async_mode is None else async_mode:
+            self._writer = AsyncStepWriter(
+                self._writer,
+                LOGGER_CONFIG['ASYNC_QUEUE_SIZE'],
+                backpressure or LOGGER_CONFIG['BACKPRESSURE'],
+                LOGGER_CONFIG['SAMPLE_EVERY'],
+                LOGGER_CONFIG['ASYNC_BATCH_SIZE'],
+                flush_interval_ms
+            )
         self.log_file = filename
+        
+        # Garantizar el vaciado del buffer si el programa termina sin stop_logging
+        atexit.register(self.stop_logging)
         print(f"📝 Iniciando log en archivo: {filename}")
     
+    def flush(self):
+        """
+        Vacía al disco las filas pendientes del log
+        """
+        if self._writer is not None:
+            self._writer.flush()
+    
+    def get_writer_stats(self):
+        """
+        Obtiene los contadores del escritor asíncrono del log
+        
+        Returns:
+            dict: Contadores de AsyncStepWriter, o None si el log no es asíncrono
+        """
+        if isinstance(self._writer, AsyncStepWriter):
+            return self._writer.get_stats()
+        return None
+    
     def stop_logging(self):
         """
         Detiene el logging a archivo
+        
+        Returns:
+            dict: Contadores finales del escritor asíncrono, o None si el log
+            no era asíncrono
         """
+        stats = None
+        writer = self._writer
+        if writer is not None:
+            # Soltar el escritor aunque el cierre falle (error del hilo escritor)
+            try:
+                writer.close()
+            finally:
+                self._writer = None
+                self._log_segments[-1]['last_step'] = self.current_step
+                atexit.unregister(self.stop_logging)
+            if isinstance(writer, AsyncStepWriter):
+                stats = writer.get_stats()
+                if stats['descartados'] or stats['omitidos_por_muestreo']:
+                    print(f"⚠️ Registros no escritos: {stats['descartados']} descartados, "
+                          f"{stats['omitidos_por_muestreo']} omitidos por muestreo")
         if self.log_file:
             print(f"📝 Log guardado en: {self.log_file}")
             self.log_file = None
+        return stats
     
     def get_table_data(self):
         """
         Obtiene los datos de la tabla para mostrar
         
+        Incluye los pasos desbordados a disco, por lo que en ejecuciones
+        largas conviene usar iter_steps() o get_last_n_steps().
+        
         Returns:
             list: Lista de diccionarios con los datos de cada paso
         """
-        return self.steps.copy()
+        return list(self.iter_steps())
     
     def get_last_n_steps(self, n=10):
         """
@@ -132,18 +476,46 @@ class AgentLogger:
             n (int): Número de pasos a obtener
             
         Returns:
-            list: Lista de los últimos n pasos
+            list: Lista de los últimos n pasos (a lo sumo los que hay en memoria)
         """
-        return self.steps[-n:] if len(self.steps) >= n else self.steps
+        records = list(islice(reversed(self.steps), n))
+        records.reverse()
+        return [record_to_step(record, self.clock_anchor, self._formatter) for record in records]
     
     def clear_log(self):
         """
         Limpia el log actual
         """
-        self.steps = []
+        open_segment = self._log_segments[-1] if self._writer is not None else None
+        self.steps.clear()
+        self._discard_spill()
+        self._log_segments = []
         self.current_step = 0
+        if open_segment is not None:
+            # Los pasos siguientes empiezan un tramo nuevo del log abierto
+            self._writer.flush()
+            self._log_segments.append(dict(open_segment, first_step=1,
+                                           offset=os.path.getsize(open_segment['filename'])))
+        self._reset_summary()
         print("🗑️ Log limpiado")
     
+    def get_summary(self):
+        """
+        Obtiene las métricas agregadas de los pasos registrados
+        
+        Returns:
+            dict: Total de pasos, pasos sobre línea, pasos dados hasta llegar
+            a la línea (None si no llegó), pasos con contacto y número de
+            veces que se tomó cada acción
+        """
+        return {
+            'pasos': self.current_step,
+            'pasos_sobre_linea': self.steps_on_line,
+            'pasos_hasta_linea': self.first_line_step,
+            'pasos_con_contacto': self.contact_steps,
+            'acciones': {ACTION_NAMES[code]: count for code, count in enumerate(self.action_counts)}
+        }
+    
     def print_table(self, max_steps=None):
         """
         Imprime la tabla de pasos en consola
@@ -155,7 +527,12 @@ class AgentLogger:
             print("📋 No hay pasos registrados")
             return
         
-        steps_to_show = self.steps if max_steps is None else self.steps[-max_steps:]
+        if max_steps is None:
+            steps_to_show = self.iter_steps()
+        elif max_steps <= len(self.steps):
+            steps_to_show = self.get_last_n_steps(max_steps)
+        else:
+            steps_to_show = deque(self.iter_steps(), maxlen=max_steps)
         
         print("\n" + "="*80)
         print("📋 TABLA DE PASOS DEL AGENTE")
@@ -171,7 +548,7 @@ class AgentLogger:
             print(f"{step['paso']:<4} {step['cuerpo']:<6} {step['izquierda']:<4} {step['centro']:<6} {step['derecha']:<4} {step['accion']:<6} {pos_str:<8} {orient_str:<6} {contacto_str:<8}")
         
         print("="*80)
-        print(f"Total de pasos: {len(self.steps)}")
+        print(f"Total de pasos: {self.get_total_steps()}")
         print("="*80 + "\n")
     
     def export_to_csv(self, filename=None):
@@ -190,12 +567,10 @@ class AgentLogger:
             filename = f'agente_export_{timestamp}.csv'
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['paso', 'cuerpo', 'izquierda', 'centro', 'derecha', 'accion', 
-                         'posicion_x', 'posicion_y', 'orientacion', 'contacto', 'timestamp']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=LOG_FIELDNAMES)
             
             writer.writeheader()
-            for step in self.steps:
+            for step in self.iter_steps():
                 writer.writerow(step)
         
         print(f"📊 Datos exportados a: {filename}")
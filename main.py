@@ -4,11 +4,12 @@ Integra todos los módulos para ejecutar la simulación
 """
 
 import random
-from config import GRID_WIDTH, GRID_HEIGHT, AGENT_CONFIG
+from config import GRID_WIDTH, GRID_HEIGHT
 from environment import create_environment
 from agent import create_agent
 from interface import create_interface
 from logger import create_logger
+from scheduler import create_scheduler
 
 
 def main():
@@ -33,75 +34,84 @@ def main():
     logger = create_logger()
     logger.start_logging()
     
+    # Crear el planificador de paso fijo
+    scheduler = create_scheduler()
+    
     print("🤖 Agente Seguidor de Líneas iniciado")
     print("📝 Logging activado - cada paso será registrado")
     print("🎮 Controles:")
     print("   - Click en botones para controlar la simulación")
     print("   - Espacio: Pausar/Continuar")
+    print("   - F: Activar/desactivar avance rápido")
     print("   - Escape: Salir")
     print("   - Los pasos se muestran en tiempo real en el panel derecho")
     
-    # Bucle principal de la simulación
+    # Bucle principal de la simulación (el log se cierra aunque haya un error)
     running = True
-    while running:
-        # Manejar eventos
-        running, button_clicked = interface.handle_events()
-        
-        # Procesar acciones de botones
-        if button_clicked:
-            if button_clicked == 'RANDOM_LINES':
-                environment.generate_line()
-            elif button_clicked == 'RANDOM_AGENT':
-                agent_x = random.randint(0, GRID_WIDTH - 1)
-                agent_y = random.randint(0, GRID_HEIGHT - 1)
-                agent.reset_position(agent_x, agent_y)
-            elif button_clicked == 'RESET_AGENT':
-                agent.reset_position(agent.x, agent.y)
-            elif button_clicked == 'CLEAR_GRID':
-                environment.reset()
-            elif button_clicked == 'PAUSE':
-                interface.paused = not interface.paused
-            elif button_clicked == 'CLEAR_LOG':
-                logger.clear_log()
-            elif button_clicked == 'EXPORT_LOG':
-                logger.export_to_csv()
-            elif button_clicked == 'PRINT_TABLE':
-                logger.print_table()
+    try:
+        while running:
+            # Manejar eventos
+            running, button_clicked = interface.handle_events()
             
-            # Reiniciar estados de botones después de procesar
-            interface.reset_button_states()
-        
-        # Solo actualizar agente si no está pausado
-        if not interface.paused:
-            # Percepción del agente
-            perceptions = agent.perceive(environment)
+            # Procesar acciones de botones
+            if button_clicked:
+                if button_clicked == 'RANDOM_LINES':
+                    environment.generate_line()
+                elif button_clicked == 'RANDOM_AGENT':
+                    agent_x = random.randint(0, GRID_WIDTH - 1)
+                    agent_y = random.randint(0, GRID_HEIGHT - 1)
+                    agent.reset_position(agent_x, agent_y)
+                elif button_clicked == 'RESET_AGENT':
+                    agent.reset_position(agent.x, agent.y)
+                elif button_clicked == 'CLEAR_GRID':
+                    environment.reset()
+                elif button_clicked == 'PAUSE':
+                    interface.paused = not interface.paused
+                elif button_clicked == 'CLEAR_LOG':
+                    logger.clear_log()
+                elif button_clicked == 'EXPORT_LOG':
+                    logger.export_to_csv()
+                elif button_clicked == 'PRINT_TABLE':
+                    logger.print_table()
+                elif button_clicked == 'FAST_FORWARD':
+                    scheduler.fast_forward = interface.fast_forward
+                
+                # Reiniciar estados de botones después de procesar
+                interface.reset_button_states()
+            
+            # Solo avanzar la simulación si no está pausada
+            if not interface.paused:
+                steps, render = scheduler.advance()
+                
+                # Ejecutar los pasos pendientes por el camino rápido de códigos
+                for _ in range(steps):
+                    code = agent.perceive_code(environment)
+                    action = agent.act_code(code)
+                    logger.log_step_code(agent, code, action)
+            else:
+                # Sin acumular tiempo mientras está pausado
+                scheduler.reset()
+                render = True
             
-            # Acción del agente
-            action_taken = agent.act(perceptions)
+            # Omitir el dibujo si la simulación va retrasada
+            if not render:
+                continue
             
-            # Registrar el paso en el logger
-            logger.log_step(agent, perceptions, action_taken)
-        else:
-            # Si está pausado, solo obtener percepciones para mostrar
+            # Percepciones actuales para mostrar
             perceptions = agent.perceive(environment)
-        
-        # Dibujar todo
-        interface.clear_screen()
-        interface.draw_top_panel()
-        interface.draw_buttons()
-        interface.draw_grid(environment, agent)
-        interface.draw_perceptions(perceptions)
-        interface.draw_info_panel(agent, environment)
-        interface.draw_steps_table(logger, max_steps=8)
-        
-        # Actualizar pantalla
-        interface.update_display()
-        
-        # Controlar velocidad
-        interface.tick(AGENT_CONFIG['MOVEMENT_SPEED'])
+            
+            # Dibujar solo lo que cambió desde el cuadro anterior
+            interface.draw_frame(environment, agent, perceptions, logger, max_steps=8)
+            
+            # Enviar a pantalla las regiones modificadas
+            interface.update_display()
+            
+            # Limitar la frecuencia de dibujo
+            interface.tick(scheduler.render_fps)
+    finally:
+        logger.stop_logging()
     
     # Cerrar la aplicación
-    logger.stop_logging()
     interface.quit()
 
 
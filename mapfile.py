@@ -0,0 +1,232 @@
+"""
+Módulo de archivos de mapa del Agente Seguidor de Líneas
+Guarda un entorno en un archivo binario (cabecera con dimensiones, seed y
+parámetros del generador, seguida de la cuadrícula y opcionalmente del índice
+de vecindario) que se abre mapeado en memoria sin interpretar ni copiar datos
+"""
+
+import argparse
+import os
+import struct
+import time
+import numpy as np
+from config import GRID_WIDTH, GRID_HEIGHT, ENVIRONMENT_CONFIG
+from environment import Environment, create_environment
+
+
+# Cabecera: firma, versión, indicadores, ancho, alto, seed, columnas y filas de
+# áreas de grupos, longitud mínima y máxima de grupo, y desplazamientos de la
+# cuadrícula y del índice de vecindario (0 si no se guardó)
+MAP_FILE_MAGIC = b'AGMAPBIN'
+MAP_FILE_VERSION = 1
+_HEADER_STRUCT = struct.Struct('<8sHHIIqIIIIQQ')
+
+# Indicador de índice de vecindario incluido en el archivo
+MAP_FLAG_NEIGHBORHOOD = 1 << 0
+
+# Seed guardado cuando el mapa no procede de un seed conocido
+MAP_FILE_NO_SEED = -1
+
+# Tipo de dato del índice de vecindario (ver Environment.rebuild_neighborhood_index)
+_NEIGHBORHOOD_DTYPE = np.dtype('<u2')
+
+# Alineación de cada arreglo dentro del archivo (bytes)
+_ARRAY_ALIGNMENT = 64
+
+
+def _aligned(offset):
+    """
+    Redondea un desplazamiento al siguiente múltiplo de _ARRAY_ALIGNMENT
+    
+    Args:
+        offset (int): Desplazamiento en bytes
+    
+    Returns:
+        int: Desplazamiento alineado
+    """
+    return -(-offset // _ARRAY_ALIGNMENT) * _ARRAY_ALIGNMENT
+
+
+def save_map(environment, filename, seed=None, group_columns=None, group_rows=None,
+             include_neighborhood=True):
+    """
+    Guarda un entorno en un archivo de mapa
+    
+    Args:
+        environment: Instancia del entorno
+        filename (str): Ruta del archivo a crear
+        seed (int): Seed con el que se generó la cuadrícula (opcional)
+        group_columns (int): Columnas de áreas de grupos usadas al generarla
+            (por defecto ENVIRONMENT_CONFIG['LINE_GROUP_COLUMNS'])
+        group_rows (int): Filas de áreas de grupos usadas al generarla
+            (por defecto ENVIRONMENT_CONFIG['LINE_GROUP_ROWS'])
+        include_neighborhood (bool): Guardar también el índice de vecindario
+            para no tener que calcularlo al cargar
+    
+    Returns:
+        dict: Cabecera escrita (ver read_map_header)
+    """
+    grid = np.ascontiguousarray(environment.grid, dtype=ENVIRONMENT_CONFIG['GRID_DTYPE'])
+    grid_offset = _aligned(_HEADER_STRUCT.size)
+    neighborhood_offset = 0
+    flags = 0
+    if include_neighborhood:
+        neighborhood = np.ascontiguousarray(environment.neighborhood, dtype=_NEIGHBORHOOD_DTYPE)
+        neighborhood_offset = _aligned(grid_offset + grid.nbytes)
+        flags |= MAP_FLAG_NEIGHBORHOOD
+    
+    header = {
+        'version': MAP_FILE_VERSION,
+        'width': environment.width,
+        'height': environment.height,
+        'seed': MAP_FILE_NO_SEED if seed is None else seed,
+        'group_columns': group_columns or ENVIRONMENT_CONFIG['LINE_GROUP_COLUMNS'],
+        'group_rows': group_rows or ENVIRONMENT_CONFIG['LINE_GROUP_ROWS'],
+        'length_min': ENVIRONMENT_CONFIG['LINE_GROUP_LENGTH_MIN'],
+        'length_max': ENVIRONMENT_CONFIG['LINE_GROUP_LENGTH_MAX'],
+        'grid_offset': grid_offset,
+        'neighborhood_offset': neighborhood_offset,
+    }
+    
+    with open(filename, 'wb') as map_file:
+        map_file.write(_HEADER_STRUCT.pack(
+            MAP_FILE_MAGIC, MAP_FILE_VERSION, flags, header['width'], header['height'],
+            header['seed'], header['group_columns'], header['group_rows'],
+            header['length_min'], header['length_max'], grid_offset, neighborhood_offset))
+        map_file.seek(grid_offset)
+        map_file.write(memoryview(grid).cast('B'))
+        if include_neighborhood:
+            map_file.seek(neighborhood_offset)
+            map_file.write(memoryview(neighborhood).cast('B'))
+    
+    header['seed'] = seed
+    return header
+
+
+def read_map_header(filename):
+    """
+    Lee y valida la cabecera de un archivo de mapa
+    
+    Args:
+        filename (str): Ruta del archivo
+    
+    Returns:
+        dict: Versión, ancho, alto, seed (None si no se conoce), parámetros del
+        generador y desplazamientos de los arreglos
+    
+    Raises:
+        ValueError: Si el archivo no es un mapa compatible o está incompleto
+    """
+    with open(filename, 'rb') as map_file:
+        data = map_file.read(_HEADER_STRUCT.size)
+    if len(data) < _HEADER_STRUCT.size:
+        raise ValueError(f"Archivo de mapa incompleto: {filename}")
+    
+    (magic, version, flags, width, height, seed, group_columns, group_rows,
+     length_min, length_max, grid_offset, neighborhood_offset) = _HEADER_STRUCT.unpack(data)
+    if magic != MAP_FILE_MAGIC or version != MAP_FILE_VERSION:
+        raise ValueError(f"Formato de archivo de mapa no reconocido: {filename}")
+    
+    if not flags & MAP_FLAG_NEIGHBORHOOD:
+        neighborhood_offset = 0
+        end = grid_offset + width * height
+    else:
+        end = neighborhood_offset + width * height * _NEIGHBORHOOD_DTYPE.itemsize
+    if os.path.getsize(filename) < end:
+        raise ValueError(f"Archivo de mapa incompleto: {filename}")
+    
+    return {
+        'version': version,
+        'width': width,
+        'height': height,
+        'seed': None if seed == MAP_FILE_NO_SEED else seed,
+        'group_columns': group_columns,
+        'group_rows': group_rows,
+        'length_min': length_min,
+        'length_max': length_max,
+        'grid_offset': grid_offset,
+        'neighborhood_offset': neighborhood_offset,
+    }
+
+
+def load_map(filename, writable=False):
+    """
+    Abre un archivo de mapa mapeado en memoria
+    
+    La cuadrícula y el índice no se leen ni se copian al abrir: el sistema
+    operativo trae las páginas al accederlas y las comparte entre todos los
+    procesos que abren el mismo archivo. Si el archivo no incluye el índice
+    de vecindario, se calcula en memoria.
+    
+    Args:
+        filename (str): Ruta del archivo
+        writable (bool): Permitir editar el entorno; los cambios quedan en
+            memoria (copia al escribir) y nunca se guardan en el archivo.
+            Si es False, el entorno es de solo lectura (ver
+            Environment.from_arrays)
+    
+    Returns:
+        Environment: Entorno sobre el archivo mapeado
+    
+    Raises:
+        ValueError: Si el archivo no es un mapa compatible o está incompleto
+    """
+    header = read_map_header(filename)
+    shape = (header['height'], header['width'])
+    mode = 'c' if writable else 'r'
+    
+    grid = np.asarray(np.memmap(filename, dtype=ENVIRONMENT_CONFIG['GRID_DTYPE'], mode=mode,
+                                offset=header['grid_offset'], shape=shape))
+    neighborhood = None
+    if header['neighborhood_offset']:
+        neighborhood = np.asarray(np.memmap(filename, dtype=_NEIGHBORHOOD_DTYPE, mode=mode,
+                                            offset=header['neighborhood_offset'], shape=shape))
+    return Environment.from_arrays(grid, neighborhood)
+
+
+def generate_map_file(filename, width, height, seed, group_columns=None, group_rows=None,
+                      include_neighborhood=True):
+    """
+    Función de conveniencia para generar un mapa y guardarlo en un archivo
+    
+    Args:
+        filename (str): Ruta del archivo a crear
+        width (int): Ancho de la cuadrícula
+        height (int): Alto de la cuadrícula
+        seed (int): Seed del mapa
+        group_columns (int): Columnas de áreas de grupos (opcional)
+        group_rows (int): Filas de áreas de grupos (opcional)
+        include_neighborhood (bool): Guardar también el índice de vecindario
+    
+    Returns:
+        dict: Cabecera escrita (ver read_map_header)
+    """
+    environment = create_environment(width, height)
+    environment.generate_line(seed, group_columns, group_rows)
+    return save_map(environment, filename, seed, group_columns, group_rows,
+                    include_neighborhood)
+
+
+def main():
+    """
+    Punto de entrada de línea de comandos para generar un archivo de mapa
+    """
+    parser = argparse.ArgumentParser(description="Genera un archivo de mapa del agente seguidor de líneas")
+    parser.add_argument('output', help="Archivo de mapa a crear")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH, help="Ancho de la cuadrícula")
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT, help="Alto de la cuadrícula")
+    parser.add_argument('--seed', type=int, default=0, help="Seed del mapa")
+    parser.add_argument('--no-index', action='store_true',
+                        help="No guardar el índice de vecindario (archivo 3 veces menor)")
+    args = parser.parse_args()
+    
+    start_time = time.perf_counter()
+    generate_map_file(args.output, args.width, args.height, args.seed,
+                      include_neighborhood=not args.no_index)
+    elapsed = time.perf_counter() - start_time
+    print(f"Mapa {args.width}x{args.height} (seed {args.seed}) guardado en {args.output} "
+          f"({os.path.getsize(args.output) / 1e6:.1f} MB, {elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Módulo de planificación del bucle principal del Agente Seguidor de Líneas
+Desacopla la frecuencia de simulación de la frecuencia de dibujo
+"""
+
+import time
+from config import SIMULATION_CONFIG
+
+
+class FixedTimestepScheduler:
+    """
+    Planificador de paso fijo: acumula el tiempo real transcurrido y decide
+    cuántos pasos de simulación ejecutar y si dibujar el cuadro actual
+    """
+    
+    def __init__(self, sim_hz, render_fps, fast_forward_factor, 
+                 max_steps_per_frame, max_skipped_frames, clock=time.perf_counter):
+        """
+        Inicializa el planificador
+        
+        Args:
+            sim_hz (float): Pasos de simulación por segundo
+            render_fps (float): Cuadros dibujados por segundo
+            fast_forward_factor (float): Multiplicador de sim_hz en avance rápido
+            max_steps_per_frame (int): Máximo de pasos a ejecutar por iteración
+            max_skipped_frames (int): Máximo de cuadros seguidos sin dibujar
+            clock (callable): Reloj monotónico en segundos
+        """
+        self.sim_hz = sim_hz
+        self.render_fps = render_fps
+        self.fast_forward_factor = fast_forward_factor
+        self.max_steps_per_frame = max_steps_per_frame
+        self.max_skipped_frames = max_skipped_frames
+        self.fast_forward = False
+        self._clock = clock
+        self._last_time = clock()
+        self._accumulator = 0.0
+        self._skipped_frames = 0
+        
+    def get_effective_hz(self):
+        """
+        Obtiene la frecuencia de simulación vigente
+        
+        Returns:
+            float: Pasos por segundo teniendo en cuenta el avance rápido
+        """
+        if self.fast_forward:
+            return self.sim_hz * self.fast_forward_factor
+        return self.sim_hz
+        
+    def toggle_fast_forward(self):
+        """
+        Activa o desactiva el avance rápido
+        
+        Returns:
+            bool: Nuevo estado del avance rápido
+        """
+        self.fast_forward = not self.fast_forward
+        return self.fast_forward
+        
+    def reset(self):
+        """
+        Descarta el tiempo acumulado (por ejemplo, mientras está en pausa)
+        """
+        self._last_time = self._clock()
+        self._accumulator = 0.0
+        self._skipped_frames = 0
+        
+    def advance(self):
+        """
+        Calcula el trabajo de la iteración actual del bucle principal
+        
+        Returns:
+            tuple: (pasos_a_simular, dibujar_cuadro)
+        """
+        now = self._clock()
+        self._accumulator += (now - self._last_time) * self.get_effective_hz()
+        self._last_time = now
+        
+        steps = min(int(self._accumulator), self.max_steps_per_frame)
+        self._accumulator -= steps
+        
+        # Si tras el límite quedan pasos pendientes vamos retrasados: se omite
+        # el dibujo para recuperar, salvo que ya se hayan omitido demasiados
+        behind = self._accumulator >= 1
+        if behind and self._skipped_frames < self.max_skipped_frames:
+            self._skipped_frames += 1
+            return steps, False
+        
+        # Sin recuperar del todo, no arrastrar una deuda mayor que un cuadro
+        if behind:
+            self._accumulator = min(self._accumulator, self.max_steps_per_frame)
+        self._skipped_frames = 0
+        return steps, True
+
+
+def create_scheduler():
+    """
+    Función de conveniencia para crear un planificador con la configuración
+    
+    Returns:
+        FixedTimestepScheduler: Instancia del planificador creado
+    """
+    return FixedTimestepScheduler(
+        SIMULATION_CONFIG['SIM_HZ'],
+        SIMULATION_CONFIG['RENDER_FPS'],
+        SIMULATION_CONFIG['FAST_FORWARD_FACTOR'],
+        SIMULATION_CONFIG['MAX_STEPS_PER_FRAME'],
+        SIMULATION_CONFIG['MAX_SKIPPED_FRAMES']
+    )
@@ -0,0 +1,185 @@
+"""
+Módulo de cuadrículas en memoria compartida del Agente Seguidor de Líneas
+Publica la cuadrícula de un entorno y su índice de vecindario en un bloque
+de multiprocessing.shared_memory para que varios procesos trabajen sobre
+una sola copia física; a cada tarea solo se le envía un descriptor
+"""
+
+from multiprocessing import resource_tracker, shared_memory
+import sys
+import numpy as np
+from config import ENVIRONMENT_CONFIG
+from environment import Environment
+
+
+# Alineación de cada arreglo dentro del bloque compartido (bytes)
+_ARRAY_ALIGNMENT = 64
+
+# Entornos ya adjuntados en este proceso, por nombre de bloque
+_attached = {}
+
+# Bloques creados por este proceso, por nombre
+_owned = {}
+
+
+def _aligned(offset):
+    """
+    Redondea un desplazamiento al siguiente múltiplo de _ARRAY_ALIGNMENT
+    
+    Args:
+        offset (int): Desplazamiento en bytes
+    
+    Returns:
+        int: Desplazamiento alineado
+    """
+    return -(-offset // _ARRAY_ALIGNMENT) * _ARRAY_ALIGNMENT
+
+
+class SharedEnvironmentHandle:
+    """
+    Descriptor serializable de un entorno publicado en memoria compartida
+    """
+    
+    def __init__(self, name, width, height, grid_offset, neighborhood_offset, neighborhood_dtype):
+        """
+        Inicializa el descriptor
+        
+        Args:
+            name (str): Nombre del bloque de memoria compartida
+            width (int): Ancho de la cuadrícula
+            height (int): Alto de la cuadrícula
+            grid_offset (int): Desplazamiento de la cuadrícula en el bloque
+            neighborhood_offset (int): Desplazamiento del índice de vecindario
+            neighborhood_dtype (str): Tipo de dato del índice de vecindario
+        """
+        self.name = name
+        self.width = width
+        self.height = height
+        self.grid_offset = grid_offset
+        self.neighborhood_offset = neighborhood_offset
+        self.neighborhood_dtype = neighborhood_dtype
+    
+    def __repr__(self):
+        return f"SharedEnvironmentHandle({self.name!r}, {self.width}x{self.height})"
+
+
+class SharedEnvironment:
+    """
+    Propietario de un entorno publicado en memoria compartida
+    
+    El bloque vive hasta close(); mientras tanto, los procesos lo abren con
+    attach_environment(handle).
+    """
+    
+    def __init__(self, environment, name=None):
+        """
+        Copia la cuadrícula y el índice de vecindario a un bloque nuevo
+        
+        Args:
+            environment: Instancia del entorno a publicar
+            name (str): Nombre del bloque (opcional; por defecto uno único)
+        """
+        grid = environment.grid
+        neighborhood = environment.neighborhood
+        grid_offset = 0
+        neighborhood_offset = _aligned(grid.nbytes)
+        size = neighborhood_offset + neighborhood.nbytes
+        
+        self._shared_memory = shared_memory.SharedMemory(name=name, create=True, size=max(1, size))
+        _owned[self._shared_memory.name] = self._shared_memory
+        self.handle = SharedEnvironmentHandle(
+            self._shared_memory.name, environment.width, environment.height,
+            grid_offset, neighborhood_offset, neighborhood.dtype.str)
+        
+        shared_grid, shared_neighborhood = _views(self._shared_memory, self.handle)
+        shared_grid[...] = grid
+        shared_neighborhood[...] = neighborhood
+    
+    def close(self):
+        """
+        Libera el bloque compartido (los procesos adjuntos deben haber terminado)
+        """
+        if self._shared_memory is not None:
+            _attached.pop(self.handle.name, None)
+            _owned.pop(self.handle.name, None)
+            self._shared_memory.close()
+            self._shared_memory.unlink()
+            self._shared_memory = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _views(block, handle):
+    """
+    Crea las vistas de la cuadrícula y del índice sobre un bloque compartido
+    
+    Args:
+        block (SharedMemory): Bloque abierto
+        handle (SharedEnvironmentHandle): Descriptor del entorno
+    
+    Returns:
+        tuple: (cuadrícula, índice de vecindario) como numpy.ndarray
+    """
+    shape = (handle.height, handle.width)
+    grid = np.ndarray(shape, dtype=ENVIRONMENT_CONFIG['GRID_DTYPE'],
+                      buffer=block.buf, offset=handle.grid_offset)
+    neighborhood = np.ndarray(shape, dtype=np.dtype(handle.neighborhood_dtype),
+                              buffer=block.buf, offset=handle.neighborhood_offset)
+    return grid, neighborhood
+
+
+def publish_environment(environment, name=None):
+    """
+    Función de conveniencia para publicar un entorno en memoria compartida
+    
+    Args:
+        environment: Instancia del entorno
+        name (str): Nombre del bloque (opcional)
+    
+    Returns:
+        SharedEnvironment: Propietario del bloque (su atributo handle es lo
+        que se envía a los procesos)
+    """
+    return SharedEnvironment(environment, name)
+
+
+def attach_environment(handle):
+    """
+    Abre un entorno publicado, de solo lectura y sin copiar la cuadrícula
+    
+    Cada proceso abre cada bloque una sola vez; las llamadas siguientes con
+    el mismo descriptor devuelven el mismo entorno.
+    
+    Args:
+        handle (SharedEnvironmentHandle): Descriptor del entorno
+    
+    Returns:
+        Environment: Entorno sobre la memoria compartida
+    """
+    environment = _attached.get(handle.name)
+    if environment is not None:
+        return environment
+    
+    if handle.name in _owned:
+        block = _owned[handle.name]
+    elif sys.version_info >= (3, 13):
+        block = shared_memory.SharedMemory(name=handle.name, track=False)
+    else:
+        block = shared_memory.SharedMemory(name=handle.name)
+        # Solo el propietario debe liberar el bloque: sin esto, el rastreador
+        # de recursos lo eliminaría al terminar este proceso
+        resource_tracker.unregister(block._name, 'shared_memory')
+    
+    grid, neighborhood = _views(block, handle)
+    grid.flags.writeable = False
+    neighborhood.flags.writeable = False
+    
+    environment = Environment.from_arrays(grid, neighborhood)
+    # Mantener abierto el bloque mientras exista el entorno
+    environment._shared_memory = block
+    _attached[handle.name] = environment
+    return environment
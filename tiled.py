@@ -0,0 +1,205 @@
+"""
+Módulo de entorno por bloques del Agente Seguidor de Líneas
+Divide un mapa muy grande en bloques cuadrados que se generan al accederlos
+por primera vez (con un seed propio derivado del seed del mapa) y se
+descartan cuando superan un presupuesto de memoria
+"""
+
+from collections import OrderedDict
+import numpy as np
+from config import ENVIRONMENT_CONFIG, DIRECTION_OFFSETS, NEIGHBOR_STATES, NEIGHBORHOOD_MASK
+from environment import Environment, generate_line_grids
+
+
+class TiledEnvironment:
+    """
+    Entorno de tamaño prácticamente ilimitado generado por bloques
+    
+    Ofrece las consultas de Environment que usa el agente (is_valid_position,
+    is_line_at, get_cell_value y get_neighborhood_mask); la cuadrícula es de
+    solo lectura. Un bloque descartado se regenera idéntico al volver a él.
+    """
+    
+    def __init__(self, seed, width=None, height=None, tile_size=None, memory_budget=None,
+                 group_columns=None, group_rows=None):
+        """
+        Inicializa el entorno (no se genera ningún bloque todavía)
+        
+        Args:
+            seed (int): Seed del mapa
+            width (int): Ancho del mapa (por defecto ENVIRONMENT_CONFIG['TILED_MAP_SIZE'])
+            height (int): Alto del mapa (por defecto ENVIRONMENT_CONFIG['TILED_MAP_SIZE'])
+            tile_size (int): Lado de cada bloque (por defecto ENVIRONMENT_CONFIG['TILE_SIZE'])
+            memory_budget (int): Bytes máximos de bloques cargados (por
+                defecto ENVIRONMENT_CONFIG['TILE_MEMORY_BUDGET'])
+            group_columns (int): Columnas de áreas de grupos de cada bloque (opcional)
+            group_rows (int): Filas de áreas de grupos de cada bloque (opcional)
+        """
+        self.seed = seed
+        self.width = width or ENVIRONMENT_CONFIG['TILED_MAP_SIZE']
+        self.height = height or ENVIRONMENT_CONFIG['TILED_MAP_SIZE']
+        self.tile_size = tile_size or ENVIRONMENT_CONFIG['TILE_SIZE']
+        self.group_columns = group_columns
+        self.group_rows = group_rows
+        # La cuadrícula no cambia: la versión es fija
+        self.version = 1
+        
+        # Cada bloque guarda su cuadrícula (1 byte por celda) y su índice de
+        # vecindario (2 bytes por celda)
+        tile_bytes = 3 * self.tile_size * self.tile_size
+        budget = memory_budget or ENVIRONMENT_CONFIG['TILE_MEMORY_BUDGET']
+        self.max_tiles = max(1, budget // tile_bytes)
+        self._tiles = OrderedDict()
+        self.tiles_generated = 0
+    
+    def get_tile_seed(self, tile_x, tile_y):
+        """
+        Seed determinista de un bloque
+        
+        Args:
+            tile_x (int): Columna del bloque
+            tile_y (int): Fila del bloque
+        
+        Returns:
+            numpy.random.SeedSequence: Seed del bloque
+        """
+        return np.random.SeedSequence([self.seed, tile_x, tile_y])
+    
+    def get_tile(self, tile_x, tile_y):
+        """
+        Obtiene un bloque, generándolo si no está cargado
+        
+        Args:
+            tile_x (int): Columna del bloque
+            tile_y (int): Fila del bloque
+        
+        Returns:
+            Environment: Entorno del bloque (su borde es el borde del bloque)
+        """
+        key = (tile_x, tile_y)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+        
+        rng = np.random.default_rng(self.get_tile_seed(tile_x, tile_y))
+        grid = generate_line_grids(self.tile_size, self.tile_size, [rng],
+                                   self.group_columns, self.group_rows)[0]
+        # Recortar el último bloque si el mapa no es múltiplo del tamaño de bloque
+        grid = grid[:self.height - tile_y * self.tile_size, :self.width - tile_x * self.tile_size]
+        tile = Environment.from_arrays(np.ascontiguousarray(grid))
+        tile.grid.flags.writeable = False
+        tile.neighborhood.flags.writeable = False
+        
+        self._tiles[key] = tile
+        self.tiles_generated += 1
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+    
+    def get_loaded_tiles(self):
+        """
+        Obtiene el número de bloques cargados en memoria
+        
+        Returns:
+            int: Bloques cargados
+        """
+        return len(self._tiles)
+    
+    def is_valid_position(self, x, y):
+        """
+        Verifica si una posición es válida dentro del mapa
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+        
+        Returns:
+            bool: True si la posición es válida, False en caso contrario
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    def is_line_at(self, x, y):
+        """
+        Verifica si hay una línea en la posición especificada
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+        
+        Returns:
+            bool: True si hay línea, False en caso contrario
+        """
+        if not self.is_valid_position(x, y):
+            return False
+        tile_x, local_x = divmod(x, self.tile_size)
+        tile_y, local_y = divmod(y, self.tile_size)
+        tile = self.get_tile(tile_x, tile_y)
+        return tile.grid.item(local_y, local_x) == ENVIRONMENT_CONFIG['GRID_VALUE_LINE']
+    
+    def get_cell_value(self, x, y):
+        """
+        Obtiene el valor de una celda específica
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+        
+        Returns:
+            int: Valor de la celda o None si está fuera de límites
+        """
+        if not self.is_valid_position(x, y):
+            return None
+        tile_x, local_x = divmod(x, self.tile_size)
+        tile_y, local_y = divmod(y, self.tile_size)
+        return self.get_tile(tile_x, tile_y).grid.item(local_y, local_x)
+    
+    def get_neighborhood_mask(self, x, y):
+        """
+        Obtiene la máscara del vecindario de una celda (ver
+        Environment.rebuild_neighborhood_index)
+        
+        En el interior de un bloque se usa su índice precalculado; en sus
+        bordes la máscara se calcula consultando los bloques vecinos.
+        
+        Args:
+            x (int): Coordenada x (debe ser válida)
+            y (int): Coordenada y (debe ser válida)
+        
+        Returns:
+            int: Máscara empaquetada
+        """
+        tile_x, local_x = divmod(x, self.tile_size)
+        tile_y, local_y = divmod(y, self.tile_size)
+        tile = self.get_tile(tile_x, tile_y)
+        if 0 < local_x < tile.width - 1 and 0 < local_y < tile.height - 1:
+            return tile.neighborhood.item(local_y, local_x)
+        
+        mask = NEIGHBORHOOD_MASK['SELF_LINE_BIT'] if self.is_line_at(x, y) else 0
+        for direction, (dx, dy) in enumerate(DIRECTION_OFFSETS):
+            nx, ny = x + dx, y + dy
+            if not self.is_valid_position(nx, ny):
+                state = NEIGHBOR_STATES['BORDER']
+            elif self.is_line_at(nx, ny):
+                state = NEIGHBOR_STATES['DARK']
+            else:
+                state = NEIGHBOR_STATES['LIGHT']
+            mask |= state << (NEIGHBORHOOD_MASK['BITS_PER_DIRECTION'] * direction)
+        return mask
+
+
+def create_tiled_environment(seed, width=None, height=None, tile_size=None, memory_budget=None):
+    """
+    Función de conveniencia para crear un entorno por bloques
+    
+    Args:
+        seed (int): Seed del mapa
+        width (int): Ancho del mapa (opcional)
+        height (int): Alto del mapa (opcional)
+        tile_size (int): Lado de cada bloque (opcional)
+        memory_budget (int): Bytes máximos de bloques cargados (opcional)
+    
+    Returns:
+        TiledEnvironment: Entorno por bloques
+    """
+    return TiledEnvironment(seed, width, height, tile_size, memory_budget)
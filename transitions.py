@@ -0,0 +1,264 @@
+"""
+Módulo de tabla de transiciones del Agente Seguidor de Líneas
+Precalcula, para toda la cuadrícula, el estado siguiente de cada estado del
+agente y tablas de saltos (binary lifting) para responder en O(log K) dónde
+está el agente K pasos después
+"""
+
+import numpy as np
+from config import DIRECTION_OFFSETS, PERCEPTION_BITS
+from agent import SENSOR_TABLE, SENSOR_TABLE_SHIFT, PERCEPTION_ACTION_TABLE, ACTION_ROTATIONS
+
+
+# Tablas del agente como arreglos para aplicarlas a muchos estados a la vez
+SENSOR_TABLE_ARRAY = np.array(SENSOR_TABLE, dtype=np.uint8)
+ACTION_TABLE_ARRAY = np.array(PERCEPTION_ACTION_TABLE, dtype=np.uint8)
+ACTION_ROTATIONS_ARRAY = np.array(ACTION_ROTATIONS, dtype=np.int8)
+DIRECTION_DX = np.array([dx for dx, dy in DIRECTION_OFFSETS], dtype=np.int8)
+DIRECTION_DY = np.array([dy for dx, dy in DIRECTION_OFFSETS], dtype=np.int8)
+
+# Estados por celda: 4 orientaciones x 2 valores de contacto
+STATES_PER_CELL = 8
+
+
+def vector_perceive(masks, orientation, contact):
+    """
+    Calcula el código de percepción (perceive_code) de muchos estados
+    
+    Args:
+        masks (numpy.ndarray): Máscara de vecindario de la celda de cada estado
+        orientation (numpy.ndarray): Orientaciones (0-3)
+        contact (numpy.ndarray): 1 si el agente está en contacto, 0 si no
+    
+    Returns:
+        numpy.ndarray: Códigos de percepción de 5 bits (uint8)
+    """
+    codes = SENSOR_TABLE_ARRAY[(orientation.astype(np.intp) << SENSOR_TABLE_SHIFT) |
+                               masks.astype(np.intp)]
+    codes |= (contact != 0).astype(np.uint8) * np.uint8(PERCEPTION_BITS['CONTACTO'])
+    return codes
+
+
+def vector_act(width, height, x, y, orientation, actions):
+    """
+    Aplica códigos de acción (act_code sin la tabla de decisión) a muchos estados
+    
+    Args:
+        width (int): Ancho de la cuadrícula
+        height (int): Alto de la cuadrícula
+        x (numpy.ndarray): Coordenadas x
+        y (numpy.ndarray): Coordenadas y
+        orientation (numpy.ndarray): Orientaciones (0-3)
+        actions (numpy.ndarray): Códigos de acción (ver ACTION_CODES)
+    
+    Returns:
+        tuple: (x, y, orientación, contacto) siguientes, como arreglos nuevos
+    """
+    new_orientation = (orientation + ACTION_ROTATIONS_ARRAY[actions]) % 4
+    new_x = x + DIRECTION_DX[new_orientation]
+    new_y = y + DIRECTION_DY[new_orientation]
+    inside = (new_x >= 0) & (new_x < width) & (new_y >= 0) & (new_y < height)
+    
+    return (
+        np.where(inside, new_x, x).astype(x.dtype),
+        np.where(inside, new_y, y).astype(y.dtype),
+        new_orientation.astype(orientation.dtype),
+        (~inside).astype(np.uint8),
+    )
+
+
+def vector_step(neighborhood, x, y, orientation, contact):
+    """
+    Aplica un paso del agente (perceive_code + act_code) a muchos estados
+    
+    Args:
+        neighborhood (numpy.ndarray): Índice de vecindario del entorno (alto x ancho)
+        x (numpy.ndarray): Coordenadas x
+        y (numpy.ndarray): Coordenadas y
+        orientation (numpy.ndarray): Orientaciones (0-3)
+        contact (numpy.ndarray): 1 si el agente está en contacto, 0 si no
+    
+    Returns:
+        tuple: (x, y, orientación, contacto) siguientes, código de percepción
+        y código de acción de cada estado, como arreglos nuevos
+    """
+    height, width = neighborhood.shape
+    codes = vector_perceive(neighborhood[y, x], orientation, contact)
+    actions = ACTION_TABLE_ARRAY[codes]
+    return vector_act(width, height, x, y, orientation, actions) + (codes, actions)
+
+
+class TransitionTable:
+    """
+    Función de transición completa del agente sobre un entorno
+    
+    Un estado se codifica como ((y * ancho + x) * 4 + orientación) * 2 + contacto.
+    Las tablas se reconstruyen solas si la versión del entorno cambia.
+    """
+    
+    def __init__(self, environment):
+        """
+        Inicializa la tabla (se construye en la primera consulta)
+        
+        Args:
+            environment: Instancia del entorno
+        """
+        self.environment = environment
+        self.num_states = STATES_PER_CELL * environment.width * environment.height
+        self._index_dtype = np.int32 if self.num_states < 2**31 else np.int64
+        self._version = None
+        self._jumps = []
+    
+    def encode_state(self, x, y, orientation, contact):
+        """
+        Codifica un estado del agente como índice de la tabla
+        
+        Args:
+            x (int): Coordenada x
+            y (int): Coordenada y
+            orientation (int): Orientación (0-3)
+            contact (bool): Si el agente está en contacto con el borde
+        
+        Returns:
+            int: Índice del estado
+        """
+        return ((y * self.environment.width + x) * 4 + orientation) * 2 + (1 if contact else 0)
+    
+    def decode_state(self, state):
+        """
+        Decodifica un índice de estado
+        
+        Args:
+            state (int): Índice del estado
+        
+        Returns:
+            tuple: (x, y, orientación, contacto)
+        """
+        cell, rest = divmod(int(state), STATES_PER_CELL)
+        y, x = divmod(cell, self.environment.width)
+        return (x, y, rest >> 1, bool(rest & 1))
+    
+    def encode_agent(self, agent):
+        """
+        Codifica el estado actual de un agente
+        
+        Args:
+            agent: Instancia del agente
+        
+        Returns:
+            int: Índice del estado
+        """
+        return self.encode_state(agent.x, agent.y, agent.orientation, agent.has_hit_wall)
+    
+    def _ensure_current(self):
+        """
+        Reconstruye la tabla de sucesores si el entorno cambió desde la última
+        construcción (las tablas de saltos se descartan)
+        """
+        if self._version == self.environment.version:
+            return
+        
+        environment = self.environment
+        states = np.arange(self.num_states, dtype=np.int64)
+        contact = (states & 1).astype(np.uint8)
+        orientation = ((states >> 1) & 3).astype(np.int8)
+        cells = states >> 3
+        x = (cells % environment.width).astype(np.int64)
+        y = (cells // environment.width).astype(np.int64)
+        
+        new_x, new_y, new_orientation, new_contact, _, _ = vector_step(
+            environment.neighborhood, x, y, orientation, contact)
+        successor = (((new_y * environment.width + new_x) * 4 + new_orientation) * 2
+                     + new_contact)
+        
+        self._jumps = [successor.astype(self._index_dtype)]
+        self._version = environment.version
+    
+    def _ensure_levels(self, levels):
+        """
+        Construye las tablas de saltos hasta 2^(levels - 1) pasos
+        
+        Args:
+            levels (int): Número de niveles necesarios
+        """
+        self._ensure_current()
+        while len(self._jumps) < levels:
+            previous = self._jumps[-1]
+            self._jumps.append(previous[previous])
+    
+    def get_successors(self):
+        """
+        Obtiene el estado siguiente de cada estado
+        
+        Returns:
+            numpy.ndarray: Arreglo de num_states índices (no modificar)
+        """
+        self._ensure_current()
+        return self._jumps[0]
+    
+    def state_after(self, state, steps):
+        """
+        Obtiene el estado tras un número de pasos en O(log steps)
+        
+        Args:
+            state (int): Índice del estado inicial
+            steps (int): Pasos a avanzar
+        
+        Returns:
+            int: Índice del estado final
+        """
+        self._ensure_levels(max(1, steps.bit_length()))
+        level = 0
+        while steps:
+            if steps & 1:
+                state = self._jumps[level].item(state)
+            steps >>= 1
+            level += 1
+        return state
+    
+    def states_after(self, states, steps):
+        """
+        Obtiene, para muchos estados iniciales, el estado tras un número de pasos
+        
+        Args:
+            states (numpy.ndarray): Índices de los estados iniciales
+            steps (int): Pasos a avanzar
+        
+        Returns:
+            numpy.ndarray: Índices de los estados finales
+        """
+        self._ensure_levels(max(1, steps.bit_length()))
+        states = np.asarray(states, dtype=self._index_dtype)
+        level = 0
+        while steps:
+            if steps & 1:
+                states = self._jumps[level][states]
+            steps >>= 1
+            level += 1
+        return states
+    
+    def agent_state_after(self, agent, steps):
+        """
+        Obtiene el estado de un agente tras un número de pasos, sin moverlo
+        
+        Args:
+            agent: Instancia del agente
+            steps (int): Pasos a avanzar
+        
+        Returns:
+            tuple: (x, y, orientación, contacto)
+        """
+        return self.decode_state(self.state_after(self.encode_agent(agent), steps))
+
+
+def create_transition_table(environment):
+    """
+    Función de conveniencia para crear la tabla de transiciones de un entorno
+    
+    Args:
+        environment: Instancia del entorno
+    
+    Returns:
+        TransitionTable: Tabla de transiciones
+    """
+    return TransitionTable(environment)
@@ -0,0 +1,208 @@
+"""
+Entorno vectorizado estilo Gym para el Agente Seguidor de Líneas
+Avanza a la vez muchos mundos independientes (cada uno con su cuadrícula y
+su agente) para entrenar políticas por lotes, sin importar pygame
+"""
+
+import argparse
+import time
+import numpy as np
+from config import (
+    GRID_WIDTH, GRID_HEIGHT, AGENT_CONFIG, VEC_ENV_CONFIG,
+    NEIGHBORHOOD_MASK, PERCEPTION_BITS, ACTION_CODES
+)
+from environment import Environment, generate_line_grids
+from transitions import ACTION_TABLE_ARRAY, vector_perceive, vector_act
+
+# Clave que separa el flujo aleatorio de las posiciones iniciales del de la
+# cuadrícula de cada mundo (ambos derivados del mismo seed)
+_START_STREAM = 1
+
+
+class VecLineFollowerEnv:
+    """
+    Lote de mundos independientes con una interfaz reset()/step() por lotes
+    
+    Las observaciones son los códigos de percepción de 5 bits del agente
+    (ver PERCEPTION_BITS) y las acciones son códigos de ACTION_CODES.
+    """
+    
+    def __init__(self, num_envs, width=GRID_WIDTH, height=GRID_HEIGHT, max_episode_steps=None):
+        """
+        Inicializa el lote (los mundos se crean en reset())
+        
+        Args:
+            num_envs (int): Número de mundos
+            width (int): Ancho de la cuadrícula de cada mundo
+            height (int): Alto de la cuadrícula de cada mundo
+            max_episode_steps (int): Pasos por episodio (por defecto
+                VEC_ENV_CONFIG['MAX_EPISODE_STEPS'])
+        """
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.max_episode_steps = max_episode_steps or VEC_ENV_CONFIG['MAX_EPISODE_STEPS']
+        self.num_observations = 1 << len(PERCEPTION_BITS)
+        self.num_actions = len(ACTION_CODES)
+        
+        self.neighborhoods = None
+        self._world_index = np.arange(num_envs)
+        self._rngs = []
+    
+    def reset(self, seeds=None):
+        """
+        Genera la cuadrícula de cada mundo y coloca su agente
+        
+        El mismo seed produce siempre el mismo mundo y la misma secuencia de
+        posiciones iniciales en los reinicios automáticos posteriores.
+        
+        Args:
+            seeds (list): Un seed por mundo (por defecto seeds aleatorios)
+        
+        Returns:
+            numpy.ndarray: Observación inicial de cada mundo (uint8)
+        """
+        if seeds is None:
+            seeds = np.random.SeedSequence().generate_state(self.num_envs, dtype=np.uint64).tolist()
+        if len(seeds) != self.num_envs:
+            raise ValueError(f"Se esperaban {self.num_envs} seeds y se recibieron {len(seeds)}")
+        
+        # Todas las cuadrículas se generan en una sola llamada
+        grids = generate_line_grids(self.width, self.height, seeds)
+        self.neighborhoods = np.empty((self.num_envs, self.height, self.width), dtype=np.uint16)
+        self._rngs = []
+        for world, seed in enumerate(seeds):
+            self.neighborhoods[world] = Environment.from_arrays(grids[world]).neighborhood
+            self._rngs.append(np.random.default_rng([_START_STREAM, seed]))
+        
+        self.x = np.zeros(self.num_envs, dtype=np.int32)
+        self.y = np.zeros(self.num_envs, dtype=np.int32)
+        self.orientation = np.zeros(self.num_envs, dtype=np.int8)
+        self.contact = np.zeros(self.num_envs, dtype=np.uint8)
+        self.episode_steps = np.zeros(self.num_envs, dtype=np.int64)
+        self.episode_returns = np.zeros(self.num_envs, dtype=np.float64)
+        self._reset_agents(self._world_index)
+        
+        return self._observe()
+    
+    def _reset_agents(self, worlds):
+        """
+        Coloca el agente de los mundos indicados en una posición inicial nueva
+        
+        Args:
+            worlds (numpy.ndarray): Índices de los mundos a reiniciar
+        """
+        for world in worlds.tolist():
+            rng = self._rngs[world]
+            self.x[world] = rng.integers(self.width)
+            self.y[world] = rng.integers(self.height)
+        self.orientation[worlds] = AGENT_CONFIG['INITIAL_ORIENTATION']
+        self.contact[worlds] = 0
+        self.episode_steps[worlds] = 0
+        self.episode_returns[worlds] = 0.0
+    
+    def _observe(self):
+        """
+        Calcula la observación actual de cada mundo
+        
+        Returns:
+            numpy.ndarray: Códigos de percepción de 5 bits (uint8)
+        """
+        masks = self.neighborhoods[self._world_index, self.y, self.x]
+        return vector_perceive(masks, self.orientation, self.contact)
+    
+    def step(self, actions):
+        """
+        Aplica una acción en cada mundo
+        
+        Los mundos cuyo episodio termina se reinician solos (misma cuadrícula,
+        nueva posición inicial); su última observación queda en info.
+        
+        Args:
+            actions (array-like): Código de acción de cada mundo
+        
+        Returns:
+            tuple: (observaciones, recompensas, episodios terminados, info)
+        """
+        if self.neighborhoods is None:
+            raise RuntimeError("Se debe llamar a reset() antes de step()")
+        actions = np.asarray(actions, dtype=np.intp)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Se esperaban {self.num_envs} acciones")
+        if ((actions < 0) | (actions >= self.num_actions)).any():
+            raise ValueError("Código de acción fuera de rango")
+        
+        self.x, self.y, self.orientation, self.contact = vector_act(
+            self.width, self.height, self.x, self.y, self.orientation, actions)
+        
+        masks = self.neighborhoods[self._world_index, self.y, self.x]
+        on_line = (masks & NEIGHBORHOOD_MASK['SELF_LINE_BIT']) != 0
+        rewards = np.where(on_line, VEC_ENV_CONFIG['REWARD_ON_LINE'], VEC_ENV_CONFIG['REWARD_OFF_LINE'])
+        rewards += self.contact * VEC_ENV_CONFIG['REWARD_CONTACT']
+        
+        self.episode_steps += 1
+        self.episode_returns += rewards
+        dones = self.episode_steps >= self.max_episode_steps
+        
+        observations = vector_perceive(masks, self.orientation, self.contact)
+        info = {}
+        if dones.any():
+            finished = np.flatnonzero(dones)
+            info = {
+                'observacion_final': observations.copy(),
+                'retorno_episodio': self.episode_returns.copy(),
+            }
+            self._reset_agents(finished)
+            observations = self._observe()
+        
+        return observations, rewards, dones, info
+    
+    def reference_actions(self, observations):
+        """
+        Acciones de la tabla de percepción-acción de LineFollowerAgent
+        
+        Args:
+            observations (numpy.ndarray): Observaciones devueltas por reset()/step()
+        
+        Returns:
+            numpy.ndarray: Código de acción para cada mundo
+        """
+        return ACTION_TABLE_ARRAY[observations]
+
+
+def main():
+    """
+    Mide el rendimiento del entorno vectorizado con la política del agente
+    """
+    parser = argparse.ArgumentParser(description="Rendimiento del entorno vectorizado")
+    parser.add_argument('--envs', type=int, default=1024, help="Número de mundos")
+    parser.add_argument('--steps', type=int, default=1000, help="Pasos por mundo")
+    parser.add_argument('--width', type=int, default=GRID_WIDTH, help="Ancho de la cuadrícula")
+    parser.add_argument('--height', type=int, default=GRID_HEIGHT, help="Alto de la cuadrícula")
+    parser.add_argument('--seed', type=int, default=0, help="Seed del primer mundo")
+    args = parser.parse_args()
+    
+    env = VecLineFollowerEnv(args.envs, args.width, args.height)
+    observations = env.reset(list(range(args.seed, args.seed + args.envs)))
+    
+    total_reward = 0.0
+    start_time = time.perf_counter()
+    for _ in range(args.steps):
+        observations, rewards, dones, info = env.step(env.reference_actions(observations))
+        total_reward += rewards.sum()
+    elapsed = time.perf_counter() - start_time
+    
+    total_steps = args.envs * args.steps
+    print("\n" + "="*60)
+    print("⚡ ENTORNO VECTORIZADO")
+    print("="*60)
+    print(f"Mundos:              {args.envs}")
+    print(f"Pasos totales:       {total_steps}")
+    print(f"Tiempo:              {elapsed:.3f} s")
+    print(f"Pasos por segundo:   {total_steps / elapsed if elapsed > 0 else float('inf'):,.0f}")
+    print(f"Recompensa media:    {total_reward / total_steps:.4f}")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()